@@ -0,0 +1,35 @@
+"""
+Generated Platform API listings, based on the unit test fixtures.
+"""
+import copy
+import datetime
+import uuid
+
+from tests import load_fixture
+
+
+def frames_json(count):
+    """ Returns `count` 5-minute frames in the Platform frame listing format. """
+    template = load_fixture('frames')[0]
+    start = datetime.datetime(2016, 1, 1)
+    frames = []
+    for i in xrange(count):
+        frame = copy.deepcopy(template)
+        time = start + datetime.timedelta(minutes=5 * i)
+        frame['id'] = str(uuid.UUID(int=i))
+        frame['validTime'] = time.strftime('%Y-%m-%dT%H:%M:%SZ')
+        frame['runTime'] = frame['validTime']
+        frame['creationTime'] = (time + datetime.timedelta(minutes=2)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        frames.append(frame)
+    return frames
+
+
+def products_json(count):
+    """ Returns `count` products in the Platform product listing format. """
+    templates = load_fixture('products')
+    products = []
+    for i in xrange(count):
+        product = copy.deepcopy(templates[i % len(templates)])
+        product['id'] = str(uuid.UUID(int=i))
+        products.append(product)
+    return products
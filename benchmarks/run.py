@@ -0,0 +1,343 @@
+"""
+Runs the skywise-platform benchmark suite and writes machine-readable results.
+
+    python -m benchmarks.run [--suite all] [--output results.json] [--compare baseline.json]
+
+Network benchmarks run against benchmarks.server, a local stand-in for the
+Platform API started in a subprocess, so results don't depend on the real API.
+"""
+import argparse
+import collections
+import itertools
+import json
+import operator
+import logging
+import platform
+import socket
+import subprocess
+import sys
+import time
+import timeit
+
+import numpy as np
+from skywiserestclient import SkyWiseJSON
+
+from skywiseplatform import Datapoint, GoogleMapsTile, PlatformResource, Product, map_async
+from skywiseplatform.decoding import FAST, STRICT, LazyData
+from skywiseplatform.frame import ProductFrame, _Frame
+from skywiseplatform.frameset import FrameSet
+from skywiseplatform.pool import ConnectionPool
+from skywiseplatform.tile import MapTile
+from benchmarks import tile_math
+from benchmarks.fixtures import frames_json, products_json
+
+
+CONUS = ((49.38, -66.94), (24.52, -124.77))
+
+
+class _Response(object):
+    """ The part of a requests Response used by _unpack_response. """
+
+    def __init__(self, content):
+        self.content = content
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def _measure(fn, repeat):
+    times = timeit.repeat(fn, number=1, repeat=repeat)
+    return min(times), sorted(times)[len(times) // 2]
+
+
+def _result(suite, name, fn, repeat, items, **params):
+    best, median = _measure(fn, repeat)
+    return {
+        'suite': suite,
+        'name': name,
+        'params': params,
+        'repeat': repeat,
+        'best': best,
+        'median': median,
+        'items': items,
+        'items_per_second': items / best if best else None
+    }
+
+
+def tile_math_suite(repeat, quick=False, **options):
+    points = 10000 if quick else 100000
+    rng = np.random.RandomState(0)
+    latitudes = rng.uniform(-85.0, 85.0, points)
+    longitudes = rng.uniform(-180.0, 180.0, points)
+    scalar_latitudes, scalar_longitudes = latitudes.tolist(), longitudes.tolist()
+
+    yield _result('tile_math', 'scalar_lat_lon_to_quadkey',
+                  lambda: tile_math._scalar(scalar_latitudes, scalar_longitudes, 12),
+                  repeat, points, zoom=12)
+    yield _result('tile_math', 'vectorized_lat_lon_to_quadkey',
+                  lambda: tile_math._vectorized(latitudes, longitudes, 12),
+                  repeat, points, zoom=12)
+    for z in (6, 9):
+        count = len(MapTile.tile_range(CONUS, z))
+        yield _result('tile_math', 'tile_range', lambda: MapTile.tile_range(CONUS, z),
+                      repeat, count, zoom=z)
+
+
+def deserialize_suite(repeat, quick=False, **options):
+    count = 1000 if quick else 10000
+    frames = _Response(json.dumps(frames_json(count)))
+    products = _Response(json.dumps(products_json(count)))
+    yield _result('deserialize', 'frame_list', lambda: ProductFrame._unpack_response(frames),
+                  repeat, count)
+    yield _result('deserialize', 'product_list', lambda: Product._unpack_response(products),
+                  repeat, count)
+
+    yield _result('deserialize', 'frame_set', lambda: FrameSet.from_json(ProductFrame, frames.json()),
+                  repeat, count)
+
+    PlatformResource.set_decoding(FAST)
+    try:
+        yield _result('deserialize', 'frame_list_fast', lambda: ProductFrame._unpack_response(frames),
+                      repeat, count)
+        yield _result('deserialize', 'frame_list_fast_read_times',
+                      lambda: [f.validTime for f in ProductFrame._unpack_response(frames)],
+                      repeat, count)
+        yield _result('deserialize', 'product_list_fast', lambda: Product._unpack_response(products),
+                      repeat, count)
+    finally:
+        PlatformResource.set_decoding(STRICT)
+
+
+def _settings():
+    """ Returns the PlatformResource settings the network suites change. """
+    return (PlatformResource.get_site(), PlatformResource.get_map_size(),
+            PlatformResource.get_use_session_for_async())
+
+
+def _restore_settings(settings):
+    site, map_size, use_session_for_async = settings
+    PlatformResource.set_site(site)
+    PlatformResource.set_map_size(map_size)
+    PlatformResource.set_use_session_for_async(use_session_for_async)
+
+
+def fanout_suite(repeat, quick=False, port=8765, latency_ms=5):
+    server = _start_server(port, latency_ms)
+    settings = _settings()
+    try:
+        PlatformResource.set_site('http://127.0.0.1:%i' % port)
+        PlatformResource.set_use_session_for_async(True)
+        frame = ProductFrame.find('benchmark-product', limit=1)[0]
+        bounding_box = ((37.06, -94.40), (33.56, -103.19))
+        z = 8 if quick else 9
+        tile_count = len(MapTile.tile_range(bounding_box, z))
+        points = [(35.0 + i * 0.01, -97.0) for i in xrange(50 if quick else 200)]
+
+        for concurrency in (1, 4, 16, 64):
+            PlatformResource.set_map_size(concurrency)
+            yield _result('fanout', 'tileset', lambda: GoogleMapsTile.tileset(frame.id, bounding_box, z),
+                          repeat, tile_count, concurrency=concurrency, zoom=z, latency_ms=latency_ms)
+            yield _result('fanout', 'datapoints',
+                          lambda: map_async([Datapoint.find_async(frame, lat, lon) for lat, lon in points]),
+                          repeat, len(points), concurrency=concurrency, latency_ms=latency_ms)
+    finally:
+        _restore_settings(settings)
+        server.terminate()
+        server.wait()
+
+
+def pool_suite(repeat, quick=False, port=8765, latency_ms=5):
+    server = _start_server(port, latency_ms)
+    settings = _settings()
+    try:
+        PlatformResource.set_site('http://127.0.0.1:%i' % port)
+        frame = ProductFrame.find('benchmark-product', limit=1)[0]
+        bounding_box = ((37.06, -94.40), (33.56, -103.19))
+        z = 8 if quick else 9
+        tile_count = len(MapTile.tile_range(bounding_box, z))
+        points = [(35.0 + i * 0.01, -97.0) for i in xrange(200 if quick else 1000)]
+        concurrency = 64
+        PlatformResource.set_map_size(concurrency)
+
+        pools = [
+            ('no_keep_alive', ConnectionPool(pool_size=concurrency, keep_alive=False)),
+            ('default', ConnectionPool()),
+            ('sized', ConnectionPool(pool_size=concurrency)),
+        ]
+        for name, pool in pools:
+            PlatformResource.set_connection_pool(pool)
+            yield _result('pool', 'tileset', lambda: GoogleMapsTile.tileset(frame.id, bounding_box, z),
+                          repeat, tile_count, pool=name, concurrency=concurrency, zoom=z, latency_ms=latency_ms)
+            yield _result('pool', 'datapoints',
+                          lambda: map_async([Datapoint.find_async(frame, lat, lon) for lat, lon in points]),
+                          repeat, len(points), pool=name, concurrency=concurrency, latency_ms=latency_ms)
+    finally:
+        PlatformResource.set_connection_pool(None)
+        _restore_settings(settings)
+        server.terminate()
+        server.wait()
+
+
+def _read_attribute(obj, name, count):
+    """ Reads obj.name count times in a C loop, so the attribute lookup dominates. """
+    collections.deque(itertools.imap(operator.attrgetter(name), itertools.repeat(obj, count)), maxlen=0)
+
+
+class _GetattrFrame(SkyWiseJSON):
+    """ A frame with the __getattr__ dispatch frames had before tile() and the rest were methods. """
+
+    _tile = _tile_async = _datapoint = _datapoint_async = _datapoints = _Frame.__dict__['tile']
+    _mosaic = _pyramid = _tile_store = _tile
+
+    def __getattr__(self, item):
+        if item == 'tile':
+            return self._tile
+        elif item == 'tile_async':
+            return self._tile_async
+        elif item == 'datapoint':
+            return self._datapoint
+        elif item == 'datapoint_async':
+            return self._datapoint_async
+        elif item == 'datapoints':
+            return self._datapoints
+        elif item == 'mosaic':
+            return self._mosaic
+        elif item == 'pyramid':
+            return self._pyramid
+        elif item == 'tile_store':
+            return self._tile_store
+        else:
+            return super(_GetattrFrame, self).__getattr__(item)
+
+
+class _GetattrProduct(SkyWiseJSON):
+    """ A product with the __getattr__ dispatch products had before frames() and the rest were methods. """
+
+    _styles = _forecasts = _frames = _iter_frames = _frameset = _watch = _timeseries = Product.__dict__['frames']
+
+    def __getattr__(self, item):
+        if item == 'styles':
+            return self._styles
+        elif item == 'forecasts':
+            return self._forecasts
+        elif item == 'frames':
+            return self._frames
+        elif item == 'iter_frames':
+            return self._iter_frames
+        elif item == 'frameset':
+            return self._frameset
+        elif item == 'watch':
+            return self._watch
+        elif item == 'timeseries':
+            return self._timeseries
+        else:
+            return super(_GetattrProduct, self).__getattr__(item)
+
+
+def _getattr_copy(cls, resource, **tags):
+    """ Copies a resource's data into a __getattr__ dispatch class, storing tags in the data as it used to. """
+    copy = cls()
+    copy._data = LazyData(resource._data)
+    copy._data.update(tags)
+    return copy
+
+
+def attribute_suite(repeat, quick=False, **options):
+    count = 100000 if quick else 1000000
+    product = Product._unpack_response(_Response(json.dumps(products_json(1))))[0]
+    frame = ProductFrame._unpack_response(_Response(json.dumps(frames_json(1))))[0]
+    frame.product = product
+    frame.validTime
+    resources = {
+        'methods': (frame, product),
+        '__getattr__': (_getattr_copy(_GetattrFrame, frame, product=product),
+                        _getattr_copy(_GetattrProduct, product)),
+    }
+
+    for dispatch, (frame, product) in sorted(resources.items()):
+        for label, obj, name in [('frame', frame, 'tile'), ('frame', frame, 'datapoint'), ('frame', frame, 'product'),
+                                 ('frame', frame, 'validTime'), ('product', product, 'frames')]:
+            yield _result('attributes', '%s.%s' % (label, name),
+                          lambda: _read_attribute(obj, name, count), repeat, count, dispatch=dispatch)
+
+
+def _start_server(port, latency_ms):
+    server = subprocess.Popen([sys.executable, '-m', 'benchmarks.server', str(port), str(latency_ms)])
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return server
+        except socket.error:
+            time.sleep(0.05)
+    server.terminate()
+    raise RuntimeError('The benchmark server did not start on port %i.' % port)
+
+
+SUITES = {
+    'tile_math': tile_math_suite,
+    'deserialize': deserialize_suite,
+    'fanout': fanout_suite,
+    'pool': pool_suite,
+    'attributes': attribute_suite,
+}
+
+
+def _key(result):
+    return result['suite'], result['name'], json.dumps(result['params'], sort_keys=True)
+
+
+def compare(results, baseline):
+    """ Prints each result's speed relative to the same benchmark in a baseline run. """
+    previous = dict((_key(r), r) for r in baseline['results'])
+    for result in results:
+        old = previous.get(_key(result))
+        if old is None:
+            continue
+        print('%-12s %-32s %-48s %6.2fx' % (result['suite'], result['name'],
+                                            json.dumps(result['params'], sort_keys=True),
+                                            old['best'] / result['best']))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--suite', choices=sorted(SUITES) + ['all'], default='all')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--quick', action='store_true', help='use smaller inputs')
+    parser.add_argument('--port', type=int, default=8765, help='port for the local API stand-in')
+    parser.add_argument('--latency-ms', type=int, default=5, help='latency the stand-in adds to each response')
+    parser.add_argument('--output', help='write results as JSON to this path')
+    parser.add_argument('--compare', help='a previous --output file to compare against')
+    args = parser.parse_args(argv)
+
+    logging.getLogger('requests.packages.urllib3').setLevel(logging.ERROR)
+    logging.getLogger('urllib3').setLevel(logging.ERROR)
+
+    suites = sorted(SUITES) if args.suite == 'all' else [args.suite]
+    results = []
+    for suite in suites:
+        for result in SUITES[suite](args.repeat, quick=args.quick, port=args.port, latency_ms=args.latency_ms):
+            print('%-12s %-32s %-48s %9.4fs %12.1f/s' % (result['suite'], result['name'],
+                                                         json.dumps(result['params'], sort_keys=True),
+                                                         result['best'], result['items_per_second'] or 0))
+            results.append(result)
+
+    report = {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return report
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+A local stand-in for the Platform API, serving generated frame listings,
+datapoints, and the fixture tile with an optional fixed latency.
+
+    python -m benchmarks.server [port] [latency_ms]
+"""
+import json
+import os
+import re
+import sys
+import time
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+
+from benchmarks.fixtures import frames_json, products_json
+
+
+TILE = open(os.path.join(os.path.dirname(__file__), '..', 'tests', 'fixtures', 'tile.tiff'), 'rb').read()
+
+_routes = [
+    (re.compile(r'^/frames/[^/]+/tile/'), 'image/tiff', lambda m, q: TILE),
+    (re.compile(r'^/frames/[^/]+/datapoint/'), 'application/json',
+     lambda m, q: json.dumps({"tile": "/frames/frame-id/tile/5/7/12", "pixel": {"row": 173, "column": 97},
+                              "value": 0.296531558})),
+    (re.compile(r'^/products/[^/]+/frames$'), 'application/json',
+     lambda m, q: json.dumps(frames_json(int(q.get('limit', 100))))),
+    (re.compile(r'^/products$'), 'application/json', lambda m, q: json.dumps(products_json(100))),
+]
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+
+    def do_GET(self):
+        path, _, query = self.path.partition('?')
+        params = dict(p.split('=', 1) for p in query.split('&') if '=' in p)
+        for pattern, content_type, body in _routes:
+            match = pattern.match(path)
+            if match:
+                time.sleep(self.latency)
+                content = body(match, params)
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(content)))
+                self.end_headers()
+                self.wfile.write(content)
+                return
+        self.send_error(404)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+
+def serve(port=8765, latency_ms=0):
+    _Handler.latency = latency_ms / 1000.0
+    _Server(('127.0.0.1', port), _Handler).serve_forever()
+
+
+if __name__ == '__main__':
+    serve(*[int(a) for a in sys.argv[1:3]])
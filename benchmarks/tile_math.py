@@ -0,0 +1,54 @@
+"""
+Compares the scalar MapTile conversions against their vectorized counterparts.
+
+    python -m benchmarks.tile_math [points] [zoom]
+"""
+import sys
+import timeit
+
+import numpy as np
+
+from skywiseplatform.tile import MapTile
+
+
+def _scalar(latitudes, longitudes, z):
+    quadkeys = []
+    for lat, lon in zip(latitudes, longitudes):
+        pixel_x, pixel_y = MapTile.lat_lon_to_pixel_xy(lat, lon, z)
+        x, y = MapTile.pixel_xy_to_tile_xy(pixel_x, pixel_y)
+        quadkeys.append(MapTile.tile_to_quadkey(x, y, z))
+    return quadkeys
+
+
+def _vectorized(latitudes, longitudes, z):
+    return MapTile.lat_lon_to_quadkey_array(latitudes, longitudes, z)
+
+
+def run(points=100000, z=12, repeat=3):
+    rng = np.random.RandomState(0)
+    latitudes = rng.uniform(-85.0, 85.0, points)
+    longitudes = rng.uniform(-180.0, 180.0, points)
+    scalar_latitudes = latitudes.tolist()
+    scalar_longitudes = longitudes.tolist()
+
+    if list(_vectorized(latitudes, longitudes, z)) != _scalar(scalar_latitudes, scalar_longitudes, z):
+        raise AssertionError("Vectorized quadkeys do not match the scalar conversion.")
+
+    scalar = min(timeit.repeat(lambda: _scalar(scalar_latitudes, scalar_longitudes, z),
+                               number=1, repeat=repeat))
+    vectorized = min(timeit.repeat(lambda: _vectorized(latitudes, longitudes, z),
+                                   number=1, repeat=repeat))
+    return {
+        'points': points,
+        'zoom': z,
+        'scalar_seconds': scalar,
+        'vectorized_seconds': vectorized,
+        'speedup': scalar / vectorized
+    }
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    result = run(*args)
+    print("%(points)d points @ z%(zoom)d: scalar %(scalar_seconds).3fs, "
+          "vectorized %(vectorized_seconds).3fs (%(speedup).1fx)" % result)
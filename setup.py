@@ -11,6 +11,12 @@ setup(
         'skywise-rest-client>=1.0.7',
         'voluptuous>=0.8.8'
     ],
+    extras_require={
+        'numpy': ['numpy'],
+        'raster': ['numpy', 'Pillow'],
+        'async': ['futures; python_version < "3"'],
+        'http2': ['hyper']
+    },
 
     # metadata for upload to PyPI
     author='Weather Decision Technologies',
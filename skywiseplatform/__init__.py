@@ -1,15 +1,250 @@
+import copy
 import os
+import time
 
-from skywiserestclient import SkyWiseResource
+import requests
+from skywiserestclient import SkyWiseResource, SkyWiseResourceList
+
+from .cache import conditional_headers, response_validators
+from .decoding import STRICT
+from .flight import request_key
+from .instrumentation import RequestEvent, emit
+from .pool import ConnectionPool
+from .scheduler import RequestScheduler
 
 
 class PlatformResource(SkyWiseResource):
-    pass
+
+    _metadata_cache = None
+    _cache_ttl = None
+    _scheduler = None
+    _decoding = STRICT
+    _single_flight = None
+    _request_hooks = ()
+    _connection_pool = None
+
+    @classmethod
+    def get_decoding(cls):
+        return cls._decoding
+
+    @classmethod
+    def set_decoding(cls, decoding):
+        """
+        Sets how JSON responses are decoded. 'strict' validates them against the
+        resource's schema; 'fast' trusts their types and parses datetime fields
+        only when they are read. Only frames, products, and forecasts support
+        'fast'; other resources always decode strictly.
+        """
+        cls._decoding = decoding
+
+    @classmethod
+    def get_metadata_cache(cls):
+        return cls._metadata_cache
+
+    @classmethod
+    def set_metadata_cache(cls, cache):
+        """
+        Sets the MetadataCache used by find(). Setting it on PlatformResource caches
+        the JSON metadata resources with a TTL (products, styles, forecasts and
+        frames); None disables caching. Tiles and datapoints are never cached here.
+        """
+        cls._metadata_cache = cache
+
+    @classmethod
+    def get_cache_ttl(cls):
+        return cls._cache_ttl
+
+    @classmethod
+    def set_cache_ttl(cls, seconds):
+        """ Sets how long find() results are cached. None never caches them. """
+        cls._cache_ttl = seconds
+
+    @classmethod
+    def _expires(cls, resources, expires=None):
+        """ Returns when a find() result stops being current, if it is known. """
+        return expires
+
+    @classmethod
+    def find(cls, id_=None, expires=None, **kwargs):
+        cache = cls.get_metadata_cache()
+        ttl = cls.get_cache_ttl()
+        if cache is None or ttl is None:
+            return super(PlatformResource, cls).find(id_=id_, **kwargs)
+
+        key = cache.key(cls, id_, **kwargs)
+        resources = cache.get(key)
+        if resources is not None:
+            return resources
+
+        validators = cache.validators(key)
+        if validators is not None:
+            # Revalidate the expired entry; a 304 costs only headers.
+            response = cls._fetch(id_, conditional_headers(validators), **kwargs)
+            if response.status_code == 304:
+                resources = cache.revalidate(key, ttl)
+                if resources is not None:
+                    return resources
+                response = cls._fetch(id_, **kwargs)
+        else:
+            response = cls._fetch(id_, **kwargs)
+        resources = cls._unpack_response(response)
+        cache.set(key, resources, ttl, expires=cls._expires(resources, expires),
+                  validators=response_validators(response))
+        return resources
+
+    @classmethod
+    def _fetch(cls, id_=None, conditional=None, headers=None, **kwargs):
+        """ Requests a resource or list, as find() does, adding any conditional headers. """
+        if conditional:
+            headers = dict(headers or {}, **conditional)
+        if id_:
+            return cls._get(id_, headers=headers, **kwargs)
+        return cls._get_list(headers=headers, **kwargs)
+
+    @classmethod
+    def get_single_flight(cls):
+        return cls._single_flight
+
+    @classmethod
+    def set_single_flight(cls, single_flight):
+        """
+        Sets the SingleFlight that coalesces identical requests made at the same
+        time, so callers share one response. None sends every request.
+        """
+        cls._single_flight = single_flight
+
+    @classmethod
+    def get_connection_pool(cls):
+        return cls._connection_pool
+
+    @classmethod
+    def set_connection_pool(cls, pool):
+        """
+        Configures the shared session's connection pool with a ConnectionPool.
+        Asynchronous requests are made on the same session so they reuse its
+        connections too. None puts back requests' default connection pool.
+        """
+        cls._connection_pool = pool
+        (pool or ConnectionPool()).mount(cls.get_session())
+        if pool is not None:
+            cls.set_use_session_for_async(True)
+
+    @classmethod
+    def get_request_hooks(cls):
+        return cls._request_hooks
+
+    @classmethod
+    def set_request_hooks(cls, hooks):
+        """
+        Sets the callables given a RequestEvent after every request, whether made
+        synchronously or through map_async(). Setting them on PlatformResource
+        instruments every resource type. Hooks run on the requesting greenlet or
+        thread, so they should be quick.
+        """
+        cls._request_hooks = tuple(hooks)
+
+    @classmethod
+    def _request(cls, path, url, headers, fetch, **kwargs):
+        """ Sends a request with fetch(), coalescing identical requests and reporting it to the request hooks. """
+        hooks = cls.get_request_hooks()
+        single_flight = cls.get_single_flight()
+        if not hooks and single_flight is None:
+            return fetch()
+
+        sent = []
+
+        def send():
+            sent.append(True)
+            return fetch()
+
+        started = time.time()
+        response, error = None, None
+        try:
+            if single_flight is None:
+                response = send()
+            else:
+                headers = dict(cls.get_headers(), **(headers or {}))
+                response = single_flight.do(request_key(url, cls._path_args(**kwargs), headers), send)
+            return response
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if hooks:
+                emit(hooks, RequestEvent.from_response(cls, path, url, response, error=error, coalesced=not sent,
+                                                       latency=time.time() - started))
+
+    @classmethod
+    def _get(cls, id_, headers=None, **kwargs):
+        return cls._request(cls._path + '/{id}', cls._resource_path(id_, **kwargs), headers,
+                            lambda: super(PlatformResource, cls)._get(id_, headers=headers, **kwargs), **kwargs)
+
+    @classmethod
+    def _get_list(cls, headers=None, **kwargs):
+        return cls._request(cls._path, cls._list_path(**kwargs), headers,
+                            lambda: super(PlatformResource, cls)._get_list(headers=headers, **kwargs), **kwargs)
+
+    @classmethod
+    def get_scheduler(cls):
+        return cls._scheduler
+
+    @classmethod
+    def set_scheduler(cls, scheduler):
+        """
+        Sets the RequestScheduler that sends batches for map() and imap(). None
+        sends map_size requests at a time without rate limiting or retries.
+        """
+        cls._scheduler = scheduler
+
+    @classmethod
+    def _get_scheduler(cls):
+        return cls.get_scheduler() or RequestScheduler(max_in_flight=cls.get_map_size())
+
+    @classmethod
+    def map_results(cls, skywise_requests):
+        """ Sends SkyWise Requests concurrently and returns a RequestResult for each, in order. """
+        return cls._get_scheduler().run(skywise_requests)
+
+    @classmethod
+    def map(cls, skywise_requests, raise_on_error=True):
+        """
+        Sends SkyWise Requests concurrently and returns their resources in order.
+        Failed requests raise their error, or are left out if raise_on_error is False.
+        """
+        resources = []
+        for result in cls.map_results(skywise_requests):
+            if not result.ok:
+                if raise_on_error:
+                    raise result.error
+                continue
+            resources.append(result.resource)
+        return SkyWiseResourceList(resources)
+
+    @classmethod
+    def imap(cls, skywise_requests, size=None, raise_on_error=True):
+        """
+        Sends SkyWise Requests concurrently and yields each resource as soon as
+        its response arrives, in completion order. At most `size` requests are in
+        flight and `size` finished resources are buffered at a time, so
+        skywise_requests may be a generator of any length.
+        """
+        scheduler = cls._get_scheduler()
+        if size is not None:
+            scheduler = copy.copy(scheduler)
+            scheduler.max_in_flight = size
+        for result in scheduler.imap(skywise_requests):
+            if not result.ok:
+                if raise_on_error:
+                    raise result.error
+                continue
+            yield result.resource
 
 _site = os.getenv('SKYWISE_PLATFORM_SITE', 'http://platform.api.wdtinc.com')
 _user = os.getenv('SKYWISE_PLATFORM_APP_ID', '')
 _password = os.getenv('SKYWISE_PLATFORM_APP_KEY', '')
 
+# One session, so every resource type shares its connection pool.
+PlatformResource.set_session(requests.Session())
 PlatformResource.set_site(_site)
 PlatformResource.set_user(_user)
 PlatformResource.set_password(_password)
@@ -19,6 +254,14 @@ def map_async(skywise_requests, raise_on_error=True):
     return PlatformResource.map(skywise_requests, raise_on_error=raise_on_error)
 
 
+def imap_async(skywise_requests, size=None, raise_on_error=True):
+    return PlatformResource.imap(skywise_requests, size=size, raise_on_error=raise_on_error)
+
+
+def map_async_results(skywise_requests):
+    return PlatformResource.map_results(skywise_requests)
+
+
 from .style import Style
 from .tile import BingMapsTile, GoogleMapsTile
 from .datapoint import Datapoint
@@ -0,0 +1,15 @@
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from skywiserestclient import SkyWiseException
+
+
+def require_numpy(feature):
+    """ Returns the numpy module, raising a SkyWiseException naming the feature if
+        numpy is not installed. """
+    if numpy is None:
+        raise SkyWiseException("numpy is required for %s. Install it with "
+                               "`pip install skywise-platform[numpy]`." % feature)
+    return numpy
@@ -0,0 +1,120 @@
+import threading
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from . import PlatformResource, GoogleMapsTile, Product
+
+
+class AsyncClient(object):
+    """
+    Future-based access to platform resources. Each method returns a
+    concurrent.futures.Future, and requests run on a bounded pool of
+    max_connections workers, so many calls can be fanned out without holding a
+    batch of requests for map_async().
+
+    The workers are threads. Importing skywiseplatform loads grequests, which
+    monkey-patches sockets with gevent but leaves threads alone, so calling a
+    future's result() blocks the calling thread rather than yielding to other
+    greenlets. There is no asyncio support: the package runs on Python 2,
+    which has no asyncio.
+
+    Example:
+        .. code-block:: python
+
+            with AsyncClient(max_connections=50, pool=ConnectionPool(pool_size=50)) as client:
+                product = client.product('skywise-1hr-precipitation-analysis').result()
+                frames = client.frames(product).result()
+                tiles = [f.result() for f in [client.tile(frame, x=0, y=0, z=1) for frame in frames]]
+
+    Args:
+        max_connections (int): the most requests in flight at once.
+        pool (ConnectionPool): a connection pool for the shared session while the
+            client is open. Size it to max_connections so requests in flight
+            don't open connections beyond the pool. The previous pool is put back
+            by close(). By default the client uses whatever pool is set with
+            PlatformResource.set_connection_pool().
+    """
+
+    def __init__(self, max_connections=10, pool=None):
+        self.max_connections = max_connections
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+        self._previous_pool = None
+        if pool is not None:
+            self._previous_pool = (PlatformResource.get_connection_pool(),
+                                   PlatformResource.get_use_session_for_async())
+            PlatformResource.set_connection_pool(pool)
+
+    def close(self):
+        """ Waits for outstanding requests, shuts down the worker pool, and puts back the previous connection pool. """
+        self._executor.shutdown(wait=True)
+        if self._previous_pool is not None:
+            pool, use_session_for_async = self._previous_pool
+            self._previous_pool = None
+            PlatformResource.set_connection_pool(pool)
+            PlatformResource.set_use_session_for_async(use_session_for_async)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _submit(self, fn, *args, **kwargs):
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def _gather(self, futures):
+        """ Combines concurrent futures into one future of their results, in order. """
+        combined = Future()
+        results = [None] * len(futures)
+        remaining = [len(futures)]
+        lock = threading.Lock()
+
+        def done(i, future):
+            with lock:
+                if combined.done():
+                    return
+                error = future.exception()
+                if error is not None:
+                    combined.set_exception(error)
+                    return
+                results[i] = future.result()
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    combined.set_result(results)
+
+        if not futures:
+            combined.set_result(results)
+        for i, future in enumerate(futures):
+            future.add_done_callback(lambda f, i=i: done(i, f))
+        return combined
+
+    def product(self, id_=None, **kwargs):
+        """ Product.find on the worker pool. """
+        return self._submit(Product.find, id_, **kwargs)
+
+    def styles(self, product):
+        return self._submit(product.styles)
+
+    def forecasts(self, product, **kwargs):
+        return self._submit(product.forecasts, **kwargs)
+
+    def frames(self, product_or_forecast, **kwargs):
+        """ frames() listing for a product or forecast on the worker pool. """
+        return self._submit(product_or_forecast.frames, **kwargs)
+
+    def tile(self, frame, x=None, y=None, z=None, quadkey=None, **kwargs):
+        return self._submit(frame.tile, x=x, y=y, z=z, quadkey=quadkey, **kwargs)
+
+    def datapoint(self, frame, lat, lon):
+        return self._submit(frame.datapoint, lat, lon)
+
+    def tileset(self, frame_id, lat_lon_bounding_box, z, padding=None, **kwargs):
+        """
+        GoogleMapsTile.tileset on the worker pool, as one future of every tile. Each
+        tile is its own request on the pool, so large tilesets share connections
+        fairly with other work.
+        """
+        tile_range = GoogleMapsTile.tile_range(lat_lon_bounding_box, z, padding=padding)
+        futures = [self._executor.submit(GoogleMapsTile.find, frame_id, x, y, z, **kwargs)
+                   for x, y in tile_range]
+        return self._gather(futures)
@@ -0,0 +1,148 @@
+import time
+from collections import OrderedDict
+
+import gevent
+
+from skywiseplatform import GoogleMapsTile
+
+
+class LoopStats(object):
+    """
+    Counts how often a frame's tiles were ready when a FrameLoop asked for them.
+
+    Attributes:
+        hits (int): frames whose prefetched tiles had already arrived.
+        late (int): frames that were being prefetched but had to be waited for.
+        misses (int): frames that had not been prefetched and were fetched on demand.
+        wait (float): total seconds spent waiting on late and missed frames.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.late = 0
+        self.misses = 0
+        self.wait = 0.0
+
+    @property
+    def requests(self):
+        return self.hits + self.late + self.misses
+
+    @property
+    def hit_rate(self):
+        return float(self.hits) / self.requests if self.requests else 0.0
+
+    def __repr__(self):
+        return '<LoopStats hits=%i late=%i misses=%i wait=%.3fs>' % (self.hits, self.late, self.misses, self.wait)
+
+
+class FrameLoop(object):
+    """
+    Steps through the same tiles of a list of frames, as a map animation does,
+    prefetching the tiles of the next few frames while the current one is shown.
+
+    Example:
+        .. code-block:: python
+
+            frames = product.frames(start=start, end=end)
+            loop = FrameLoop.for_bbox(frames, ((37.06, -94.40), (33.56, -103.19)), z=6, prefetch=3)
+            for frame, tiles in loop.play(cycles=5):
+                draw(frame, tiles)
+            print(loop.stats)
+
+    Args:
+        frames (list): the frames to animate, in order.
+        tiles (list of tuple): the (x, y) tiles to request for each frame.
+        z (int): the zoom level of the tiles.
+        prefetch (int): how many frames ahead to fetch. At most this many frames of
+            tiles are buffered besides the current one.
+        wrap (bool): whether the frame after the last is the first, as in a looping
+            animation.
+        **kwargs: passed to GoogleMapsTile.find_many, e.g. style or media_type.
+    """
+
+    def __init__(self, frames, tiles, z, prefetch=2, wrap=True, **kwargs):
+        self.frames = list(frames)
+        self.tiles = list(tiles)
+        self.z = z
+        self.prefetch = prefetch
+        self.wrap = wrap
+        self.stats = LoopStats()
+        self._kwargs = kwargs
+        self._buffer = OrderedDict()
+
+    @classmethod
+    def for_bbox(cls, frames, lat_lon_bounding_box, z, padding=None, **kwargs):
+        """ Returns a FrameLoop over the tiles covering a bounding box. """
+        return cls(frames, GoogleMapsTile.tile_range(lat_lon_bounding_box, z, padding=padding), z, **kwargs)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __iter__(self):
+        for i in xrange(len(self.frames)):
+            yield self.frames[i], self.get(i)
+
+    def play(self, cycles=None):
+        """ Yields (frame, tiles) for each frame in turn, `cycles` times or forever. """
+        cycle = 0
+        try:
+            while cycles is None or cycle < cycles:
+                for frame_and_tiles in self:
+                    yield frame_and_tiles
+                cycle += 1
+        finally:
+            self.close()
+
+    def _fetch(self, frame):
+        try:
+            tiles = GoogleMapsTile.find_many(frame.id, self.tiles, self.z, **self._kwargs)
+        except Exception as e:
+            return e
+        for tile in tiles:
+            tile.frame = frame
+        return tiles
+
+    def _upcoming(self, index):
+        upcoming = []
+        for i in xrange(index + 1, index + 1 + self.prefetch):
+            if self.wrap:
+                i %= len(self.frames)
+            if i < len(self.frames) and i != index and i not in upcoming:
+                upcoming.append(i)
+        return upcoming
+
+    def _schedule(self, index):
+        """ Starts fetching the frames after index and drops buffered frames outside that window. """
+        upcoming = self._upcoming(index)
+        for i in list(self._buffer):
+            if i not in upcoming:
+                self._buffer.pop(i).kill(block=False)
+        for i in upcoming:
+            if i not in self._buffer:
+                self._buffer[i] = gevent.spawn(self._fetch, self.frames[i])
+
+    def get(self, index):
+        """ Returns the tiles of the frame at index, in the order of `tiles`. """
+        greenlet = self._buffer.pop(index, None)
+        self._schedule(index)
+        if greenlet is not None and greenlet.ready():
+            self.stats.hits += 1
+            tiles = greenlet.value
+        else:
+            started = time.time()
+            if greenlet is None:
+                self.stats.misses += 1
+                tiles = self._fetch(self.frames[index])
+            else:
+                self.stats.late += 1
+                tiles = greenlet.get()
+            self.stats.wait += time.time() - started
+        if isinstance(tiles, Exception):
+            raise tiles
+        return tiles
+
+    def close(self):
+        """ Stops any prefetching still in progress. """
+        for greenlet in self._buffer.values():
+            greenlet.kill()
+        self._buffer.clear()
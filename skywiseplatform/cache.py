@@ -0,0 +1,378 @@
+import calendar
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+from skywiserestclient import SkyWiseResourceList
+
+_VALIDATORS = '.validators'
+
+
+def response_validators(response):
+    """ Returns the (ETag, Last-Modified) validators of a response. Either may be None. """
+    return response.headers.get('ETag'), response.headers.get('Last-Modified')
+
+
+def conditional_headers(validators):
+    """ Returns the If-None-Match and If-Modified-Since headers that revalidate a cached response. """
+    etag, last_modified = validators
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    return headers
+
+
+def not_modified_hook(content):
+    """
+    Returns a response hook that turns a 304 Not Modified response into a 200
+    carrying the cached content, so it can be unpacked like any other response.
+    Such responses have `not_modified` set.
+    """
+    def hook(response, **kwargs):
+        if response.status_code == 304:
+            response.status_code = 200
+            response._content = content
+            response.not_modified = True
+        return response
+    return hook
+
+
+class TileCache(object):
+    """
+    Base class for tile content caches. Entries are tile bodies keyed by
+    MapTile.cache_key() and evicted least-recently-used first once the cache
+    holds more than `max_bytes`. An entry may also keep the ETag and
+    Last-Modified validators of the response it came from, so it can be
+    revalidated with a conditional request.
+    """
+
+    def __init__(self, max_bytes, clock=time.time):
+        self.max_bytes = max_bytes
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.RLock()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        """ The number of bytes currently held by the cache. """
+        return self._size
+
+    def get(self, key):
+        """ Returns the cached content for key, or None. """
+        with self._lock:
+            if key not in self._entries:
+                return None
+            content = self._load(key)
+            if content is None:
+                self._forget(key)
+                return None
+            self._entries[key] = self._entries.pop(key)
+            return content
+
+    def set(self, key, content, validators=None):
+        """
+        Caches content under key, evicting older entries to stay within budget.
+
+        Args:
+            validators (tuple): the (ETag, Last-Modified) of the response the
+                content came from. See response_validators().
+        """
+        if len(content) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._forget(key)
+            self._store(key, content)
+            if validators is not None and any(validators):
+                self._store_validators(key, tuple(validators) + (self._clock(),))
+            self._entries[key] = len(content)
+            self._size += len(content)
+            while self._size > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._forget(oldest)
+
+    def validators(self, key):
+        """ Returns the (ETag, Last-Modified) validators cached with key, or None. """
+        with self._lock:
+            validators = key in self._entries and self._load_validators(key)
+        return validators[:2] if validators else None
+
+    def age(self, key):
+        """ Returns the seconds since key was cached or last revalidated, or None if it has no validators. """
+        with self._lock:
+            validators = key in self._entries and self._load_validators(key)
+        return self._clock() - validators[2] if validators else None
+
+    def revalidated(self, key):
+        """ Records that the server confirmed key's content is unchanged (a 304 Not Modified). """
+        with self._lock:
+            validators = key in self._entries and self._load_validators(key)
+            if validators:
+                self._store_validators(key, validators[:2] + (self._clock(),))
+                self._entries[key] = self._entries.pop(key)
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._forget(key)
+
+    def _forget(self, key):
+        self._size -= self._entries.pop(key)
+        self._discard(key)
+
+    def _load(self, key):
+        raise NotImplementedError()
+
+    def _store(self, key, content):
+        raise NotImplementedError()
+
+    def _discard(self, key):
+        raise NotImplementedError()
+
+    def _load_validators(self, key):
+        raise NotImplementedError()
+
+    def _store_validators(self, key, validators):
+        raise NotImplementedError()
+
+
+class MemoryTileCache(TileCache):
+    """ Keeps tile bodies in process memory. """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, clock=time.time):
+        super(MemoryTileCache, self).__init__(max_bytes, clock=clock)
+        self._contents = {}
+        self._validators = {}
+
+    def _load(self, key):
+        return self._contents.get(key)
+
+    def _store(self, key, content):
+        self._contents[key] = content
+
+    def _discard(self, key):
+        self._contents.pop(key, None)
+        self._validators.pop(key, None)
+
+    def _load_validators(self, key):
+        return self._validators.get(key)
+
+    def _store_validators(self, key, validators):
+        self._validators[key] = validators
+
+
+class DiskTileCache(TileCache):
+    """
+    Keeps tile bodies as files under `directory`, so the cache survives restarts
+    and can be shared by processes on the same host. Recency is tracked with file
+    modification times, and validators are kept beside each tile in a small
+    JSON file.
+    """
+
+    def __init__(self, directory, max_bytes=4 * 1024 * 1024 * 1024, clock=time.time):
+        super(DiskTileCache, self).__init__(max_bytes, clock=clock)
+        self.directory = directory
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        self._scan()
+
+    def _scan(self):
+        """ Rebuilds the LRU order from the files already on disk. """
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if name.endswith('.tmp') or name.endswith(_VALIDATORS):
+                    continue
+                path = os.path.join(root, name)
+                stat = os.stat(path)
+                files.append((stat.st_mtime, name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._entries[name] = size
+            self._size += size
+        while self._size > self.max_bytes:
+            self._forget(next(iter(self._entries)))
+
+    def _name(self, key):
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name[:2], name)
+
+    def __contains__(self, key):
+        return self._name(key) in self._entries
+
+    def get(self, key):
+        name = self._name(key)
+        with self._lock:
+            path = self._path(name)
+            if name not in self._entries and os.path.exists(path):
+                # Written by another process sharing the directory.
+                self._entries[name] = os.path.getsize(path)
+                self._size += self._entries[name]
+        return super(DiskTileCache, self).get(name)
+
+    def set(self, key, content, validators=None):
+        return super(DiskTileCache, self).set(self._name(key), content, validators=validators)
+
+    def validators(self, key):
+        return super(DiskTileCache, self).validators(self._name(key))
+
+    def age(self, key):
+        return super(DiskTileCache, self).age(self._name(key))
+
+    def revalidated(self, key):
+        return super(DiskTileCache, self).revalidated(self._name(key))
+
+    def _load(self, name):
+        path = self._path(name)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            os.utime(path, None)
+        except (IOError, OSError):
+            return None
+        return content
+
+    def _store(self, name, content):
+        self._write(self._path(name), content)
+
+    def _write(self, path, content):
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        fd, tmp = tempfile.mkstemp(suffix='.tmp', dir=directory)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.rename(tmp, path)
+
+    def _discard(self, name):
+        for path in (self._path(name), self._path(name) + _VALIDATORS):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _load_validators(self, name):
+        try:
+            with open(self._path(name) + _VALIDATORS, 'rb') as f:
+                return tuple(json.loads(f.read().decode('utf-8')))
+        except (IOError, OSError, ValueError):
+            return None
+
+    def _store_validators(self, name, validators):
+        self._write(self._path(name) + _VALIDATORS, json.dumps(validators).encode('utf-8'))
+
+
+class MetadataCache(object):
+    """
+    In-memory cache of JSON resources returned by PlatformResource.find(). Each
+    entry expires after its resource class's TTL, or earlier when the response
+    says when it stops being current (e.g. a forecast's expirationTime).
+    Expired entries with an ETag or Last-Modified are kept until evicted, so
+    they can be revalidated with a conditional request.
+    """
+
+    def __init__(self, max_entries=10000, clock=time.time):
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(resource_class, id_=None, **kwargs):
+        args = sorted((k, v) for k, v in kwargs.items() if v is not None)
+        return "%s|%s|%r" % (resource_class.__name__, id_, args)
+
+    def get(self, key):
+        """ Returns a fresh copy of the cached resource(s) for key, or None. """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, _, resource_class, data, validators = entry
+            if expires_at <= self._clock():
+                if not any(validators):
+                    del self._entries[key]
+                return None
+            self._entries[key] = self._entries.pop(key)
+        return _load_resources(resource_class, data)
+
+    def validators(self, key):
+        """ Returns the (ETag, Last-Modified) validators cached with key, even if it has expired, or None. """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or not any(entry[4]):
+            return None
+        return entry[4]
+
+    def revalidate(self, key, ttl):
+        """
+        Renews an entry the server confirmed is unchanged (a 304 Not Modified)
+        for another ttl seconds, and returns a copy of its resource(s). Returns
+        None if the entry has since been evicted.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            _, limit, resource_class, data, validators = entry
+            self._entries[key] = (self._expires_at(ttl, limit), limit, resource_class, data, validators)
+        return _load_resources(resource_class, data)
+
+    def set(self, key, resources, ttl, expires=None, validators=(None, None)):
+        """
+        Caches a resource or resource list for ttl seconds, or until expires
+        (a datetime) if that is sooner.
+
+        Args:
+            validators (tuple): the (ETag, Last-Modified) of the response the
+                resources came from. See response_validators().
+        """
+        limit = calendar.timegm(expires.utctimetuple()) if expires is not None else None
+        if isinstance(resources, SkyWiseResourceList):
+            resource_class = type(resources[0]) if len(resources) else None
+            data = [r._data.copy() for r in resources]
+        else:
+            resource_class = type(resources)
+            data = resources._data.copy()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (self._expires_at(ttl, limit), limit, resource_class, data, tuple(validators))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _expires_at(self, ttl, limit):
+        expires_at = self._clock() + ttl
+        return expires_at if limit is None else min(expires_at, limit)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _load_resources(resource_class, data):
+    if isinstance(data, list):
+        return SkyWiseResourceList([_load_resource(resource_class, d) for d in data])
+    return _load_resource(resource_class, data)
+
+
+def _load_resource(resource_class, data):
+    resource = resource_class()
+    resource._data = data.copy()
+    return resource
@@ -0,0 +1,202 @@
+import math
+import numbers
+from collections import defaultdict
+
+from .tile import MapTile
+
+_TILE_SIZE = 256.0
+
+
+def _project(latitude, longitude, z):
+    """ Converts a point to fractional tile XY coordinates at zoom z, at the same pixel as tile_range(). """
+    pixel_x, pixel_y = MapTile.lat_lon_to_pixel_xy(latitude, longitude, z)
+    return pixel_x / _TILE_SIZE, pixel_y / _TILE_SIZE
+
+
+def _edge_tiles(start, end, tiles):
+    """ Adds every tile a line segment passes through. """
+    (x0, y0), (x1, y1) = start, end
+    tx, ty = int(math.floor(x0)), int(math.floor(y0))
+    ex, ey = int(math.floor(x1)), int(math.floor(y1))
+    dx, dy = x1 - x0, y1 - y0
+    step_x = 1 if dx > 0 else -1
+    step_y = 1 if dy > 0 else -1
+    # How far along the segment (0 to 1) the next vertical and horizontal tile borders are.
+    next_x = ((tx + (step_x > 0)) - x0) / dx if dx else float('inf')
+    next_y = ((ty + (step_y > 0)) - y0) / dy if dy else float('inf')
+    delta_x = abs(1.0 / dx) if dx else float('inf')
+    delta_y = abs(1.0 / dy) if dy else float('inf')
+
+    tiles.add((tx, ty))
+    remaining_x, remaining_y = abs(ex - tx), abs(ey - ty)
+    while remaining_x or remaining_y:
+        if remaining_x and (not remaining_y or next_x < next_y):
+            tx += step_x
+            next_x += delta_x
+            remaining_x -= 1
+        else:
+            ty += step_y
+            next_y += delta_y
+            remaining_y -= 1
+        tiles.add((tx, ty))
+
+
+def _fill_tiles(ring, tiles):
+    """ Adds the tiles whose centerline crosses the inside of a ring, by the even-odd rule. """
+    edges = list(zip(ring, ring[1:] + ring[:1]))
+    ys = [y for _, y in ring]
+    for row in xrange(int(math.floor(min(ys))), int(math.floor(max(ys))) + 1):
+        center = row + 0.5
+        crossings = sorted(x0 + (center - y0) * (x1 - x0) / (y1 - y0)
+                           for (x0, y0), (x1, y1) in edges if (y0 <= center) != (y1 <= center))
+        for start, end in zip(crossings[0::2], crossings[1::2]):
+            for column in xrange(int(math.floor(start)), int(math.floor(end)) + 1):
+                tiles.add((column, row))
+
+
+def _ring_tiles(ring, tiles):
+    """
+    Adds the tiles a ring touches. Tiles the boundary passes through are found by
+    walking each edge; any other tile touched is wholly inside, so its centerline
+    is inside and a scanline fill finds it.
+    """
+    for start, end in zip(ring, ring[1:] + ring[:1]):
+        _edge_tiles(start, end, tiles)
+    _fill_tiles(ring, tiles)
+
+
+def _hull(points):
+    """ Returns the convex hull of points, counterclockwise. """
+    points = sorted(set(points))
+    if len(points) < 3:
+        return points
+
+    def cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in points:
+        while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(points):
+        while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def _is_ring(polygon):
+    return isinstance(polygon[0][0], numbers.Number)
+
+
+def polygon_tiles(polygon, z, padding=None):
+    """
+    Returns the (x, y) tiles at zoom z that a polygon touches, rather than every
+    tile in its bounding box, so narrow or diagonal areas such as corridors and
+    coastlines request far fewer tiles.
+
+    Args:
+        polygon (list): the polygon's (latitude, longitude) vertices, or a list
+            of such polygons to cover their union. Rings needn't be closed, and
+            edges are straight lines on the (Web Mercator) map.
+        z (int): the zoom level.
+        padding (int): also include tiles within this many pixels of the polygon,
+            as tile_range() does near a bounding box's edges.
+
+    Returns:
+        list of tuple: the tiles, sorted by x then y.
+    """
+    polygons = [polygon] if _is_ring(polygon) else polygon
+    tiles = set()
+    for ring in polygons:
+        ring = [_project(latitude, longitude, z) for latitude, longitude in ring]
+        if len(ring) > 1 and ring[0] == ring[-1]:
+            ring = ring[:-1]
+        _ring_tiles(ring, tiles)
+        if padding:
+            # Cover the area swept by a square 2 * padding wide moving along each edge.
+            d = padding / _TILE_SIZE
+            for (x0, y0), (x1, y1) in zip(ring, ring[1:] + ring[:1]):
+                corners = [(x + sx * d, y + sy * d) for x, y in ((x0, y0), (x1, y1))
+                           for sx in (-1, 1) for sy in (-1, 1)]
+                _ring_tiles(_hull(corners), tiles)
+
+    n = 1 << z
+    return sorted((x, y) for x, y in tiles if 0 <= x < n and 0 <= y < n)
+
+
+def bbox_tiles(lat_lon_bounding_boxes, z, padding=None):
+    """
+    Returns the (x, y) tiles at zoom z covering any of several bounding boxes,
+    each ((north, east), (south, west)), without duplicates where they overlap.
+    """
+    tiles = set()
+    for lat_lon_bounding_box in lat_lon_bounding_boxes:
+        tiles.update(MapTile.iter_tile_range(lat_lon_bounding_box, z, padding=padding))
+    return sorted(tiles)
+
+
+def area_tiles(area, z, padding=None):
+    """
+    Returns the (x, y) tiles at zoom z covering a polygon, a list of polygons,
+    or a list of bounding boxes, as MapTile.tile_range() does for them.
+
+    Raises:
+        ValueError: if the list mixes bounding boxes and polygons.
+    """
+    if not area:
+        return []
+    if _is_ring(area):
+        return polygon_tiles(area, z, padding=padding)
+    sizes = set(len(a) for a in area)
+    if sizes == {2}:
+        return bbox_tiles(area, z, padding=padding)
+    if 2 not in sizes:
+        return polygon_tiles(area, z, padding=padding)
+    raise ValueError("An area is a list of bounding boxes or of polygons, not both.")
+
+
+def compact_quadkeys(quadkeys, min_z=0):
+    """
+    Merges quadkeys, which may be of different zoom levels, into the fewest that
+    cover the same area: quadkeys inside another are dropped, and any four
+    siblings are replaced by their parent, down to zoom min_z.
+
+    Example:
+        .. code-block:: python
+
+            >>> compact_quadkeys(['0230', '0231', '0232', '0233', '021', '0211'])
+            ['021', '023']
+    """
+    keys = set(quadkeys)
+    keys = set(k for k in keys if not any(k[:i] in keys for i in xrange(len(k))))
+    for depth in xrange(max([len(k) for k in keys] or [0]), min_z, -1):
+        siblings = defaultdict(set)
+        for k in keys:
+            if len(k) == depth:
+                siblings[k[:-1]].add(k)
+        for parent, children in siblings.items():
+            if len(children) == 4:
+                keys -= children
+                keys.add(parent)
+    return sorted(keys)
+
+
+def expand_quadkeys(quadkeys, z):
+    """ Returns the quadkeys at zoom z covering the same area as quadkeys of any zoom. """
+    expanded = set()
+    for k in quadkeys:
+        if len(k) >= z:
+            expanded.add(k[:z])
+            continue
+        level = [k]
+        for _ in xrange(z - len(k)):
+            level = [q + digit for q in level for digit in '0123']
+        expanded.update(level)
+    return sorted(expanded)
+
+
+def compact_tiles(tiles, z, min_z=0):
+    """ Returns the compacted quadkeys (see compact_quadkeys()) of (x, y) tiles at zoom z. """
+    return compact_quadkeys([MapTile.tile_to_quadkey(x, y, z) for x, y in tiles], min_z=min_z)
@@ -1,12 +1,21 @@
+import math
+
 from voluptuous import Any, Schema, Required
 
-from skywiserestclient import SkyWiseJSON
-from . import PlatformResource
+from skywiserestclient import SkyWiseJSON, SkyWiseResourceList
+from . import PlatformResource, GoogleMapsTile
+from ._numpy import require_numpy
+from .pointindex import PointIndex
+from .tagging import Tagged
+
 
+class Datapoint(Tagged, SkyWiseJSON, PlatformResource):
 
-class Datapoint(SkyWiseJSON, PlatformResource):
+    _tags = ('frame',)
 
     _path = "/frames/{frame_id}/datapoint/{latitude}/{longitude}"
+    # Datapoints aren't metadata, so a TTL set on PlatformResource doesn't cache them.
+    _cache_ttl = None
 
     _deserialize = Schema({
         "tile": unicode,
@@ -46,3 +55,42 @@ class Datapoint(SkyWiseJSON, PlatformResource):
         r = super(Datapoint, cls).find_async(frame_id=frame.id, latitude=latitude, longitude=longitude, **kwargs)
         r.tag(frame=frame, validTime=frame.validTime)
         return r
+
+    @classmethod
+    def sample(cls, frame, points, z=None, **kwargs):
+        """
+        Samples datapoints for many points on a frame by downloading each tile
+        containing a point once and reading pixel values locally.
+
+        Args:
+            frame (ProductFrame): the frame to sample.
+            points (list of tuple): (latitude, longitude) pairs, or a PointIndex
+                of them to reuse its tile geometry across frames.
+            z (int): zoom level to sample at. Defaults to the frame's native zoom.
+
+        Returns:
+            list of Datapoint: one datapoint per point, in the order given.
+        """
+        require_numpy('Datapoint.sample')
+        if z is None:
+            z = frame.zoomLevels['native']
+        index = points if isinstance(points, PointIndex) else PointIndex(points)
+
+        values = index.values(frame, z=z, **kwargs).tolist()
+        tile_x, tile_y, column, row = index.pixels(z)
+        datapoints = []
+        for x, y, column, row, value in zip(tile_x.tolist(), tile_y.tolist(), column.tolist(), row.tolist(),
+                                            values):
+            datapoint = cls()
+            datapoint._data = {
+                "tile": GoogleMapsTile._path.format(frame_id=frame.id, z=z, x=x, y=y),
+                "pixel": {
+                    "row": row,
+                    "column": column
+                },
+                "value": None if math.isnan(value) else value
+            }
+            datapoint.frame = frame
+            datapoint.validTime = frame.validTime
+            datapoints.append(datapoint)
+        return SkyWiseResourceList(datapoints)
@@ -0,0 +1,137 @@
+import ctypes
+import multiprocessing
+from multiprocessing.sharedctypes import RawArray
+
+import gevent
+from gevent.pool import Pool
+from gevent.queue import Queue
+
+from ._numpy import require_numpy
+from .raster import decode_tile
+
+# Set in each worker process by _init_worker.
+_buffer = None
+_slot_bytes = None
+
+
+def _init_worker(buffer, slot_bytes):
+    global _buffer, _slot_bytes
+    _buffer = buffer
+    _slot_bytes = slot_bytes
+
+
+def _decode_into_slot(content, slot):
+    """
+    Decodes a tile body into a shared-memory slot and returns the array's shape
+    and dtype. Arrays too large for a slot are returned whole instead.
+    """
+    np = require_numpy('DecodePool')
+    array = np.ascontiguousarray(decode_tile(content))
+    if array.nbytes > _slot_bytes:
+        return array.shape, array.dtype.str, array
+    out = np.frombuffer(_buffer, dtype=np.uint8, count=array.nbytes, offset=slot * _slot_bytes)
+    out[...] = array.reshape(-1).view(np.uint8)
+    return array.shape, array.dtype.str, None
+
+
+class DecodePool(object):
+    """
+    Decodes tile bodies in worker processes, so CPU-bound decoding runs on other
+    cores instead of stalling the greenlets fetching tiles. Tile bodies are sent
+    to the workers, which decode into slots of a shared memory buffer; only the
+    shape and dtype come back through the pipe.
+
+    Set it on MapTile to decode tile.array(), pyramids, and point samples in the
+    pool.
+
+    Example:
+        .. code-block:: python
+
+            pool = DecodePool(processes=4)
+            MapTile.set_decode_pool(pool)
+
+            # Tiles are decoded as they arrive while the rest are fetched.
+            tiles = GoogleMapsTile.iter_tileset(frame.id, bounding_box, 9)
+            for tile, array in pool.imap(tiles):
+                process(tile.x, tile.y, array)
+
+    Args:
+        processes (int): worker processes. Defaults to the number of CPUs.
+        slots (int): how many tiles may be decoding at once. Defaults to twice
+            the number of processes.
+        slot_bytes (int): the shared memory for one decoded tile. The default
+            fits a 256x256 tile of float64 or 4-channel 8-bit pixels.
+    """
+
+    def __init__(self, processes=None, slots=None, slot_bytes=256 * 256 * 8):
+        require_numpy('DecodePool')
+        self.processes = processes or multiprocessing.cpu_count()
+        self.slots = slots or 2 * self.processes
+        self.slot_bytes = slot_bytes
+        self._buffer = RawArray(ctypes.c_uint8, self.slots * slot_bytes)
+        self._free = Queue()
+        for slot in xrange(self.slots):
+            self._free.put(slot)
+        self._pool = multiprocessing.Pool(self.processes, initializer=_init_worker,
+                                          initargs=(self._buffer, slot_bytes))
+
+    def decode(self, content):
+        """
+        Decodes a tile body in a worker process and returns it as a numpy array,
+        as decode_tile() does. Other greenlets keep running while it decodes.
+        """
+        np = require_numpy('DecodePool')
+        slot = self._free.get()
+        try:
+            result = self._pool.apply_async(_decode_into_slot, (content, slot))
+            # Wait on a hub thread so this greenlet yields instead of blocking the loop.
+            shape, dtype, array = gevent.get_hub().threadpool.apply(result.get)
+            if array is None:
+                dtype = np.dtype(dtype)
+                nbytes = int(np.prod(shape)) * dtype.itemsize
+                shared = np.frombuffer(self._buffer, dtype=np.uint8, count=nbytes, offset=slot * self.slot_bytes)
+                array = shared.view(dtype).reshape(shape).copy()
+            return array
+        finally:
+            self._free.put(slot)
+
+    def imap(self, tiles):
+        """
+        Decodes tiles as they arrive, using every slot at once. tiles may be a
+        generator such as iter_tileset(), so fetching continues while earlier
+        tiles decode.
+
+        Yields:
+            tuple: (tile, array) pairs, in the order decoding finishes.
+        """
+        return Pool(self.slots).imap_unordered(lambda tile: (tile, self.decode(tile.content())), tiles,
+                                               maxsize=self.slots)
+
+    def close(self):
+        """ Stops the worker processes once queued tiles are decoded. """
+        self._pool.close()
+        self._pool.join()
+
+    def terminate(self):
+        """ Stops the worker processes immediately. """
+        self._pool.terminate()
+        self._pool.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def decode_tiles(tiles, pool=None):
+    """
+    Yields (tile, array) for each tile, decoded in pool if one is given and
+    in this process otherwise. Pooled tiles arrive in the order decoding finishes.
+    """
+    if pool is not None:
+        for tile_and_array in pool.imap(tiles):
+            yield tile_and_array
+        return
+    for tile in tiles:
+        yield tile, decode_tile(tile.content())
@@ -0,0 +1,203 @@
+import re
+from datetime import datetime as _datetime
+
+from dateutil.tz import tzutc
+from skywiserestclient import SkyWiseResourceList
+from skywiserestclient.validation import datetime
+
+STRICT = 'strict'
+FAST = 'fast'
+
+_ISO_UTC = re.compile(r'^(\d{4})-(\d\d)-(\d\d)T(\d\d):(\d\d):(\d\d)(?:\.(\d{1,6}))?Z$')
+_UTC = tzutc()
+
+
+def parse_datetime(value):
+    """
+    Parses an ISO 8601 UTC timestamp into the same datetime the `datetime`
+    validator returns, without going through arrow for the common
+    'YYYY-MM-DDTHH:MM:SS[.ffffff]Z' form.
+    """
+    if value is None:
+        return None
+    match = _ISO_UTC.match(value)
+    if match is None:
+        return datetime(value)
+    year, month, day, hour, minute, second, fraction = match.groups()
+    microsecond = int(fraction.ljust(6, '0')) if fraction else 0
+    return _datetime(int(year), int(month), int(day), int(hour), int(minute), int(second),
+                     microsecond, _UTC)
+
+
+class LazyData(dict):
+    """
+    A resource's data with its datetime fields parsed the first time they're read.
+    Every way of reading the dict sees parsed values, so a LazyData compares
+    equal to the data the deserialize schema would have produced.
+    """
+
+    __slots__ = ('_pending',)
+
+    def __init__(self, data, lazy_keys=()):
+        dict.__init__(self, data)
+        self._pending = set(k for k in lazy_keys if k in data)
+
+    def _resolve(self, key):
+        self._pending.discard(key)
+        dict.__setitem__(self, key, parse_datetime(dict.__getitem__(self, key)))
+
+    def _resolve_all(self):
+        for key in list(self._pending):
+            self._resolve(key)
+
+    def __getitem__(self, key):
+        if key in self._pending:
+            self._resolve(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        if key in self._pending:
+            self._resolve(key)
+        return dict.get(self, key, default)
+
+    def __setitem__(self, key, value):
+        self._pending.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._pending.discard(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        if key in self._pending:
+            self._resolve(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._resolve_all()
+        return dict.popitem(self)
+
+    def setdefault(self, key, default=None):
+        if key in self._pending:
+            self._resolve(key)
+        return dict.setdefault(self, key, default)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        self._pending.difference_update(other)
+        dict.update(self, other)
+
+    def clear(self):
+        self._pending.clear()
+        dict.clear(self)
+
+    def values(self):
+        self._resolve_all()
+        return dict.values(self)
+
+    def items(self):
+        self._resolve_all()
+        return dict.items(self)
+
+    def itervalues(self):
+        self._resolve_all()
+        return dict.itervalues(self)
+
+    def iteritems(self):
+        self._resolve_all()
+        return dict.iteritems(self)
+
+    def copy(self):
+        data = LazyData({})
+        dict.update(data, self)
+        data._pending = set(self._pending)
+        return data
+
+    def __eq__(self, other):
+        self._resolve_all()
+        if isinstance(other, LazyData):
+            other._resolve_all()
+        return dict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        self._resolve_all()
+        return dict.__repr__(self)
+
+    def __reduce__(self):
+        return LazyData, (dict(self.items()),)
+
+
+def _contains_datetime(validator):
+    if validator is datetime:
+        return True
+    schema = getattr(validator, 'schema', None)
+    if schema is not None and schema is not validator:
+        return _contains_datetime(schema)
+    if isinstance(validator, dict):
+        return any(_contains_datetime(v) for v in validator.values())
+    if isinstance(validator, (list, tuple)):
+        return any(_contains_datetime(v) for v in validator)
+    validators = getattr(validator, 'validators', None)
+    if validators:
+        return any(_contains_datetime(v) for v in validators)
+    return False
+
+
+class Decoder(object):
+    """
+    A decoder compiled from a resource's deserialize schema. Top-level datetime
+    fields are parsed lazily and every other field is taken from the JSON as is,
+    so values are not type-checked the way the schema checks them.
+
+    Args:
+        schema (Schema): the resource's voluptuous deserialize schema.
+    """
+
+    def __init__(self, schema):
+        fields = schema.schema if isinstance(schema.schema, dict) else {}
+        self.lazy_keys = frozenset(getattr(k, 'schema', k) for k, v in fields.items() if v is datetime)
+        self.strict = any(_contains_datetime(v) for k, v in fields.items() if v is not datetime)
+        self.schema = schema
+
+    def __call__(self, j):
+        if self.strict:
+            return self.schema(j)
+        return LazyData(j, self.lazy_keys)
+
+
+_decoders = {}
+
+
+def get_decoder(schema):
+    """ Returns the Decoder compiled for a deserialize schema, compiling it once. """
+    decoder = _decoders.get(id(schema))
+    if decoder is None or decoder.schema is not schema:
+        decoder = _decoders[id(schema)] = Decoder(schema)
+    return decoder
+
+
+class FastDecoding(object):
+    """
+    Lets a JSON resource skip schema validation when its decoding is set to
+    FAST. Place it ahead of SkyWiseJSON in the class's bases.
+    """
+
+    @classmethod
+    def _unpack_response(cls, response):
+        if cls.get_decoding() != FAST or cls._deserialize is None:
+            return super(FastDecoding, cls)._unpack_response(response)
+
+        decode = get_decoder(cls._deserialize)
+        data = response.json()
+        if isinstance(data, dict):
+            return cls._from_data(decode(data))
+        return SkyWiseResourceList([cls._from_data(decode(j)) for j in data])
+
+    @classmethod
+    def _from_data(cls, data):
+        resource = cls.__new__(cls)
+        resource._data = data
+        return resource
@@ -0,0 +1,88 @@
+import sys
+import threading
+
+from gevent.event import AsyncResult
+
+try:
+    from thread import get_ident
+except ImportError:
+    from threading import get_ident
+
+
+def request_key(url, params=None, headers=None):
+    """
+    Identifies a GET request by its URL, query parameters, requested media type,
+    and any conditional headers, so a 304 is only shared with callers that can use it.
+    """
+    headers = headers or {}
+    return (url, repr(sorted((params or {}).items())), headers.get('Accept'),
+            headers.get('If-None-Match'), headers.get('If-Modified-Since'))
+
+
+class _Flight(object):
+    """ One in-flight call, waitable from greenlets in its thread and from other threads. """
+
+    def __init__(self):
+        self.thread = get_ident()
+        self.waiters = 0
+        self._result = AsyncResult()
+        self._done = threading.Event()
+        self._value = None
+        self._exc_info = None
+
+    def set(self, value):
+        self._value = value
+        self._done.set()
+        self._result.set(value)
+
+    def set_exception(self, exc_info):
+        self._exc_info = exc_info
+        self._done.set()
+        self._result.set_exception(exc_info[1])
+
+    def wait(self):
+        if get_ident() == self.thread:
+            return self._result.get()
+        self._done.wait()
+        if self._exc_info is not None:
+            raise self._exc_info[1]
+        return self._value
+
+
+class SingleFlight(object):
+    """
+    Coalesces concurrent calls that share a key, so only the first caller does the
+    work and everyone waiting on it gets the same result or exception. Calls are
+    shared only while they are in flight; nothing is cached afterward.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._flights)
+
+    def do(self, key, fn):
+        """ Returns fn()'s result, or the result of the same key's call already in flight. """
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                flight.waiters += 1
+        if not leader:
+            return flight.wait()
+
+        try:
+            value = fn()
+        except BaseException:
+            flight.set_exception(sys.exc_info())
+            raise
+        else:
+            flight.set(value)
+            return value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
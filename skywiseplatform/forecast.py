@@ -4,6 +4,10 @@ from skywiserestclient import SkyWiseJSON
 
 from skywiserestclient.validation import datetime, datetime_to_str
 from skywiseplatform import PlatformResource, ForecastFrame
+from skywiseplatform.decoding import FastDecoding
+from skywiseplatform.tagging import Tagged
+from skywiseplatform.timeseries import timeseries
+from skywiseplatform.watch import FrameWatcher
 
 
 _forecast_deserialize_schema = Schema({
@@ -23,19 +27,46 @@ _forecast_serialize_schema = Schema({
 })
 
 
-class _Forecast(SkyWiseJSON, PlatformResource):
+class _Forecast(Tagged, FastDecoding, SkyWiseJSON, PlatformResource):
 
-    def _frames(self, start=None, end=None, **kwargs):
+    _tags = ('product',)
+
+    _cache_ttl = 300
+
+    @classmethod
+    def _expires(cls, resources, expires=None):
+        if isinstance(resources, _Forecast):
+            resources = [resources]
+        times = [f._data.get('expirationTime') for f in resources]
+        times = [t for t in times + [expires] if t is not None]
+        return min(times) if times else None
+
+    def frames(self, start=None, end=None, **kwargs):
+        kwargs.setdefault('expires', self._data.get('expirationTime'))
         frames = ForecastFrame.find(self.id, start=start, end=end, **kwargs)
         for frame in frames:
             frame.forecast = self
             frame.product = self.product
         return frames
 
-    def __getattr__(self, item):
-        if item == 'frames':
-            return self._frames
-        return super(_Forecast, self).__getattr__(item)
+    def iter_frames(self, start=None, end=None, **kwargs):
+        product = self._get_field('product')
+        for frame in ForecastFrame.iter(self.id, start=start, end=end, **kwargs):
+            frame.forecast = self
+            frame.product = product
+            yield frame
+
+    def watch(self, **kwargs):
+        return FrameWatcher(self.iter_frames, **kwargs)
+
+    def frameset(self, start=None, end=None, **kwargs):
+        frameset = ForecastFrame.find_set(self.id, start=start, end=end, **kwargs)
+        frameset.forecast = self
+        frameset.product = self._get_field('product')
+        return frameset
+
+    def timeseries(self, points, raise_on_error=True, **kwargs):
+        return timeseries(self.frames(**kwargs), points, raise_on_error=raise_on_error)
 
     def __repr__(self):
         try:
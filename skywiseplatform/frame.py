@@ -1,12 +1,25 @@
+from functools import partial
+
+import gevent
 from voluptuous import Any, Schema
 
 from skywiserestclient import SkyWiseJSON
 from skywiserestclient.validation import datetime, datetime_to_str
 
 from skywiseplatform import PlatformResource, GoogleMapsTile, BingMapsTile, Datapoint
+from skywiseplatform.decoding import FastDecoding
+from skywiseplatform.frameset import FrameSet
+from skywiseplatform.mosaic import build_mosaic
+from skywiseplatform.pyramid import build_pyramid
+from skywiseplatform.tagging import Tagged
+from skywiseplatform.tilestore import build_tile_store
+
+
+class _Frame(Tagged, FastDecoding, SkyWiseJSON, PlatformResource):
 
+    _tags = ('product', 'forecast')
 
-class _Frame(SkyWiseJSON, PlatformResource):
+    _cache_ttl = 60
 
     _args = Schema({
         "start": datetime_to_str,
@@ -46,7 +59,68 @@ class _Frame(SkyWiseJSON, PlatformResource):
         "forecast": Any(None, unicode)
     })
 
-    def _tile(self, x=None, y=None, z=None, quadkey=None, **kwargs):
+    @classmethod
+    def _iter(cls, find, start=None, end=None, limit=None, sort='asc', reruns=None, page_size=500, **kwargs):
+        """
+        Yields frames from successive find() pages, requesting each page while the
+        previous one is consumed. Pages are windows of the time range that start
+        (or, sorting descending, end) at the last validTime seen, so frames on a
+        page boundary are returned again and skipped here.
+
+        Paging stops once a page adds no frames, rather than at the first page
+        shorter than page_size, since the server may return fewer frames than
+        asked for.
+        """
+        descending = sort == 'desc'
+
+        def fetch(start, end, size):
+            try:
+                return find(start=start, end=end, limit=size, sort=sort, reruns=reruns, **kwargs)
+            except Exception as e:
+                return e
+
+        size = page_size
+        page = fetch(start, end, size)
+        boundary, seen, count = None, set(), 0
+        following = None
+        try:
+            while True:
+                if isinstance(page, Exception):
+                    raise page
+                frames = [f for f in page if f.id not in seen]
+
+                if frames or (page and len(page) >= size):
+                    if frames:
+                        last = page[-1].validTime
+                        if last != boundary:
+                            seen = set()
+                        seen.update(f.id for f in page if f.validTime == last)
+                        boundary, size = last, page_size
+                    else:
+                        # More reruns share the boundary validTime than fit on a page.
+                        size *= 2
+                    window = (start, boundary) if descending else (boundary, end)
+                    following = gevent.spawn(fetch, window[0], window[1], size)
+                    gevent.sleep(0)
+
+                for frame in frames:
+                    yield frame
+                    count += 1
+                    if limit is not None and count >= limit:
+                        return
+
+                if following is None:
+                    return
+                page, following = following.get(), None
+        finally:
+            if following is not None:
+                following.kill(block=False)
+
+    @classmethod
+    def _find_set(cls, **kwargs):
+        return FrameSet.from_json(cls, cls._get_list(**kwargs).json())
+
+    def tile(self, x=None, y=None, z=None, quadkey=None, **kwargs):
         if x is not None and y is not None and z is not None:
             tile = GoogleMapsTile.find(self.id, x, y, z, **kwargs)
         elif quadkey is not None:
@@ -56,7 +130,7 @@ class _Frame(SkyWiseJSON, PlatformResource):
         tile.frame = self
         return tile
 
-    def _tile_async(self, x=None, y=None, z=None, quadkey=None, **kwargs):
+    def tile_async(self, x=None, y=None, z=None, quadkey=None, **kwargs):
         if x is not None and y is not None and z is not None:
             tile = GoogleMapsTile.find_async(self.id, x, y, z, **kwargs)
         elif quadkey is not None:
@@ -66,28 +140,28 @@ class _Frame(SkyWiseJSON, PlatformResource):
         tile.tag(frame=self)
         return tile
 
-    def _datapoint(self, lat, lon):
+    def datapoint(self, lat, lon):
         datapoint = Datapoint.find(self, lat, lon)
         datapoint.frame = self
         return datapoint
 
-    def _datapoint_async(self, lat, lon):
+    def datapoints(self, points, z=None, **kwargs):
+        return Datapoint.sample(self, points, z=z, **kwargs)
+
+    def mosaic(self, lat_lon_bounding_box, z, **kwargs):
+        return build_mosaic(self, lat_lon_bounding_box, z, **kwargs)
+
+    def pyramid(self, lat_lon_bounding_box, z=None, min_z=None, **kwargs):
+        return build_pyramid(self, lat_lon_bounding_box, z=z, min_z=min_z, **kwargs)
+
+    def tile_store(self, path, lat_lon_bounding_box, z=None, **kwargs):
+        return build_tile_store(self, path, lat_lon_bounding_box, z=z, **kwargs)
+
+    def datapoint_async(self, lat, lon):
         datapoint = Datapoint.find_async(self, lat, lon)
         datapoint.tag(frame=self)
         return datapoint
 
-    def __getattr__(self, item):
-        if item == 'tile':
-            return self._tile
-        elif item == 'tile_async':
-            return self._tile_async
-        elif item == 'datapoint':
-            return self._datapoint
-        elif item == 'datapoint_async':
-            return self._datapoint_async
-        else:
-            return super(_Frame, self).__getattr__(item)
-
 
 class SingleFrame(_Frame):
 
@@ -123,6 +197,47 @@ class ProductFrame(_Frame):
         return super(ProductFrame, cls).find(product_id=product_id, start=start, end=end,
                                              limit=limit, sort=sort, reruns=reruns, **kwargs)
 
+    @classmethod
+    def iter(cls, product_id, start=None, end=None, limit=None, sort='asc', reruns=None, page_size=500, **kwargs):
+        """Yields a product's frames, paging through the time range as needed.
+
+        Each page is one find() request for up to page_size frames. The next page
+        is requested while the current one is being consumed, and only one page is
+        held at a time, so any length of time range can be walked.
+
+        Example:
+            .. code-block:: python
+
+                for frame in ProductFrame.iter(product_id, start='2015-01-01', end='2015-12-31'):
+                    process(frame)
+
+        Args:
+            product_id (str): the product you're requesting frames for.
+            start (datetime): The start date for your frame date range.
+            end (datetime): The end date for your frame date range.
+            limit (int): The most frames to yield in total.
+            sort (str): "asc" walks forward from start, "desc" backward from end.
+            reruns (bool): Whether or not you would like multiple frames for particular time.
+            page_size (int): The most frames requested at once.
+
+        """
+        return cls._iter(partial(cls.find, product_id), start=start, end=end, limit=limit, sort=sort,
+                         reruns=reruns, page_size=page_size, **kwargs)
+
+    @classmethod
+    def find_set(cls, product_id, start=None, end=None, limit=None, sort=None, reruns=None, **kwargs):
+        """Requests frames for a product as a FrameSet.
+
+        Takes the same arguments as find(), but keeps the frames in compact arrays
+        instead of creating a ProductFrame for each one.
+
+        Returns:
+            FrameSet: the product's frames.
+
+        """
+        return cls._find_set(product_id=product_id, start=start, end=end,
+                             limit=limit, sort=sort, reruns=reruns, **kwargs)
+
 
 class ForecastFrame(_Frame):
     """Requests Forecast Frames.
@@ -168,3 +283,26 @@ class ForecastFrame(_Frame):
         """
         return super(ForecastFrame, cls).find(forecast_id=forecast_id, start=start, end=end,
                                               limit=limit, sort=sort, reruns=reruns, **kwargs)
+
+    @classmethod
+    def iter(cls, forecast_id, start=None, end=None, limit=None, sort='asc', reruns=None, page_size=500, **kwargs):
+        """Yields a forecast's frames, paging through the time range as needed.
+
+        Takes the same arguments as ProductFrame.iter().
+        """
+        return cls._iter(partial(cls.find, forecast_id), start=start, end=end, limit=limit, sort=sort,
+                         reruns=reruns, page_size=page_size, **kwargs)
+
+    @classmethod
+    def find_set(cls, forecast_id, start=None, end=None, limit=None, sort=None, reruns=None, **kwargs):
+        """Requests frames for a forecast as a FrameSet.
+
+        Takes the same arguments as find(), but keeps the frames in compact arrays
+        instead of creating a ForecastFrame for each one.
+
+        Returns:
+            FrameSet: the forecast's frames.
+
+        """
+        return cls._find_set(forecast_id=forecast_id, start=start, end=end,
+                             limit=limit, sort=sort, reruns=reruns, **kwargs)
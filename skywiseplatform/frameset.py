@@ -0,0 +1,222 @@
+import calendar
+from datetime import datetime, timedelta
+
+from skywiserestclient import SkyWiseResourceList
+
+from skywiseplatform._numpy import numpy as np, require_numpy
+from skywiseplatform.decoding import parse_datetime, _UTC
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=_UTC)
+
+
+def _to_datetime64(values):
+    """ Converts API timestamps (or None) to a datetime64[us] array. """
+    if all(v is None or (v.endswith('Z') and '+' not in v) for v in values):
+        return np.array([v[:-1] if v is not None else 'NaT' for v in values], dtype='datetime64[us]')
+    micros = []
+    for v in values:
+        dt = parse_datetime(v)
+        if dt is None:
+            micros.append(np.iinfo(np.int64).min)
+        else:
+            micros.append((calendar.timegm(dt.utctimetuple()) * 1000000) + dt.microsecond)
+    return np.array(micros, dtype=np.int64).view('datetime64[us]')
+
+
+def _to_numpy_time(value):
+    if value is None:
+        return None
+    if not isinstance(value, np.datetime64):
+        value = parse_datetime(value) if isinstance(value, basestring) else value
+        if value.tzinfo is not None:
+            value = value.astimezone(_UTC).replace(tzinfo=None)
+    return np.datetime64(value, 'us')
+
+
+def _from_datetime64(value):
+    if np.isnat(value):
+        return None
+    micros = int(value.astype('datetime64[us]').astype(np.int64))
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+def _categorize(values):
+    """ Returns (codes, categories) with categories[codes[i]] == values[i]. """
+    categories, codes, index = [], [], {}
+    for v in values:
+        key = tuple(v) if isinstance(v, list) else v
+        code = index.get(key)
+        if code is None:
+            code = index[key] = len(categories)
+            categories.append(v)
+        codes.append(code)
+    return np.array(codes, dtype=np.int32), categories
+
+
+class FrameSet(object):
+    """
+    A compact, column-oriented list of frames. Ids, times, and zoom levels are kept
+    in parallel numpy arrays instead of one object per frame, and frame objects are
+    only created when you index into the set. Filtering is done on the arrays and
+    returns another FrameSet.
+
+    Example:
+        .. code-block:: python
+
+            frames = product.frameset(start=start, end=end)
+            today = frames.between(midnight, midnight + timedelta(days=1)).latest_runs()
+            frame = today[-1]
+
+    Attributes:
+        frame_class: the frame class frames are created as.
+        ids (numpy.ndarray): frame ids as UTF-8 bytes.
+        valid_times, run_times, creation_times (numpy.ndarray): datetime64[us] UTC
+            times, NaT where the API did not return one.
+        zoom_levels (numpy.ndarray): an (n, 3) array of minimum, native, and maximum
+            zoom levels.
+        tile_sizes (numpy.ndarray): tile sizes in pixels.
+        product: the Product frames are tagged with, if any.
+        forecast: the Forecast frames are tagged with, if any.
+    """
+
+    def __init__(self, frame_class, ids, valid_times, run_times, creation_times, zoom_levels,
+                 tile_sizes, media_type_codes, media_types, forecast_codes, forecasts,
+                 product=None, forecast=None):
+        self.frame_class = frame_class
+        self.ids = ids
+        self.valid_times = valid_times
+        self.run_times = run_times
+        self.creation_times = creation_times
+        self.zoom_levels = zoom_levels
+        self.tile_sizes = tile_sizes
+        self._media_type_codes = media_type_codes
+        self._media_types = media_types
+        self._forecast_codes = forecast_codes
+        self._forecasts = forecasts
+        self.product = product
+        self.forecast = forecast
+
+    @classmethod
+    def from_json(cls, frame_class, data, product=None, forecast=None):
+        """
+        Builds a FrameSet straight from a frame listing's JSON, without creating
+        frame objects.
+
+        Args:
+            frame_class: ProductFrame or ForecastFrame.
+            data (list of dict): the decoded JSON listing.
+        """
+        require_numpy('FrameSet')
+        media_type_codes, media_types = _categorize([f.get('mediaTypes') for f in data])
+        forecast_codes, forecasts = _categorize([f.get('forecast') for f in data])
+        zoom_levels = np.array([(z['minimum'], z['native'], z['maximum'])
+                                for z in (f['zoomLevels'] for f in data)], dtype=np.int8).reshape(-1, 3)
+        return cls(frame_class,
+                   np.array([f['id'].encode('utf-8') for f in data], dtype=bytes),
+                   _to_datetime64([f.get('validTime') for f in data]),
+                   _to_datetime64([f.get('runTime') for f in data]),
+                   _to_datetime64([f.get('creationTime') for f in data]),
+                   zoom_levels,
+                   np.array([f.get('tileSize', 0) for f in data], dtype=np.int16),
+                   media_type_codes, media_types, forecast_codes, forecasts,
+                   product=product, forecast=forecast)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self._frame(i)
+
+    def __getitem__(self, key):
+        if isinstance(key, (int, long, np.integer)):
+            if key < 0:
+                key += len(self)
+            if not 0 <= key < len(self):
+                raise IndexError('FrameSet index out of range')
+            return self._frame(key)
+        return self._take(key)
+
+    def __repr__(self):
+        if not len(self):
+            return '<FrameSet empty>'
+        return '<FrameSet %i frames %s to %s>' % (len(self), self.valid_times.min(), self.valid_times.max())
+
+    def _take(self, index):
+        return FrameSet(self.frame_class, self.ids[index], self.valid_times[index], self.run_times[index],
+                        self.creation_times[index], self.zoom_levels[index], self.tile_sizes[index],
+                        self._media_type_codes[index], self._media_types,
+                        self._forecast_codes[index], self._forecasts,
+                        product=self.product, forecast=self.forecast)
+
+    def _frame(self, i):
+        forecast = self._forecasts[self._forecast_codes[i]]
+        media_types = self._media_types[self._media_type_codes[i]]
+        data = {
+            'id': self.ids[i].decode('utf-8'),
+            'validTime': _from_datetime64(self.valid_times[i]),
+            'runTime': _from_datetime64(self.run_times[i]),
+            'creationTime': _from_datetime64(self.creation_times[i]),
+            'zoomLevels': dict(zip(('minimum', 'native', 'maximum'), self.zoom_levels[i].tolist())),
+            'mediaTypes': list(media_types) if media_types is not None else None,
+            'tileSize': int(self.tile_sizes[i]),
+            'forecast': forecast
+        }
+        frame = self.frame_class.__new__(self.frame_class)
+        frame._data = data
+        if self.product is not None:
+            frame.product = self.product
+        if self.forecast is not None:
+            frame.forecast = self.forecast
+        return frame
+
+    def to_list(self):
+        """ Returns every frame as a SkyWiseResourceList of frame objects. """
+        return SkyWiseResourceList(list(self))
+
+    def filter(self, mask):
+        """ Returns the frames where a boolean mask over the set is True. """
+        return self._take(np.asarray(mask, dtype=bool))
+
+    def between(self, start=None, end=None):
+        """
+        Returns the frames valid from start up to and including end.
+
+        Args:
+            start (datetime): the earliest validTime. None is unbounded.
+            end (datetime): the latest validTime. None is unbounded.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.valid_times >= _to_numpy_time(start)
+        if end is not None:
+            mask &= self.valid_times <= _to_numpy_time(end)
+        return self._take(mask)
+
+    def sorted(self, reverse=False):
+        """ Returns the frames ordered by validTime, then runTime. """
+        order = np.lexsort((self.run_times, self.valid_times))
+        return self._take(order[::-1] if reverse else order)
+
+    def _latest_mask(self):
+        order = np.lexsort((self.run_times, self.valid_times))
+        valid = self.valid_times[order]
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = valid[1:] != valid[:-1]
+        mask = np.zeros(len(self), dtype=bool)
+        mask[order[last]] = True
+        return mask
+
+    def latest_runs(self):
+        """ Returns one frame per validTime, the one with the latest runTime. """
+        return self._take(self._latest_mask())
+
+    def reruns(self):
+        """ Returns the frames superseded by a later run for the same validTime. """
+        return self._take(~self._latest_mask())
+
+    def nbytes(self):
+        """ The number of bytes held by the set's arrays. """
+        return sum(a.nbytes for a in (self.ids, self.valid_times, self.run_times, self.creation_times,
+                                       self.zoom_levels, self.tile_sizes, self._media_type_codes,
+                                       self._forecast_codes))
@@ -0,0 +1,157 @@
+import math
+import threading
+from collections import defaultdict, deque
+
+try:
+    from urllib.parse import urlparse
+except ImportError:
+    from urlparse import urlparse
+
+
+class RequestEvent(object):
+    """
+    Describes one request made by a platform resource. Request hooks are called
+    with a RequestEvent after every request, synchronous or through map_async().
+
+    Attributes:
+        resource_class (type): the resource class that made the request, e.g. ProductFrame.
+        path (str): the resource's path template, e.g. '/products/{product_id}/frames'.
+            Requests for one resource by id end in '/{id}'.
+        url (str): the requested URL.
+        status (int): the response status, or None if no response was received.
+        latency (float): seconds spent waiting for the response. For retried
+            requests, this is the final attempt's.
+        queue_wait (float): seconds a map_async() request waited for a free slot
+            and the rate limit before it was first sent. 0 for synchronous requests.
+        bytes (int): the size of the response body received. 0 when the request
+            shared another's response or was answered 304 Not Modified.
+        retries (int): how many times the request was retried.
+        coalesced (bool): whether the request shared the response of an identical
+            request already in flight.
+        error (Exception): the error the request failed with, if any.
+    """
+
+    def __init__(self, resource_class, path, url, status=None, latency=0.0, queue_wait=0.0, bytes=0,
+                 retries=0, coalesced=False, error=None):
+        self.resource_class = resource_class
+        self.path = path
+        self.url = url
+        self.status = status
+        self.latency = latency
+        self.queue_wait = queue_wait
+        self.bytes = bytes
+        self.retries = retries
+        self.coalesced = coalesced
+        self.error = error
+
+    @classmethod
+    def from_response(cls, resource_class, path, url, response, error=None, coalesced=False, **kwargs):
+        """ Returns the event for a request that got response, or failed with error. """
+        if response is None and error is not None:
+            response = getattr(error, 'response', None)
+        status, size = None, 0
+        if response is not None:
+            status = response.status_code
+            if getattr(response, 'not_modified', False):
+                status = 304
+            elif not coalesced:
+                size = len(response.content or b'')
+        return cls(resource_class, path, url, status=status, bytes=size, coalesced=coalesced, error=error,
+                   **kwargs)
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        return '<RequestEvent %s %s status=%s latency=%.3fs>' % (
+            self.resource_class.__name__, self.path, self.status, self.latency)
+
+
+def path_template(resource_class, url):
+    """ Returns the path template a resource class requested url from. """
+    path = resource_class._path
+    depth = urlparse(resource_class.get_site()).path.rstrip('/').count('/') + path.count('/')
+    if urlparse(url).path.rstrip('/').count('/') > depth:
+        return path + '/{id}'
+    return path
+
+
+def emit(hooks, event):
+    """ Calls each hook with event. """
+    for hook in hooks:
+        hook(event)
+
+
+def percentile(values, q):
+    """ Returns the qth percentile (0 to 100) of sorted values by the nearest-rank method. """
+    if not values:
+        return None
+    rank = int(math.ceil(q / 100.0 * len(values)))
+    return values[max(rank, 1) - 1]
+
+
+class LatencyStats(object):
+    """
+    A request hook that aggregates requests per resource type and reports their
+    latency percentiles, error and retry counts, and bytes received.
+
+    Example:
+        .. code-block:: python
+
+            stats = LatencyStats()
+            PlatformResource.set_request_hooks([stats])
+
+            product.frames()
+            map_async([tile.find_async(...) for ...])
+
+            for resource, report in stats.report().items():
+                print(resource, report['count'], report['p50'], report['p95'], report['p99'])
+
+    Args:
+        max_samples (int): how many of the most recent latencies are kept per
+            resource type for the percentiles. Counts cover every request.
+    """
+
+    def __init__(self, max_samples=10000):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self.clear()
+
+    def __call__(self, event):
+        name = event.resource_class.__name__
+        with self._lock:
+            self._latencies[name].append(event.latency)
+            self._queue_waits[name].append(event.queue_wait)
+            totals = self._totals[name]
+            totals['count'] += 1
+            totals['errors'] += 0 if event.ok else 1
+            totals['retries'] += event.retries
+            totals['coalesced'] += 1 if event.coalesced else 0
+            totals['bytes'] += event.bytes
+
+    def report(self):
+        """
+        Returns a dict of resource type name to a dict of its request 'count',
+        'errors', 'retries', 'coalesced', and 'bytes', and the 'p50', 'p95', and
+        'p99' latency and 'queue_wait_p95' in seconds.
+        """
+        with self._lock:
+            report = {}
+            for name, totals in self._totals.items():
+                latencies = sorted(self._latencies[name])
+                summary = dict(totals)
+                for q in (50, 95, 99):
+                    summary['p%i' % q] = percentile(latencies, q)
+                summary['queue_wait_p95'] = percentile(sorted(self._queue_waits[name]), 95)
+                report[name] = summary
+        return report
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def _reset(self):
+        self._latencies = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._queue_waits = defaultdict(lambda: deque(maxlen=self.max_samples))
+        self._totals = defaultdict(lambda: dict(count=0, errors=0, retries=0, coalesced=0, bytes=0))
@@ -0,0 +1,67 @@
+import math
+
+from . import GoogleMapsTile
+from ._numpy import require_numpy
+from .raster import decode_tile_into
+
+
+# Half the width of the Web Mercator (EPSG:3857) world, in meters.
+_ORIGIN_SHIFT = math.pi * 6378137
+
+
+def geotransform(pixel_x, pixel_y, z):
+    """
+    Returns the GDAL-style Web Mercator (EPSG:3857) geotransform for a raster whose
+    top-left pixel is global pixel (pixel_x, pixel_y) at zoom z:
+    (origin_x, pixel_width, 0, origin_y, 0, -pixel_height).
+    """
+    resolution = 2 * _ORIGIN_SHIFT / GoogleMapsTile.map_size(z)
+    return (pixel_x * resolution - _ORIGIN_SHIFT, resolution, 0.0,
+            _ORIGIN_SHIFT - pixel_y * resolution, 0.0, -resolution)
+
+
+def build_mosaic(frame, lat_lon_bounding_box, z, dtype='float32', window=None, **kwargs):
+    """
+    Stitches the tiles covering a bounding box into a single raster.
+
+    Tiles are fetched concurrently and each one is decoded and copied into its place
+    in a preallocated array cropped to the bounding box's exact pixel bounds.
+
+    Example:
+        .. code-block:: python
+
+            array, transform = frame.mosaic(((37.06, -94.40), (33.56, -103.19)), 8)
+
+    Args:
+        frame (ProductFrame): the frame to mosaic.
+        lat_lon_bounding_box (tuple): ((north, east), (south, west)) corners.
+        z (int): zoom level of the tiles.
+        dtype (str): numpy floating point dtype of the raster. Pixels with no data are NaN.
+        window (int): the most tile requests in flight at once.
+
+    Returns:
+        tuple: the (height, width) numpy array and its Web Mercator geotransform.
+
+    Raises:
+        ValueError: if dtype isn't a floating point type, which can't hold NaN.
+    """
+    np = require_numpy('build_mosaic')
+    if np.dtype(dtype).kind != 'f':
+        raise ValueError("A mosaic's dtype must be a floating point type to hold NaN, not %s." % np.dtype(dtype))
+    n, e = lat_lon_bounding_box[0]
+    s, w = lat_lon_bounding_box[1]
+    pixel_xmax, pixel_ymin = GoogleMapsTile.lat_lon_to_pixel_xy(n, e, z)
+    pixel_xmin, pixel_ymax = GoogleMapsTile.lat_lon_to_pixel_xy(s, w, z)
+
+    raster = np.full((pixel_ymax - pixel_ymin + 1, pixel_xmax - pixel_xmin + 1), np.nan, dtype=dtype)
+    for tile in GoogleMapsTile.iter_tileset(frame.id, lat_lon_bounding_box, z, window=window, **kwargs):
+        # Overlap of this tile with the requested pixel bounds, in global pixels.
+        left, top = tile.x * 256, tile.y * 256
+        xmin, xmax = max(pixel_xmin, left), min(pixel_xmax, left + 255)
+        ymin, ymax = max(pixel_ymin, top), min(pixel_ymax, top + 255)
+        out = raster[ymin - pixel_ymin:ymax - pixel_ymin + 1, xmin - pixel_xmin:xmax - pixel_xmin + 1]
+        decode_tile_into(tile.content(), out,
+                         rows=slice(ymin - top, ymax - top + 1),
+                         columns=slice(xmin - left, xmax - left + 1))
+
+    return raster, geotransform(pixel_xmin, pixel_ymin, z)
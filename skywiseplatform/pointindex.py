@@ -0,0 +1,97 @@
+from . import GoogleMapsTile
+from ._numpy import require_numpy
+from .decodepool import decode_tiles
+
+
+class _Level(object):
+    """ The tile geometry of every point at one zoom level. """
+
+    def __init__(self, points, z):
+        np = require_numpy('PointIndex')
+        pixel_x, pixel_y = GoogleMapsTile.lat_lon_to_pixel_xy_array(points[:, 0], points[:, 1], z)
+        tile_x, tile_y = GoogleMapsTile.pixel_xy_to_tile_xy_array(pixel_x, pixel_y)
+        self.tile_x = tile_x
+        self.tile_y = tile_y
+        self.column = (pixel_x % 256).astype(np.uint8)
+        self.row = (pixel_y % 256).astype(np.uint8)
+
+        # Sort points by tile so each tile's points are one contiguous run.
+        keys = tile_x * GoogleMapsTile.map_size(z) + tile_y
+        order = np.argsort(keys, kind='mergesort')
+        starts = np.flatnonzero(np.diff(keys[order])) + 1
+        self.tiles = []
+        self.groups = []
+        for indices in np.split(order, starts):
+            if not len(indices):
+                continue
+            first = indices[0]
+            self.tiles.append((int(tile_x[first]), int(tile_y[first])))
+            self.groups.append((indices, self.row[indices], self.column[indices]))
+
+
+class PointIndex(object):
+    """
+    The tiles and in-tile pixels of a fixed set of points, computed once per zoom
+    level and reused for every frame sampled, so repeated multi-point queries
+    do no per-point projection math.
+
+    Example:
+        .. code-block:: python
+
+            index = PointIndex(asset_locations)
+            for frame in product.frames():
+                values = index.values(frame)
+                datapoints = frame.datapoints(index)
+
+    Args:
+        points (list of tuple): (latitude, longitude) pairs, or an (n, 2) array.
+    """
+
+    def __init__(self, points):
+        np = require_numpy('PointIndex')
+        self.points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self._levels = {}
+
+    def __len__(self):
+        return len(self.points)
+
+    def level(self, z):
+        """ Returns the points' geometry at zoom z, computing it the first time. """
+        level = self._levels.get(z)
+        if level is None:
+            level = self._levels[z] = _Level(self.points, z)
+        return level
+
+    def tiles(self, z):
+        """ Returns the (x, y) tiles containing at least one point at zoom z. """
+        return list(self.level(z).tiles)
+
+    def pixels(self, z):
+        """ Returns (tile_x, tile_y, column, row) arrays with each point's tile and pixel within it at zoom z. """
+        level = self.level(z)
+        return level.tile_x, level.tile_y, level.column, level.row
+
+    def values(self, frame, z=None, **kwargs):
+        """
+        Samples a frame at every point, downloading each tile containing a point once.
+
+        Args:
+            frame (ProductFrame): the frame to sample.
+            z (int): zoom level to sample at. Defaults to the frame's native zoom.
+            **kwargs: passed to GoogleMapsTile.find_many, e.g. style.
+
+        Returns:
+            numpy.ndarray: a float64 value per point, in the order given. Points
+            without data are NaN.
+        """
+        np = require_numpy('PointIndex.values')
+        if z is None:
+            z = frame.zoomLevels['native']
+        level = self.level(z)
+        values = np.full(len(self.points), np.nan)
+        groups = dict(zip(level.tiles, level.groups))
+        tiles = GoogleMapsTile.find_many(frame.id, level.tiles, z, **kwargs)
+        for tile, array in decode_tiles(tiles, GoogleMapsTile.get_decode_pool()):
+            indices, rows, columns = groups[(tile.x, tile.y)]
+            values[indices] = array[rows, columns]
+        return values
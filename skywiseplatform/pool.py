@@ -0,0 +1,70 @@
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from skywiserestclient import SkyWiseException
+
+
+def _http20_adapter():
+    try:
+        from hyper.contrib import HTTP20Adapter
+    except ImportError:
+        raise SkyWiseException("hyper is required for HTTP/2. Install it with "
+                               "`pip install skywise-platform[http2]`.")
+    return HTTP20Adapter()
+
+
+class ConnectionPool(object):
+    """
+    Connection pooling for the session every platform resource shares, sync and
+    async. Requests in flight beyond the pool size open a connection that is
+    closed afterward rather than kept for reuse.
+
+    Example:
+        .. code-block:: python
+
+            from skywiseplatform import PlatformResource
+            from skywiseplatform.pool import ConnectionPool
+
+            PlatformResource.set_map_size(64)
+            PlatformResource.set_connection_pool(ConnectionPool(pool_size=64))
+
+    Args:
+        pool_size (int): how many connections are kept open to each host. Match
+            it to the most requests in flight at once, e.g. the map size.
+        hosts (int): how many hosts connections are kept for.
+        block (bool): whether a request waits for a pooled connection when all of
+            them are busy, rather than opening one that is closed afterward.
+        keep_alive (bool): whether connections are reused between requests. If
+            False, every request asks the server to close its connection.
+        http2 (bool): whether https requests use HTTP/2, multiplexing concurrent
+            requests over one connection per host. Requires the hyper package.
+        max_retries (int): how many times failed connections are retried.
+    """
+
+    def __init__(self, pool_size=DEFAULT_POOLSIZE, hosts=DEFAULT_POOLSIZE, block=False, keep_alive=True,
+                 http2=False, max_retries=0):
+        self.pool_size = pool_size
+        self.hosts = hosts
+        self.block = block
+        self.keep_alive = keep_alive
+        self.http2 = http2
+        self.max_retries = max_retries
+
+    def adapter(self):
+        """
+        Returns a new transport adapter with these settings. mount() uses it for
+        http:// URLs, and for https:// URLs too unless http2 is set.
+        """
+        return HTTPAdapter(pool_connections=self.hosts, pool_maxsize=self.pool_size,
+                           max_retries=self.max_retries, pool_block=self.block)
+
+    def mount(self, session):
+        """ Configures a requests Session to use this pool. """
+        adapter = self.adapter()
+        secure_adapter = _http20_adapter() if self.http2 else adapter
+        session.mount('http://', adapter)
+        session.mount('https://', secure_adapter)
+        session.headers['Connection'] = 'keep-alive' if self.keep_alive else 'close'
+        return session
+
+    def __repr__(self):
+        return '<ConnectionPool pool_size=%i hosts=%i keep_alive=%s http2=%s>' % (
+            self.pool_size, self.hosts, self.keep_alive, self.http2)
@@ -5,16 +5,20 @@ from skywiserestclient.validation import (datetime, datetime_to_str)
 from skywiserestclient import SkyWiseException
 
 from . import PlatformResource
+from .decoding import FastDecoding
 from .style import Style
-from .frame import ProductFrame
+from .frame import ForecastFrame, ProductFrame
+from .frameset import FrameSet
 from .forecast import ProductForecast
+from .timeseries import timeseries
+from .watch import FrameWatcher, LatestForecastWatcher
 
 
 class ProductException(SkyWiseException):
     pass
 
 
-class Product(SkyWiseJSON, PlatformResource):
+class Product(FastDecoding, SkyWiseJSON, PlatformResource):
     """
     The Product class allows you to query platform products. More importantly,
     Product instances provide convenience methods for accessing other resources on
@@ -22,6 +26,7 @@ class Product(SkyWiseJSON, PlatformResource):
     """
 
     _path = '/products'
+    _cache_ttl = 300
 
     _deserialize = Schema({
         "id": unicode,
@@ -96,19 +101,19 @@ class Product(SkyWiseJSON, PlatformResource):
     def has_forecast(self):
         return self._data['forecasts'] is not None
 
-    def _styles(self):
+    def styles(self):
         styles = Style.find(self.id)
         for style in styles:
             style.product = self
         return styles
 
-    def _forecasts(self, **kwargs):
+    def forecasts(self, **kwargs):
         forecasts = ProductForecast.find(self.id, **kwargs)
         for forecast in forecasts:
             forecast.product = self
         return forecasts
 
-    def _frames(self, start=None, end=None, limit=None, reruns=None, **kwargs):
+    def frames(self, start=None, end=None, limit=None, reruns=None, **kwargs):
         if self._data['frames']:
             frames = ProductFrame.find(self.id, start=start, end=end, limit=limit, reruns=reruns, **kwargs)
         else:
@@ -121,12 +126,33 @@ class Product(SkyWiseJSON, PlatformResource):
             frame.product = self
         return frames
 
-    def __getattr__(self, item):
-        if item == 'styles':
-            return self._styles
-        elif item == 'forecasts':
-            return self._forecasts
-        elif item == 'frames':
-            return self._frames
+    def iter_frames(self, start=None, end=None, **kwargs):
+        if self._data['frames']:
+            frames = ProductFrame.iter(self.id, start=start, end=end, **kwargs)
         else:
-            return super(Product, self).__getattr__(item)
+            forecasts = self.forecasts()
+            if not forecasts:
+                return
+            frames = forecasts.pop().iter_frames(start=start, end=end, **kwargs)
+        for frame in frames:
+            frame.product = self
+            yield frame
+
+    def watch(self, **kwargs):
+        if self._data['frames']:
+            return FrameWatcher(self.iter_frames, **kwargs)
+        return LatestForecastWatcher(self, **kwargs)
+
+    def frameset(self, start=None, end=None, limit=None, reruns=None, **kwargs):
+        if self._data['frames']:
+            frameset = ProductFrame.find_set(self.id, start=start, end=end, limit=limit, reruns=reruns, **kwargs)
+        else:
+            forecasts = self.forecasts()
+            if not forecasts:
+                return FrameSet.from_json(ForecastFrame, [])
+            frameset = forecasts.pop().frameset(start=start, end=end, limit=limit, reruns=reruns, **kwargs)
+        frameset.product = self
+        return frameset
+
+    def timeseries(self, points, start=None, end=None, raise_on_error=True, **kwargs):
+        return timeseries(self.frames(start=start, end=end, **kwargs), points, raise_on_error=raise_on_error)
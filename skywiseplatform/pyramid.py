@@ -0,0 +1,145 @@
+from . import GoogleMapsTile
+from ._numpy import require_numpy
+from .decodepool import decode_tiles
+
+NEAREST = 'nearest'
+MEAN = 'mean'
+
+
+def downsample(quadrants, resampling=MEAN):
+    """
+    Builds one tile from its four children at the next zoom level by halving
+    their resolution.
+
+    Args:
+        quadrants (tuple): the ((top left, top right), (bottom left, bottom right))
+            child arrays. Missing children may be None and are treated as no data.
+        resampling (str): 'mean' averages each 2x2 block of pixels, ignoring NaN.
+            'nearest' keeps each block's top left pixel, for categorical data.
+
+    Returns:
+        numpy.ndarray: the parent tile, the same shape as a child.
+    """
+    np = require_numpy('downsample')
+    if resampling not in (MEAN, NEAREST):
+        raise ValueError("resampling must be '%s' or '%s'." % (MEAN, NEAREST))
+    children = [c for row in quadrants for c in row if c is not None]
+    shape, dtype = children[0].shape, children[0].dtype
+    height, width = shape[:2]
+    # Integer tiles (e.g. PNG) are resampled as floats so missing children can be NaN.
+    work_dtype = dtype if dtype.kind == 'f' else np.float64
+    combined = np.full((height * 2, width * 2) + shape[2:], np.nan, dtype=work_dtype)
+    for i, row in enumerate(quadrants):
+        for j, child in enumerate(row):
+            if child is not None:
+                combined[i * height:(i + 1) * height, j * width:(j + 1) * width] = child
+
+    if resampling == NEAREST:
+        parent = combined[::2, ::2]
+    else:
+        blocks = combined.reshape((height, 2, width, 2) + shape[2:])
+        valid = ~np.isnan(blocks)
+        count = valid.sum(axis=(1, 3))
+        total = np.where(valid, blocks, 0).sum(axis=(1, 3))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            parent = total / count
+
+    if dtype.kind != 'f':
+        return np.nan_to_num(np.round(parent)).astype(dtype)
+    return parent.astype(dtype)
+
+
+def _quadrants(level, x, y):
+    """ Returns the children of parent tile (x, y) from a level's (x, y) to array dict. """
+    return ((level.get((2 * x, 2 * y)), level.get((2 * x + 1, 2 * y))),
+            (level.get((2 * x, 2 * y + 1)), level.get((2 * x + 1, 2 * y + 1))))
+
+
+class Pyramid(object):
+    """
+    Decoded tiles for a bounding box at a range of zoom levels, keyed by (x, y, z).
+
+    Example:
+        .. code-block:: python
+
+            pyramid = frame.pyramid(((37.06, -94.40), (33.56, -103.19)), min_z=2)
+            for quadkey, array in pyramid.quadkeys(z=4).items():
+                serve(quadkey, array)
+    """
+
+    def __init__(self, tiles):
+        self._tiles = tiles
+
+    def __len__(self):
+        return len(self._tiles)
+
+    def __iter__(self):
+        return iter(self._tiles)
+
+    def __contains__(self, key):
+        return key in self._tiles
+
+    def __getitem__(self, key):
+        return self._tiles[key]
+
+    def items(self):
+        return self._tiles.items()
+
+    @property
+    def levels(self):
+        """ The zoom levels in the pyramid, highest resolution first. """
+        return sorted(set(z for _, _, z in self._tiles), reverse=True)
+
+    def level(self, z):
+        """ Returns the tiles at zoom z as a dict of (x, y) to array. """
+        return dict(((x, y), a) for (x, y, tz), a in self._tiles.items() if tz == z)
+
+    def quadkeys(self, z=None):
+        """ Returns the tiles, or those at zoom z, as a dict of Bing Maps quadkey to array. """
+        return dict((GoogleMapsTile.tile_to_quadkey(x, y, tz), a) for (x, y, tz), a in self._tiles.items()
+                    if z is None or tz == z)
+
+    def get_quadkey(self, quadkey):
+        """ Returns the tile for a Bing Maps quadkey. """
+        return self._tiles[GoogleMapsTile.quadkey_to_tile(quadkey)]
+
+
+def build_pyramid(frame, lat_lon_bounding_box, z=None, min_z=None, resampling=MEAN, window=None, **kwargs):
+    """
+    Fetches a bounding box's tiles at one zoom level and derives every lower zoom
+    level from them locally, so overview zooms cost no further requests.
+
+    Parent tiles only partly covered by the bounding box have no data (NaN) where
+    their missing children would be.
+
+    Args:
+        frame (ProductFrame): the frame to build a pyramid for.
+        lat_lon_bounding_box (tuple): ((north, east), (south, west)) corners.
+        z (int): the zoom level to fetch. Defaults to the frame's native zoom.
+        min_z (int): the lowest zoom level to build. Defaults to the frame's minimum zoom.
+        resampling (str): 'mean' or 'nearest'. See downsample().
+        window (int): the most tile requests in flight at once.
+
+    Returns:
+        Pyramid: the tiles from zoom z down to min_z.
+    """
+    require_numpy('build_pyramid')
+    if resampling not in (MEAN, NEAREST):
+        raise ValueError("resampling must be '%s' or '%s'." % (MEAN, NEAREST))
+    if z is None:
+        z = frame.zoomLevels['native']
+    if min_z is None:
+        min_z = min(frame.zoomLevels['minimum'], z)
+
+    level = {}
+    tiles = GoogleMapsTile.iter_tileset(frame.id, lat_lon_bounding_box, z, window=window, **kwargs)
+    for tile, array in decode_tiles(tiles, GoogleMapsTile.get_decode_pool()):
+        level[(tile.x, tile.y)] = array
+    tiles = dict(((x, y, z), a) for (x, y), a in level.items())
+
+    for parent_z in xrange(z - 1, min_z - 1, -1):
+        parents = set((x // 2, y // 2) for x, y in level)
+        level = dict(((px, py), downsample(_quadrants(level, px, py), resampling)) for px, py in parents)
+        tiles.update(((x, y, parent_z), a) for (x, y), a in level.items())
+
+    return Pyramid(tiles)
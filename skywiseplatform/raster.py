@@ -0,0 +1,74 @@
+from io import BytesIO
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+from skywiserestclient import SkyWiseException
+from ._numpy import require_numpy
+
+
+# GDAL stores a band's nodata value as an ASCII TIFF tag.
+_GDAL_NODATA_TAG = 42113
+
+
+def nodata_value(image):
+    """ Returns the GDAL nodata value of a decoded PIL image, or None. """
+    try:
+        return float(image.tag_v2[_GDAL_NODATA_TAG])
+    except (AttributeError, KeyError, ValueError):
+        return None
+
+
+def _open(content):
+    if Image is None:
+        raise SkyWiseException("Pillow is required for tile decoding. Install it with "
+                               "`pip install skywise-platform[raster]`.")
+    return Image.open(BytesIO(content))
+
+
+def decode_tile(content):
+    """
+    Decodes a tile body (e.g. image/tiff) into a 2D numpy array.
+
+    Floating point tiles have their GDAL nodata pixels replaced with NaN.
+    """
+    np = require_numpy('tile decoding')
+    image = _open(content)
+    array = np.asarray(image)
+    if array.dtype.kind == 'f':
+        nodata = nodata_value(image)
+        if nodata is not None:
+            array = np.where(array == nodata, np.nan, array)
+    return array
+
+
+def decode_tile_into(content, out, rows=slice(None), columns=slice(None), casting='unsafe'):
+    """
+    Decodes a tile body and copies its rows/columns window into `out`, typically a
+    view of a larger preallocated array, replacing nodata with NaN in place.
+
+    Pillow decodes into its own image buffer, which numpy reads through one copy
+    of the tile's bytes; only the window is then copied into `out`. No converted
+    or NaN-filled array of the whole tile is made along the way.
+
+    Args:
+        casting (str): how the tile's dtype may be cast to out's, as for numpy.copyto.
+
+    Raises:
+        ValueError: if the window isn't the shape of out.
+        TypeError: if the tile's dtype can't be cast to out's under `casting`.
+    """
+    np = require_numpy('tile decoding')
+    image = _open(content)
+    source = np.asarray(image)[rows, columns]
+    if source.shape != out.shape:
+        raise ValueError('The tile window is %r, not %r.' % (source.shape, out.shape))
+    np.copyto(out, source, casting=casting)
+    if source.dtype.kind == 'f' and out.dtype.kind == 'f':
+        nodata = nodata_value(image)
+        if nodata is not None:
+            # Compare before the cast into out, which may not preserve the sentinel exactly.
+            out[source == nodata] = np.nan
+    return out
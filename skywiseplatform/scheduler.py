@@ -0,0 +1,218 @@
+import random
+import time
+
+import gevent
+from gevent.pool import Pool
+from requests.exceptions import HTTPError
+from skywiserestclient import SkyWiseResourceList
+
+from .flight import request_key
+from .instrumentation import RequestEvent, emit, path_template
+
+
+class TokenBucket(object):
+    """
+    Limits requests to `rate` per second on average while allowing bursts of up
+    to `burst` requests.
+    """
+
+    def __init__(self, rate, burst=None, clock=time.time, sleep=gevent.sleep):
+        self.rate = float(rate)
+        self.burst = burst or max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """ Waits until a token is available and takes it. """
+        self._refill()
+        while self._tokens < 1:
+            self._sleep((1 - self._tokens) / self.rate)
+            self._refill()
+        self._tokens -= 1
+
+
+class RequestResult(object):
+    """
+    The outcome of one scheduled SkyWise Request.
+
+    Attributes:
+        request (SkyWiseRequest): the request.
+        resource: the unpacked, tagged resource if the request succeeded.
+        error (Exception): the final error if it failed.
+        attempts (int): how many times the request was sent.
+    """
+
+    def __init__(self, request, resource=None, error=None, attempts=0):
+        self.request = request
+        self.resource = resource
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return '<RequestResult ok attempts=%i>' % self.attempts
+        return '<RequestResult error=%r attempts=%i>' % (self.error, self.attempts)
+
+
+class RequestScheduler(object):
+    """
+    Sends batches of SkyWise Requests with bounded concurrency, optional rate
+    limiting, and per-request retries with jittered exponential backoff.
+
+    Args:
+        max_in_flight (int): the most requests sent at once.
+        rate (float): the most requests started per second. None is unlimited.
+        burst (int): how many requests may start at once when under the rate.
+        retries (int): how many times a failed request is retried.
+        backoff (float): the base retry delay in seconds. The nth retry waits a
+            random time up to backoff * 2 ** (n - 1), capped at max_backoff.
+        retry_statuses (tuple of int): response statuses that are retried, along
+            with connection errors.
+    """
+
+    def __init__(self, max_in_flight=2, rate=None, burst=None, retries=0, backoff=0.5,
+                 max_backoff=30.0, retry_statuses=(429, 500, 502, 503, 504)):
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.retry_statuses = retry_statuses
+        self._bucket = TokenBucket(rate, burst) if rate else None
+
+    def run(self, skywise_requests):
+        """ Sends every request and returns their RequestResults in request order. """
+        skywise_requests = list(skywise_requests)
+        queued = time.time()
+        return Pool(self.max_in_flight).map(lambda r: self.execute(r, queued=queued), skywise_requests)
+
+    def imap(self, skywise_requests):
+        """
+        Yields RequestResults in completion order. skywise_requests may be a
+        generator; at most max_in_flight requests are outstanding at a time.
+        """
+        pool = Pool(self.max_in_flight)
+        queued = ((r, time.time()) for r in skywise_requests)
+        for result in pool.imap_unordered(lambda q: self.execute(*q), queued, maxsize=self.max_in_flight):
+            yield result
+
+    def execute(self, skywise_request, queued=None):
+        """
+        Sends one request, retrying as configured, and returns its RequestResult.
+        queued is when the request was handed to the scheduler, if before now.
+        """
+        queued = time.time() if queued is None else queued
+        queue_wait = None
+        attempts = 0
+        while True:
+            if self._bucket is not None:
+                self._bucket.acquire()
+            attempts += 1
+            started = time.time()
+            if queue_wait is None:
+                queue_wait = started - queued
+            error, delay, response, coalesced = None, None, None, False
+            try:
+                response, coalesced = self._send(skywise_request)
+            except Exception as e:
+                error = e
+            latency = time.time() - started
+            if response is not None:
+                if response.status_code == 200:
+                    result = self._resolve(skywise_request, response, attempts)
+                    break
+                error = HTTPError('%s Error for url: %s' % (response.status_code, response.url),
+                                  response=response)
+                if response.status_code not in self.retry_statuses:
+                    result = RequestResult(skywise_request, error=error, attempts=attempts)
+                    break
+                delay = _retry_after(response)
+
+            if attempts > self.retries:
+                result = RequestResult(skywise_request, error=error, attempts=attempts)
+                break
+            gevent.sleep(max(delay or 0, self._backoff(attempts)))
+
+        self._instrument(result, response, coalesced, latency=latency, queue_wait=queue_wait)
+        return result
+
+    def _send(self, skywise_request):
+        """
+        Sends a request, sharing the response of an identical request already in
+        flight. Returns the response and whether it was shared.
+        """
+        greq = skywise_request.greq
+        get_single_flight = getattr(skywise_request.klass, 'get_single_flight', None)
+        single_flight = get_single_flight() if get_single_flight else None
+        if single_flight is None:
+            return _send_request(greq), False
+        sent = []
+
+        def send():
+            sent.append(True)
+            return _send_request(greq)
+
+        key = request_key(greq.url, greq.kwargs.get('params'), greq.kwargs.get('headers'))
+        return single_flight.do(key, send), not sent
+
+    def _instrument(self, result, response, coalesced, **kwargs):
+        """ Reports a finished request to its resource class's request hooks. """
+        klass = result.request.klass
+        get_request_hooks = getattr(klass, 'get_request_hooks', None)
+        hooks = get_request_hooks() if get_request_hooks else ()
+        if not hooks:
+            return
+        url = result.request.greq.url
+        event = RequestEvent.from_response(klass, path_template(klass, url), url, response, error=result.error,
+                                           coalesced=coalesced, retries=result.attempts - 1, **kwargs)
+        emit(hooks, event)
+
+    def _backoff(self, attempt):
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def _resolve(self, skywise_request, response, attempts):
+        try:
+            resource = resolve(skywise_request, response)
+        except Exception as e:
+            return RequestResult(skywise_request, error=e, attempts=attempts)
+        return RequestResult(skywise_request, resource=resource, attempts=attempts)
+
+
+def resolve(skywise_request, response):
+    """ Unpacks a response and applies its request's tags, as SkyWiseResource.map does. """
+    resource = skywise_request.klass._unpack_response(response)
+    resources = resource if isinstance(resource, SkyWiseResourceList) else [resource]
+    for r in resources:
+        for k, v in skywise_request.tags().items():
+            setattr(r, k, v)
+    return resource
+
+
+def _retry_after(response):
+    try:
+        return float(response.headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def _send_request(greq):
+    """
+    Sends a grequests AsyncRequest and returns its Response. grequests 0.2 returns
+    the response and raises errors, while later versions return the request and
+    keep the error on it, so the outcome is read off the request either way.
+    """
+    greq.response = greq.exception = None
+    greq.send()
+    if greq.exception is not None:
+        raise greq.exception
+    return greq.response
@@ -2,6 +2,7 @@ from voluptuous import Schema
 
 from skywiserestclient import SkyWiseJSON
 from . import PlatformResource
+from .tagging import Tagged
 
 _schema = Schema({
     "id": unicode,
@@ -13,9 +14,12 @@ _schema = Schema({
 })
 
 
-class Style(SkyWiseJSON, PlatformResource):
+class Style(Tagged, SkyWiseJSON, PlatformResource):
+
+    _tags = ('product',)
 
     _path = "/products/{product_id}/styles"
+    _cache_ttl = 3600
 
     _deserialize = _schema
     _serialize = _schema
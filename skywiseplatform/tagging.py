@@ -0,0 +1,54 @@
+_tag_names = {}
+
+
+def tag_names(cls):
+    """ Returns the names of the fields tagged by cls and every class it inherits from. """
+    names = _tag_names.get(cls)
+    if names is None:
+        names = set()
+        for klass in cls.__mro__:
+            names.update(klass.__dict__.get('_tags', ()))
+        names = _tag_names[cls] = frozenset(names)
+    return names
+
+
+class Tagged(object):
+    """
+    Mixin for resources that keeps the fields they're tagged with, e.g. the
+    product a frame belongs to, as ordinary instance attributes rather than in
+    their JSON data. Reading one is an ordinary attribute lookup, where a JSON
+    field is only found after the lookup fails and __getattr__ runs.
+
+    A field that hasn't been tagged falls back to the JSON data as before, so a
+    field like a forecast frame's `forecast` id reads the same until the frame
+    is tagged with its Forecast. Place it ahead of SkyWiseJSON in the class's
+    bases and name the fields in _tags.
+
+    Example:
+        .. code-block:: python
+
+            class _Frame(Tagged, FastDecoding, SkyWiseJSON, PlatformResource):
+
+                _tags = ('product', 'forecast')
+    """
+
+    _tags = ()
+
+    def __setattr__(self, name, value):
+        if name in tag_names(type(self)):
+            self.__dict__[name] = value
+        else:
+            super(Tagged, self).__setattr__(name, value)
+
+    def __getstate__(self):
+        # Defined so pickle doesn't look it up through SkyWiseJSON.__getattr__.
+        return self.__dict__
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+
+    def _get_field(self, name, default=None):
+        """ Returns a tagged field, or failing that the JSON field, or default if neither is set. """
+        if name in self.__dict__:
+            return self.__dict__[name]
+        return self._data.get(name, default)
@@ -1,7 +1,12 @@
 import math
+import numbers
 
-from skywiserestclient import SkyWiseImage
+from gevent.pool import Pool
+from skywiserestclient import SkyWiseImage, SkyWiseResourceList
 from . import PlatformResource, Style
+from ._numpy import require_numpy
+from .cache import conditional_headers, not_modified_hook, response_validators
+from .raster import decode_tile
 
 
 _MinLatitude = -85.05112878
@@ -13,6 +18,12 @@ _MaxLongitude = 180.0
 class MapTile(SkyWiseImage, PlatformResource):
 
     _style_id = None
+    _cache = None
+    # Tile bodies go in the tile cache; the metadata cache can't hold responses.
+    _cache_ttl = None
+    _revalidate_after = None
+    _decode_pool = None
+    _content = None
 
     @classmethod
     def get_style(cls):
@@ -22,6 +33,44 @@ class MapTile(SkyWiseImage, PlatformResource):
     def set_style(cls, style_id):
         cls._style_id = style_id
 
+    @classmethod
+    def get_cache(cls):
+        return cls._cache
+
+    @classmethod
+    def set_cache(cls, cache):
+        """
+        Sets the TileCache consulted before requesting tiles. Setting it on MapTile
+        shares one cache between Google and Bing tiles; None disables caching.
+        """
+        cls._cache = cache
+
+    @classmethod
+    def get_decode_pool(cls):
+        return cls._decode_pool
+
+    @classmethod
+    def set_decode_pool(cls, pool):
+        """
+        Sets the DecodePool that decodes tiles in worker processes for array(),
+        pyramids, and point samples. None decodes them in this process.
+        """
+        cls._decode_pool = pool
+
+    @classmethod
+    def get_revalidate_after(cls):
+        return cls._revalidate_after
+
+    @classmethod
+    def set_revalidate_after(cls, seconds):
+        """
+        Sets how long find() trusts a cached tile before revalidating it with a
+        conditional request, which costs only headers if the tile hasn't changed.
+        None, the default, always trusts cached tiles; 0 revalidates every time.
+        Tiles cached without an ETag or Last-Modified are always trusted.
+        """
+        cls._revalidate_after = seconds
+
     @classmethod
     def map_size(cls, zoom):
         """
@@ -69,6 +118,30 @@ class MapTile(SkyWiseImage, PlatformResource):
 
     @classmethod
     def tile_range(cls, lat_lon_bounding_box, z, padding=None):
+        """
+        Returns the (x, y) tiles at zoom z covering an area.
+
+        Args:
+            lat_lon_bounding_box: a ((north, east), (south, west)) bounding box, a
+                list of them, a polygon of three or more (latitude, longitude)
+                vertices, or a list of polygons. A polygon only covers the tiles it
+                touches (see coverage.polygon_tiles()), and tiles where boxes
+                overlap are only returned once.
+            z (int): the zoom level.
+            padding (int): also include tiles within this many pixels of the area.
+        """
+        return list(cls.iter_tile_range(lat_lon_bounding_box, z, padding=padding))
+
+    @classmethod
+    def iter_tile_range(cls, lat_lon_bounding_box, z, padding=None):
+        """ Lazily yields the (x, y) tiles of tile_range, so large areas needn't be held in memory. """
+        if len(lat_lon_bounding_box) != 2 or not isinstance(lat_lon_bounding_box[0][0], numbers.Number):
+            # Imported here since coverage builds on MapTile.
+            from .coverage import area_tiles
+            for tile in area_tiles(lat_lon_bounding_box, z, padding=padding):
+                yield tile
+            return
+
         n, e = lat_lon_bounding_box[0]
         s, w = lat_lon_bounding_box[1]
         pixel_xmax, pixel_ymin = cls.lat_lon_to_pixel_xy(n, e, z)
@@ -89,7 +162,9 @@ class MapTile(SkyWiseImage, PlatformResource):
         xmax, ymin = cls.pixel_xy_to_tile_xy(pixel_xmax, pixel_ymin)
         xmin, ymax = cls.pixel_xy_to_tile_xy(pixel_xmin, pixel_ymax)
 
-        return [(x, y) for x in xrange(xmin, xmax + 1) for y in xrange(ymin, ymax + 1)]
+        for x in xrange(xmin, xmax + 1):
+            for y in xrange(ymin, ymax + 1):
+                yield x, y
 
     @classmethod
     def tile_to_quadkey(cls, x=0, y=0, z=0):
@@ -107,36 +182,208 @@ class MapTile(SkyWiseImage, PlatformResource):
         return quadkey
 
     @classmethod
-    def find(cls, style=None, media_type=None, **kwargs):
+    def lat_lon_to_pixel_xy_array(cls, latitudes, longitudes, zoomlevel):
+        """
+        Vectorized lat_lon_to_pixel_xy. Converts arrays of latitude/longitude WGS-84
+        coordinates (in degrees) into arrays of pixel XY coordinates at a specified
+        level of detail.
+
+        Returns a (pixel_x, pixel_y) tuple of int64 numpy arrays.
+        """
+        np = require_numpy('lat_lon_to_pixel_xy_array')
+        latitude = np.clip(np.asarray(latitudes, dtype=np.float64), _MinLatitude, _MaxLatitude)
+        longitude = np.clip(np.asarray(longitudes, dtype=np.float64), _MinLongitude, _MaxLongitude)
+
+        x = (longitude + 180) / 360
+        sinLatitude = np.sin(np.radians(latitude))
+        y = 0.5 - np.log((1 + sinLatitude) / (1 - sinLatitude)) / (4 * math.pi)
+
+        map_size = cls.map_size(zoomlevel)
+        pixel_x = np.clip(x * map_size + 0.5, 0, map_size - 1).astype(np.int64)
+        pixel_y = np.clip(y * map_size + 0.5, 0, map_size - 1).astype(np.int64)
+
+        return pixel_x, pixel_y
+
+    @classmethod
+    def pixel_xy_to_tile_xy_array(cls, pixel_x, pixel_y):
+        """
+        Vectorized pixel_xy_to_tile_xy. Converts arrays of pixel XY coordinates into
+        arrays of tile XY coordinates.
+
+        Returns a (tile_x, tile_y) tuple of int64 numpy arrays.
+        """
+        np = require_numpy('pixel_xy_to_tile_xy_array')
+        tile_x = np.asarray(pixel_x).astype(np.int64) // 256
+        tile_y = np.asarray(pixel_y).astype(np.int64) // 256
+
+        return tile_x, tile_y
+
+    @classmethod
+    def tile_to_quadkey_array(cls, x, y, z):
+        """
+        Vectorized tile_to_quadkey. Converts arrays of Google Maps tile coordinates
+        to Bing Maps quadkeys. `z` may be a single zoom level or an array of them.
+
+        Returns a numpy bytes array of quadkeys.
+        """
+        np = require_numpy('tile_to_quadkey_array')
+        x, y, z = np.broadcast_arrays(np.asarray(x, dtype=np.int64),
+                                      np.asarray(y, dtype=np.int64),
+                                      np.asarray(z, dtype=np.int64))
+        max_z = int(z.max()) if z.size else 0
+        if max_z == 0:
+            return np.zeros(x.shape, dtype='S1')
+
+        # One uint8 column per quadkey digit; positions past a tile's own zoom stay
+        # NUL so the fixed-width bytes view trims them.
+        digits = np.zeros(x.shape + (max_z,), dtype=np.uint8)
+        for position in xrange(max_z):
+            level = z - position
+            shift = np.maximum(level - 1, 0)
+            digit = ((x >> shift) & 1) + 2 * ((y >> shift) & 1) + ord('0')
+            digits[..., position] = np.where(level > 0, digit, 0)
+
+        return digits.view('S%d' % max_z).reshape(x.shape)
+
+    @classmethod
+    def lat_lon_to_quadkey_array(cls, latitudes, longitudes, zoomlevel):
+        """
+        Converts arrays of latitude/longitude WGS-84 coordinates (in degrees) directly
+        into the quadkeys of the tiles containing them.
+        """
+        pixel_x, pixel_y = cls.lat_lon_to_pixel_xy_array(latitudes, longitudes, zoomlevel)
+        tile_x, tile_y = cls.pixel_xy_to_tile_xy_array(pixel_x, pixel_y)
+        return cls.tile_to_quadkey_array(tile_x, tile_y, zoomlevel)
+
+    @classmethod
+    def quadkey_to_tile(cls, quadkey):
+        """ Convert a Bing Maps quadkey to a Google Maps (x, y, z) tile coordinate. """
+        x = y = 0
+        z = len(quadkey)
+        for i in xrange(z, 0, -1):
+            mask = 1 << (i - 1)
+            digit = quadkey[z - i]
+            if digit in '13':
+                x |= mask
+            if digit in '23':
+                y |= mask
+        return x, y, z
+
+    @classmethod
+    def _style_and_media_type(cls, style=None, media_type=None):
         _media_type = media_type or cls._media_type
         _style_id = cls._style_id
         if style is not None and type(style) is Style:
             _style_id = style.id
         elif style is not None:
             _style_id = style
+        return _style_id, _media_type
 
+    @classmethod
+    def _accept_headers(cls, style=None, media_type=None):
+        _style_id, _media_type = cls._style_and_media_type(style, media_type)
         headers = {}
         if _style_id:
             headers['Accept'] = "%s; style=%s; version=1" % (_media_type, _style_id)
         else:
             headers['Accept'] = "%s; version=1" % _media_type
-        return super(MapTile, cls).find(headers=headers, **kwargs)
+        return headers
+
+    @classmethod
+    def cache_key(cls, frame_id, x=None, y=None, z=None, quadkey=None, style=None, media_type=None,
+                  **kwargs):
+        """
+        Returns the tile cache key for a frame's tile. Quadkeys are normalized to
+        x/y/z so Google and Bing requests for the same tile share an entry.
+        """
+        _style_id, _media_type = cls._style_and_media_type(style, media_type)
+        if quadkey is not None:
+            x, y, z = cls.quadkey_to_tile(quadkey)
+        return "%s/%s/%s/%s/%s/%s" % (frame_id, _style_id or '', _media_type, z, x, y)
+
+    @classmethod
+    def _from_content(cls, content):
+        tile = cls()
+        tile._content = content
+        return tile
+
+    @classmethod
+    def _stale_validators(cls, cache, key):
+        """ Returns the validators of a cached tile that is due to be revalidated, or None. """
+        revalidate_after = cls.get_revalidate_after()
+        if revalidate_after is None:
+            return None
+        age = cache.age(key)
+        if age is None or age < revalidate_after:
+            return None
+        return cache.validators(key)
+
+    @classmethod
+    def find(cls, style=None, media_type=None, **kwargs):
+        cache = cls.get_cache()
+        headers = cls._accept_headers(style, media_type)
+        if cache is not None:
+            key = cls.cache_key(style=style, media_type=media_type, **kwargs)
+            content = cache.get(key)
+            if content is not None:
+                validators = cls._stale_validators(cache, key)
+                if validators is None:
+                    return cls._from_content(content)
+                headers.update(conditional_headers(validators))
+
+        tile = super(MapTile, cls).find(headers=headers, **kwargs)
+        if cache is not None and tile._r.status_code == 304:
+            tile._content = content
+            cache.revalidated(key)
+        elif cache is not None:
+            cache.set(key, tile.content(), response_validators(tile._r))
+        return tile
 
     @classmethod
     def find_async(cls, style=None, media_type=None, **kwargs):
-        _media_type = media_type or cls._media_type
-        _style_id = cls._style_id
-        if style is not None and type(style) is Style:
-            _style_id = style.id
-        elif style is not None:
-            _style_id = style
+        """
+        Returns a SkyWise Request for a tile. If the tile cache holds the tile with
+        validators, the request is conditional and a 304 response is filled in
+        with the cached content.
+        """
+        cache = cls.get_cache()
+        headers = cls._accept_headers(style, media_type)
+        content = None
+        if cache is not None:
+            key = cls.cache_key(style=style, media_type=media_type, **kwargs)
+            validators = cache.validators(key)
+            content = cache.get(key) if validators is not None else None
+            if content is not None:
+                headers.update(conditional_headers(validators))
+
+        tile_request = super(MapTile, cls).find_async(headers=headers, **kwargs)
+        if content is not None:
+            _add_response_hook(tile_request.greq, not_modified_hook(content))
+        return tile_request
 
-        headers = {}
-        if _style_id:
-            headers['Accept'] = "%s; style=%s; version=1" % (_media_type, _style_id)
-        else:
-            headers['Accept'] = "%s; version=1" % _media_type
-        return super(MapTile, cls).find_async(headers=headers, **kwargs)
+    def content(self):
+        """ Returns the tile body, whether it was requested or read from the cache. """
+        if self._content is not None:
+            return self._content
+        return super(MapTile, self).content()
+
+    def close(self):
+        if self._content is None:
+            super(MapTile, self).close()
+
+    def __getstate__(self):
+        # Pickle the tile body rather than the response it arrived in.
+        attributes = dict(self.__dict__)
+        if attributes.pop('_r', None) is not None:
+            attributes['_content'] = self.content()
+        return attributes
+
+    def array(self):
+        """ Returns the tile's content decoded into a 2D numpy array. """
+        pool = self.get_decode_pool()
+        if pool is not None:
+            return pool.decode(self.content())
+        return decode_tile(self.content())
 
     @classmethod
     def get_headers(cls):
@@ -165,14 +412,84 @@ class GoogleMapsTile(MapTile):
         return tile_request
 
     @classmethod
-    def tileset(cls, frame_id, lat_lon_bounding_box, z, padding=None):
-        requests = cls.tileset_async(frame_id, lat_lon_bounding_box, z, padding=padding)
-        return cls.map(requests)
+    def find_many(cls, frame_id, tiles, z, **kwargs):
+        """
+        Requests a list of (x, y) tiles at zoom z concurrently. Tiles held by the tile
+        cache are not requested unless they are due to be revalidated, and newly
+        requested tiles are added to it.
+
+        Returns the tiles in the order requested.
+        """
+        cache = cls.get_cache()
+        results = []
+        missing = []
+        for x, y in tiles:
+            content = None
+            if cache is not None:
+                key = cls.cache_key(frame_id, x, y, z, **kwargs)
+                content = cache.get(key)
+                if content is not None and cls._stale_validators(cache, key) is not None:
+                    content = None
+            if content is None:
+                missing.append(len(results))
+                results.append(cls.find_async(frame_id, x, y, z, **kwargs))
+                continue
+            tile = cls._from_content(content)
+            tile.x = x
+            tile.y = y
+            tile.z = z
+            results.append(tile)
+
+        fetched = cls.map([results[i] for i in missing])
+        for i, tile in zip(missing, fetched):
+            if cache is not None:
+                key = cls.cache_key(frame_id, tile.x, tile.y, tile.z, **kwargs)
+                if getattr(tile._r, 'not_modified', False):
+                    cache.revalidated(key)
+                else:
+                    cache.set(key, tile.content(), response_validators(tile._r))
+            results[i] = tile
+        return SkyWiseResourceList(results)
+
+    @classmethod
+    def tileset(cls, frame_id, lat_lon_bounding_box, z, padding=None, **kwargs):
+        tile_range = cls.tile_range(lat_lon_bounding_box, z, padding=padding)
+        return cls.find_many(frame_id, tile_range, z, **kwargs)
+
+    @classmethod
+    def iter_tileset(cls, frame_id, lat_lon_bounding_box, z, padding=None, window=None, **kwargs):
+        """
+        Yields the tiles of a tileset as each one arrives rather than waiting for the
+        whole set. Tiles are tagged with x/y/z and arrive in no particular order.
+
+        Args:
+            lat_lon_bounding_box: the area, a bounding box or any other area tile_range() accepts.
+            window (int): the most tile requests in flight at once. Defaults to the map size.
+                Memory use is bounded by the window no matter how large the area is.
+        """
+        window = window or cls.get_map_size()
+        tile_range = cls.iter_tile_range(lat_lon_bounding_box, z, padding=padding)
+
+        def find(tile):
+            try:
+                return cls.find(frame_id, tile[0], tile[1], z, **kwargs)
+            except Exception as e:
+                return e
+
+        pool = Pool(window)
+        try:
+            for tile in pool.imap_unordered(find, tile_range, maxsize=window):
+                if isinstance(tile, Exception):
+                    raise tile
+                yield tile
+        finally:
+            # Stop requests still in flight when a tile fails or the caller stops early.
+            pool.kill()
 
     @classmethod
-    def tileset_async(cls, frame_id, lat_lon_bounding_box, z, padding=None):
+    def tileset_async(cls, frame_id, lat_lon_bounding_box, z, padding=None, **kwargs):
         tile_range = cls.tile_range(lat_lon_bounding_box, z, padding=padding)
-        return [cls.find_async(frame_id, tile[0], tile[1], z) for tile in tile_range]
+        return [cls.find_async(frame_id, tile[0], tile[1], z, **kwargs) for tile in tile_range]
 
 
 class BingMapsTile(MapTile):
@@ -191,3 +508,12 @@ class BingMapsTile(MapTile):
         tile_request = super(BingMapsTile, cls).find_async(frame_id=frame_id, quadkey=quadkey, **kwargs)
         tile_request.tag(quadkey=quadkey)
         return tile_request
+
+
+def _add_response_hook(greq, hook):
+    hooks = dict(greq.kwargs.get('hooks') or {})
+    response_hooks = hooks.get('response') or []
+    if callable(response_hooks):
+        response_hooks = [response_hooks]
+    hooks['response'] = list(response_hooks) + [hook]
+    greq.kwargs['hooks'] = hooks
@@ -0,0 +1,233 @@
+import os
+
+from . import GoogleMapsTile
+from ._numpy import require_numpy
+from .raster import decode_tile, decode_tile_into
+
+_MAGIC = b'SKYWTILE'
+_VERSION = 1
+# Tile slots start on a page boundary so each slot maps cleanly.
+_ALIGNMENT = 4096
+
+
+def _header_dtype(np):
+    return np.dtype([('magic', 'S8'), ('version', '<u4'), ('frame_id', 'S64'), ('dtype', 'S8'),
+                     ('ndim', '<u4'), ('shape', '<u4', (3,)), ('capacity', '<u4'), ('count', '<u4')])
+
+
+def _index_dtype(np):
+    return np.dtype([('z', '<i4'), ('x', '<i4'), ('y', '<i4')])
+
+
+def _data_offset(np, capacity):
+    end = _header_dtype(np).itemsize + capacity * _index_dtype(np).itemsize
+    return (end + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+class TileStore(object):
+    """
+    Decoded tiles of a frame in a single memory-mapped file: a header, an index
+    of the (z, x, y) in each slot, and a fixed-size slot per tile. Any number of
+    processes can open the same file and read tiles as numpy.memmap views, so
+    they share one copy of the pixels in the page cache, and a restarted job
+    finds its tiles still on disk.
+
+    Tiles are written by one process at a time. Readers see tiles added after
+    they opened the store once they call refresh().
+
+    Example:
+        .. code-block:: python
+
+            store = frame.tile_store('/data/tiles/%s.tiles' % frame.id, ((37.06, -94.40), (33.56, -103.19)))
+
+            # In each worker process
+            store = TileStore('/data/tiles/%s.tiles' % frame_id)
+            array = store[(54, 99, 8)]
+
+    Args:
+        path (str): the store's file, created with TileStore.create().
+        mode (str): 'r' to read tiles, 'r+' to also add them.
+    """
+
+    def __init__(self, path, mode='r'):
+        np = require_numpy('TileStore')
+        self.path = path
+        self.mode = mode
+        self._header = np.memmap(path, dtype=_header_dtype(np), mode=mode, shape=(1,))
+        header = self._header[0]
+        if header['magic'] != _MAGIC or header['version'] != _VERSION:
+            raise ValueError('%s is not a version %i tile store.' % (path, _VERSION))
+        self.frame_id = header['frame_id'].decode('ascii') or None
+        self.dtype = np.dtype(header['dtype'].decode('ascii'))
+        self.shape = tuple(int(n) for n in header['shape'][:header['ndim']])
+        self.capacity = int(header['capacity'])
+        self._index = np.memmap(path, dtype=_index_dtype(np), mode=mode, offset=_header_dtype(np).itemsize,
+                                shape=(self.capacity,))
+        self._slots = np.memmap(path, dtype=self.dtype, mode=mode, offset=_data_offset(np, self.capacity),
+                                shape=(self.capacity,) + self.shape)
+        self._slot_of = {}
+        self.refresh()
+
+    @classmethod
+    def create(cls, path, capacity, shape=(256, 256), dtype='float32', frame_id=None):
+        """
+        Creates an empty store with room for `capacity` tiles of one shape and
+        dtype, replacing any file at path, and returns it opened for writing.
+        Unwritten slots take no disk space on filesystems with sparse files.
+        """
+        np = require_numpy('TileStore')
+        dtype = np.dtype(dtype)
+        if capacity < 1:
+            raise ValueError('A tile store needs room for at least one tile.')
+        if len(shape) > 3:
+            raise ValueError('Tiles may have at most 3 dimensions.')
+        header = np.zeros(1, dtype=_header_dtype(np))
+        header['magic'] = _MAGIC
+        header['version'] = _VERSION
+        header['frame_id'] = (frame_id or '').encode('ascii')
+        header['dtype'] = dtype.str.encode('ascii')
+        header['ndim'] = len(shape)
+        header['shape'][0, :len(shape)] = shape
+        header['capacity'] = capacity
+        size = _data_offset(np, capacity) + capacity * int(np.prod(shape)) * dtype.itemsize
+        with open(path, 'wb') as f:
+            f.write(header.tobytes())
+            f.truncate(size)
+        return cls(path, mode='r+')
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def __contains__(self, key):
+        return key in self._slot_of
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __getitem__(self, key):
+        """ Returns the tile at key, an (x, y, z) tuple, as a view of the file. """
+        return self._slots[self._slot_of[key]]
+
+    def get(self, x, y, z):
+        """ Returns the tile at x/y/z as a view of the file, or None. """
+        slot = self._slot_of.get((x, y, z))
+        return None if slot is None else self._slots[slot]
+
+    def keys(self):
+        """ Returns the (x, y, z) of every stored tile, in the order they were added. """
+        return sorted(self._slot_of, key=self._slot_of.get)
+
+    def refresh(self):
+        """ Picks up tiles added since the store was opened, e.g. by another process. """
+        count = int(self._header[0]['count'])
+        self._slot_of = dict(((int(x), int(y), int(z)), i)
+                             for i, (z, x, y) in enumerate(self._index[:count].tolist()))
+
+    def _slot(self, x, y, z):
+        """ Returns the slot for x/y/z, claiming the next free one for a new tile. """
+        slot = self._slot_of.get((x, y, z))
+        if slot is None:
+            slot = len(self._slot_of)
+            if slot >= self.capacity:
+                raise ValueError('The tile store is full (%i tiles).' % self.capacity)
+        return slot
+
+    def _commit(self, x, y, z, slot):
+        if (x, y, z) not in self._slot_of:
+            self._index[slot] = (z, x, y)
+            self._header['count'] = slot + 1
+            self._slot_of[(x, y, z)] = slot
+
+    def put(self, x, y, z, array):
+        """ Stores a decoded tile, replacing any tile already at x/y/z. """
+        np = require_numpy('TileStore')
+        array = np.asarray(array)
+        if array.shape != self.shape:
+            raise ValueError('Tiles in this store are %r, not %r.' % (self.shape, array.shape))
+        slot = self._slot(x, y, z)
+        self._slots[slot] = array
+        self._commit(x, y, z, slot)
+
+    def put_content(self, x, y, z, content):
+        """ Decodes a tile body into its slot, which it must match in shape and dtype. """
+        slot = self._slot(x, y, z)
+        try:
+            decode_tile_into(content, self._slots[slot], casting='no')
+        except (TypeError, ValueError) as e:
+            raise ValueError('Tile %r does not fit this store of %r %s tiles: %s' % ((x, y, z), self.shape,
+                                                                                     self.dtype, e))
+        self._commit(x, y, z, slot)
+
+    def fetch(self, frame, tiles, z, **kwargs):
+        """
+        Downloads and stores a frame's (x, y) tiles at zoom z, skipping tiles
+        already in the store.
+
+        Args:
+            **kwargs: passed to GoogleMapsTile.find_async, e.g. style.
+
+        Returns:
+            int: how many tiles were downloaded.
+
+        Raises:
+            ValueError: if the store holds another frame, or hasn't room for the tiles.
+        """
+        if self.frame_id is not None and frame.id != self.frame_id:
+            raise ValueError('This tile store holds frame %s, not %s.' % (self.frame_id, frame.id))
+        needed = len(self._slot_of) + len(set((x, y, z) for x, y in tiles if (x, y, z) not in self))
+        if needed > self.capacity:
+            raise ValueError('%s has room for %i tiles, but %i are needed with the %i it holds.'
+                             % (self.path, self.capacity, needed, len(self)))
+        requests = (GoogleMapsTile.find_async(frame.id, x, y, z, **kwargs)
+                    for x, y in tiles if (x, y, z) not in self)
+        fetched = 0
+        try:
+            for tile in GoogleMapsTile.imap(requests):
+                self.put_content(tile.x, tile.y, tile.z, tile.content())
+                fetched += 1
+        finally:
+            self.flush()
+        return fetched
+
+    def flush(self):
+        """ Writes stored tiles to disk. """
+        if self.mode != 'r':
+            self._slots.flush()
+            self._index.flush()
+            self._header.flush()
+
+
+def build_tile_store(frame, path, lat_lon_bounding_box, z=None, padding=None, **kwargs):
+    """
+    Downloads a bounding box's tiles for a frame into a TileStore at path. If
+    path already holds the frame's store, only tiles it is missing are
+    downloaded, so an interrupted or restarted job picks up where it left off.
+
+    Args:
+        frame (ProductFrame): the frame whose tiles to store.
+        path (str): the store's file.
+        lat_lon_bounding_box (tuple): ((north, east), (south, west)) corners.
+        z (int): the zoom level. Defaults to the frame's native zoom.
+        padding (int): see MapTile.tile_range.
+        **kwargs: passed to GoogleMapsTile.find_async, e.g. style.
+
+    Returns:
+        TileStore: the store, opened for writing.
+
+    Raises:
+        ValueError: if the store at path holds another frame or hasn't room for
+            the bounding box's tiles. Remove it to build a new store.
+    """
+    if z is None:
+        z = frame.zoomLevels['native']
+    tiles = GoogleMapsTile.tile_range(lat_lon_bounding_box, z, padding=padding)
+    if os.path.exists(path):
+        store = TileStore(path, mode='r+')
+    else:
+        # The first tile decides the store's tile shape and dtype.
+        x, y = tiles[0]
+        array = decode_tile(GoogleMapsTile.find(frame.id, x, y, z, **kwargs).content())
+        store = TileStore.create(path, len(tiles), array.shape, array.dtype, frame_id=frame.id)
+        store.put(x, y, z, array)
+    store.fetch(frame, tiles, z, **kwargs)
+    return store
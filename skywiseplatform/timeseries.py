@@ -0,0 +1,102 @@
+import calendar
+
+from gevent.pool import Pool
+
+from . import Datapoint
+from ._numpy import require_numpy
+from .pointindex import PointIndex
+
+
+class TimeSeries(object):
+    """
+    Datapoint values for a set of points across a set of frames, stored column-wise.
+
+    Attributes:
+        points (numpy.ndarray): (n, 2) array of the requested (latitude, longitude) points.
+        frame_ids (list of str): the id of each frame, in validTime order.
+        validTimes (numpy.ndarray): datetime64[s] UTC validTime of each frame.
+        values (numpy.ndarray): (n points, m frames) values. Missing values are NaN.
+    """
+
+    def __init__(self, points, frame_ids, validTimes, values):
+        self.points = points
+        self.frame_ids = frame_ids
+        self.validTimes = validTimes
+        self.values = values
+
+    def __len__(self):
+        return len(self.frame_ids)
+
+    def __repr__(self):
+        return '<TimeSeries %i points x %i frames>' % self.values.shape
+
+
+def timeseries(frames, points, window=None, raise_on_error=True, **kwargs):
+    """
+    Samples every point on every frame. The points' tile geometry is computed
+    once and reused for each frame, and each tile containing a point is
+    downloaded once per frame, however many points it holds.
+
+    Duplicate points and frames are only sampled once.
+
+    Args:
+        frames (list of ProductFrame): the frames making up the series.
+        points (list of tuple): (latitude, longitude) pairs.
+        window (int): the most frames sampled at once. Each frame's tiles are
+            requested concurrently, so this defaults to as many frames as keep
+            about the map size of tile requests in flight.
+        raise_on_error (bool): raise if a frame's tiles can't be fetched. If
+            False, that frame's values are left NaN, the same as points without data.
+        **kwargs: passed to Datapoint.sample, e.g. z or style.
+
+    Returns:
+        TimeSeries: values for each point (rows) across each frame (columns).
+    """
+    np = require_numpy('timeseries')
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    unique_points, point_index = _unique_rows(np, points)
+    index = PointIndex(unique_points)
+
+    unique_frames = {}
+    for frame in frames:
+        unique_frames.setdefault(frame.id, frame)
+    frames = sorted(unique_frames.values(), key=lambda f: f.validTime)
+
+    values = np.full((len(unique_points), len(frames)), np.nan)
+
+    def sample(j):
+        try:
+            datapoints = Datapoint.sample(frames[j], index, **kwargs)
+        except Exception as e:
+            return j, e
+        return j, [np.nan if dp.value is None else dp.value for dp in datapoints]
+
+    if window is None:
+        z = kwargs.get('z') or (frames[0].zoomLevels['native'] if frames else 0)
+        window = max(1, Datapoint.get_map_size() // max(1, len(index.tiles(z))))
+    pool = Pool(window)
+    try:
+        for j, column in pool.imap_unordered(sample, xrange(len(frames)), maxsize=window):
+            if isinstance(column, Exception):
+                if raise_on_error:
+                    raise column
+            else:
+                values[:, j] = column
+    finally:
+        pool.kill()
+
+    validTimes = np.array([calendar.timegm(f.validTime.utctimetuple()) for f in frames],
+                          dtype='datetime64[s]')
+    return TimeSeries(points, [f.id for f in frames], validTimes, values[point_index])
+
+
+def _unique_rows(np, points):
+    """ Returns the unique rows of points and the index mapping each point to its row. """
+    unique = {}
+    index = np.empty(len(points), dtype=np.intp)
+    for i, point in enumerate(map(tuple, points.tolist())):
+        index[i] = unique.setdefault(point, len(unique))
+    rows = np.empty((len(unique), 2), dtype=np.float64)
+    for point, i in unique.items():
+        rows[i] = point
+    return rows, index
@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+import gevent
+from skywiserestclient import SkyWiseResourceList
+
+
+class FrameWatcher(object):
+    """
+    Polls a product or forecast for newly published frames. The watcher remembers
+    the latest validTime it has seen and each poll only asks for frames from that
+    point on, so a poll costs the same however much history the product has.
+
+    Example:
+        .. code-block:: python
+
+            watcher = product.watch(lookback=timedelta(hours=1))
+            for frame in watcher.watch(interval=60):
+                ingest(frame)
+
+    Args:
+        iter_frames: a function like product.iter_frames that yields frames for
+            start/sort/reruns keyword arguments.
+        since (datetime): report frames valid from this time on. None reports only
+            frames published after the first poll.
+        created_since (datetime): treat frames created at or before this time as
+            already seen, e.g. the created_high_water of a previous watcher.
+        lookback (timedelta): how far before the latest validTime to keep looking
+            for reruns. Reruns of older frames are not reported.
+        reruns (bool): whether to ask for every run of a validTime.
+    """
+
+    def __init__(self, iter_frames, since=None, created_since=None, lookback=None, reruns=True, **kwargs):
+        self._iter_frames = iter_frames
+        self.since = since
+        self.created_since = created_since
+        self.lookback = lookback or timedelta(0)
+        self.reruns = reruns
+        self.high_water = None
+        self.created_high_water = created_since
+        self._kwargs = kwargs
+        self._seen = {}
+        self._started = since is not None
+        self._running = False
+
+    def reset(self, since=None):
+        """ Forgets every frame seen so far. """
+        self.since = since
+        self.high_water = None
+        self._seen = {}
+        self._started = since is not None
+
+    def _start(self):
+        if self.high_water is not None:
+            return self.high_water - self.lookback
+        return self.since
+
+    def _fetch(self, iter_frames, start):
+        new = []
+        for frame in iter_frames(start=start, sort='asc', reruns=self.reruns, **self._kwargs):
+            if frame.id in self._seen or (start is not None and frame.validTime < start):
+                continue
+            self._seen[frame.id] = frame.validTime
+            created = frame._data.get('creationTime')
+            if created is not None and (self.created_high_water is None or created > self.created_high_water):
+                self.created_high_water = created
+            if self.created_since is not None and created is not None and created <= self.created_since:
+                continue
+            if self.high_water is None or frame.validTime > self.high_water:
+                self.high_water = frame.validTime
+            new.append(frame)
+
+        start = self._start()
+        if start is not None:
+            self._seen = dict((k, v) for k, v in self._seen.items() if v >= start)
+        return new
+
+    def _source(self):
+        return self._iter_frames
+
+    def poll(self):
+        """ Returns the frames published since the last poll, oldest first. """
+        iter_frames = self._source()
+        if not self._started:
+            latest = list(iter_frames(**dict(self._kwargs, sort='desc', limit=1, page_size=1)))
+            self._started = True
+            if latest:
+                self.high_water = latest[0].validTime
+                self._fetch(iter_frames, self._start())
+            return SkyWiseResourceList()
+        return SkyWiseResourceList(self._fetch(iter_frames, self._start()))
+
+    def watch(self, interval=60):
+        """ Polls every `interval` seconds and yields each new frame. """
+        while True:
+            for frame in self.poll():
+                yield frame
+            gevent.sleep(interval)
+
+    def run(self, callback, interval=60, polls=None):
+        """
+        Polls every `interval` seconds and calls callback(frame) for each new frame
+        until stop() is called, or `polls` polls have been made.
+        """
+        self._running = True
+        count = 0
+        while self._running:
+            for frame in self.poll():
+                callback(frame)
+            count += 1
+            if polls is not None and count >= polls:
+                break
+            gevent.sleep(interval)
+        self._running = False
+
+    def stop(self):
+        self._running = False
+
+
+class LatestForecastWatcher(FrameWatcher):
+    """
+    Watches a forecast product's latest forecast. When a new forecast is issued,
+    all of its frames are reported as new.
+    """
+
+    def __init__(self, product, **kwargs):
+        super(LatestForecastWatcher, self).__init__(None, **kwargs)
+        self.product = product
+        self.forecast = None
+
+    def _source(self):
+        forecasts = self.product.forecasts()
+        if not forecasts:
+            return lambda **kwargs: iter(())
+        forecast = forecasts.pop()
+        if self.forecast is not None and forecast.id != self.forecast.id:
+            self.reset(since=forecast.initTime)
+        self.forecast = forecast
+        return forecast.iter_frames
@@ -0,0 +1,72 @@
+from skywiseplatform import PlatformResource
+from skywiseplatform.aio import AsyncClient
+from skywiseplatform.pool import ConnectionPool
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+def _wait(future):
+    return future.result(timeout=5)
+
+
+class AsyncClientTest(PlatformTest):
+
+    def setUp(self):
+        super(AsyncClientTest, self).setUp()
+        self.client = AsyncClient(max_connections=4)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_product(self):
+        product = _wait(self.client.product(self.product.id))
+        self.assertEqual(product.id, self.product.id)
+
+    def test_frames(self):
+        self._register_frames()
+        frames = _wait(self.client.frames(self.product))
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(frames[0].product.id, self.product.id)
+
+    def test_tile_and_datapoint(self):
+        frame = self._register_frames().pop()
+        self.adapter.register_uri('GET', '/frames/%s/tile/1/0/0' % frame.id,
+                                  content=load_fixture('tile', extension='tiff'))
+        self.adapter.register_uri('GET', '/frames/%s/datapoint/35.0/-97.0' % frame.id,
+                                  json=load_fixture('datapoint'))
+        tile = _wait(self.client.tile(frame, x=0, y=0, z=1))
+        datapoint = _wait(self.client.datapoint(frame, 35.0, -97.0))
+        self.assertIsNotNone(tile.content())
+        self.assertEqual(datapoint.value, 0.296531558)
+
+    def test_tileset(self):
+        tile_tiff = load_fixture('tile', extension='tiff')
+        for x in range(54, 61):
+            for y in range(99, 103):
+                self.adapter.register_uri('GET', '/frames/frame-id/tile/8/%i/%i' % (x, y),
+                                          content=tile_tiff)
+        bounding_box = ((37.063944, -94.400024), (33.559707, -103.189087))
+        tiles = _wait(self.client.tileset('frame-id', bounding_box, 8))
+        self.assertEqual(len(tiles), 28)
+        self.assertEqual([(t.x, t.y) for t in tiles],
+                         [(x, y) for x in range(54, 61) for y in range(99, 103)])
+
+    def test_tileset_error(self):
+        self.adapter.register_uri('GET', '/frames/frame-id/tile/1/0/0', status_code=500)
+        with self.assertRaises(Exception):
+            _wait(self.client.tileset('frame-id', ((10.0, -10.0), (5.0, -15.0)), 1))
+
+    def test_global_pool_is_left_alone(self):
+        self.assertIsNone(PlatformResource.get_connection_pool())
+
+    def test_pool_is_put_back_on_close(self):
+        PlatformResource.set_use_session_for_async(False)
+        with AsyncClient(max_connections=8, pool=ConnectionPool(pool_size=8)):
+            self.assertEqual(PlatformResource.get_connection_pool().pool_size, 8)
+            adapter = PlatformResource.get_session().get_adapter('https://platform.api.wdtinc.com')
+            self.assertEqual(adapter._pool_maxsize, 8)
+            self.assertTrue(PlatformResource.get_use_session_for_async())
+        self.assertIsNone(PlatformResource.get_connection_pool())
+        self.assertFalse(PlatformResource.get_use_session_for_async())
+        adapter = PlatformResource.get_session().get_adapter('https://platform.api.wdtinc.com')
+        self.assertEqual(adapter._pool_maxsize, 10)
@@ -0,0 +1,44 @@
+import re
+
+from skywiseplatform.animation import FrameLoop
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class FrameLoopTest(PlatformTest):
+
+    def setUp(self):
+        super(FrameLoopTest, self).setUp()
+        self.frames = self._register_frames()
+        self.adapter.register_uri('GET', re.compile(r'/frames/[^/]+/tile/'),
+                                  content=load_fixture('tile', extension='tiff'))
+
+    def _tile_requests(self, frame):
+        return [r.url for r in self.adapter.request_history if '/frames/%s/tile/' % frame.id in r.url]
+
+    def test_prefetches_next_frame(self):
+        loop = FrameLoop(self.frames, [(0, 0), (1, 0)], 1, prefetch=1)
+        tiles = loop.get(0)
+        self.assertEqual([(t.x, t.y, t.z) for t in tiles], [(0, 0, 1), (1, 0, 1)])
+        self.assertIs(tiles[0].frame, self.frames[0])
+
+        loop._buffer[1].join()
+        self.assertEqual(len(self._tile_requests(self.frames[1])), 2, 'The next frame should be fetched in the background.')
+        self.assertIs(loop.get(1)[0].frame, self.frames[1])
+        self.assertEqual((loop.stats.misses, loop.stats.hits), (1, 1))
+        loop.close()
+
+    def test_play_wraps(self):
+        loop = FrameLoop.for_bbox(self.frames, ((37.06, -94.40), (33.56, -103.19)), 4, prefetch=1)
+        played = [frame.id for frame, tiles in loop.play(cycles=2)]
+        self.assertEqual(played, [f.id for f in self.frames] * 2)
+        self.assertEqual(loop.stats.requests, 4)
+        self.assertEqual(loop.stats.misses, 1, 'Every frame after the first was prefetched.')
+
+    def test_buffer_is_bounded(self):
+        loop = FrameLoop(self.frames, [(0, 0)], 1, prefetch=5, wrap=False)
+        loop.get(0)
+        self.assertEqual(len(loop._buffer), 1)
+        loop.get(1)
+        self.assertEqual(len(loop._buffer), 0)
+        loop.close()
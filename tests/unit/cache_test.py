@@ -0,0 +1,280 @@
+import calendar
+import shutil
+import tempfile
+from unittest import TestCase
+
+from skywiseplatform import BingMapsTile, GoogleMapsTile, PlatformResource, Product, Style
+from skywiseplatform.cache import DiskTileCache, MemoryTileCache, MetadataCache
+from skywiseplatform.tile import MapTile
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class MemoryTileCacheTest(TestCase):
+
+    def test_lru_eviction(self):
+        cache = MemoryTileCache(max_bytes=10)
+        cache.set('a', b'1234')
+        cache.set('b', b'1234')
+        cache.get('a')
+        cache.set('c', b'1234')
+        self.assertEqual(cache.get('a'), b'1234')
+        self.assertIsNone(cache.get('b'), 'Least recently used entry should be evicted.')
+        self.assertEqual(cache.size, 8)
+
+    def test_oversized_content_is_not_cached(self):
+        cache = MemoryTileCache(max_bytes=2)
+        cache.set('a', b'1234')
+        self.assertNotIn('a', cache)
+
+    def test_validators(self):
+        now = [100.0]
+        cache = MemoryTileCache(max_bytes=10, clock=lambda: now[0])
+        cache.set('a', b'1234', ('"v1"', None))
+        cache.set('b', b'1234')
+        now[0] += 30
+        self.assertEqual(cache.validators('a'), ('"v1"', None))
+        self.assertEqual(cache.age('a'), 30)
+        self.assertIsNone(cache.validators('b'))
+        cache.revalidated('a')
+        self.assertEqual(cache.age('a'), 0)
+        cache.set('a', b'5678')
+        self.assertIsNone(cache.validators('a'), 'Replacing content should drop its validators.')
+
+
+class DiskTileCacheTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_persists_between_instances(self):
+        DiskTileCache(self.directory, max_bytes=100).set('frame/style/image/tiff/1/0/0', b'tile')
+        cache = DiskTileCache(self.directory, max_bytes=100)
+        self.assertEqual(cache.get('frame/style/image/tiff/1/0/0'), b'tile')
+        self.assertEqual(cache.size, 4)
+
+    def test_validators_persist_between_instances(self):
+        DiskTileCache(self.directory, max_bytes=100).set('a', b'tile', ('"v1"', 'Sat, 24 Sep 2016 00:45:00 GMT'))
+        cache = DiskTileCache(self.directory, max_bytes=100)
+        self.assertEqual(cache.validators('a'), ('"v1"', 'Sat, 24 Sep 2016 00:45:00 GMT'))
+        self.assertEqual(cache.size, 4, 'Validators should not count as entries.')
+
+    def test_lru_eviction(self):
+        cache = DiskTileCache(self.directory, max_bytes=10)
+        cache.set('a', b'1234')
+        cache.set('b', b'1234')
+        cache.get('a')
+        cache.set('c', b'1234')
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(DiskTileCache(self.directory, max_bytes=10).size, 8)
+
+
+class CachedTileTest(PlatformTest):
+
+    def setUp(self):
+        super(CachedTileTest, self).setUp()
+        self.tile_tiff = load_fixture('tile', extension='tiff')
+        MapTile.set_cache(MemoryTileCache())
+
+    def tearDown(self):
+        MapTile.set_cache(None)
+
+    def _tile_requests(self):
+        return [r for r in self.adapter.request_history if '/tile/' in r.url]
+
+    def test_find_uses_cache(self):
+        self.adapter.register_uri('GET', '/frames/frame-id/tile/8/0/1', content=self.tile_tiff)
+        first = GoogleMapsTile.find('frame-id', 0, 1, 8)
+        second = GoogleMapsTile.find('frame-id', 0, 1, 8)
+        self.assertEqual(second.content(), first.content())
+        self.assertEqual(second.x, 0)
+        self.assertEqual(len(self._tile_requests()), 1)
+
+    def test_cache_key_includes_style(self):
+        self.adapter.register_uri('GET', '/frames/frame-id/tile/8/0/1', content=self.tile_tiff)
+        GoogleMapsTile.find('frame-id', 0, 1, 8)
+        GoogleMapsTile.find('frame-id', 0, 1, 8, style='my-style')
+        self.assertEqual(len(self._tile_requests()), 2)
+
+    def test_quadkey_shares_cache_entry(self):
+        self.adapter.register_uri('GET', '/frames/frame-id/tile/3/3/5', content=self.tile_tiff)
+        GoogleMapsTile.find('frame-id', 3, 5, 3)
+        tile = BingMapsTile.find('frame-id', MapTile.tile_to_quadkey(3, 5, 3))
+        self.assertEqual(tile.content(), self.tile_tiff)
+        self.assertEqual(len(self._tile_requests()), 1)
+
+    def test_tileset_uses_cache(self):
+        for x in range(54, 61):
+            for y in range(99, 103):
+                self.adapter.register_uri('GET', '/frames/frame-id/tile/8/%i/%i' % (x, y),
+                                          content=self.tile_tiff)
+        bounding_box = ((37.063944, -94.400024), (33.559707, -103.189087))
+        GoogleMapsTile.find('frame-id', 54, 99, 8)
+        tiles = GoogleMapsTile.tileset('frame-id', bounding_box, 8)
+        self.assertEqual(len(self._tile_requests()), 28)
+        self.assertEqual([(t.x, t.y) for t in tiles], MapTile.tile_range(bounding_box, 8))
+
+        GoogleMapsTile.tileset('frame-id', bounding_box, 8)
+        self.assertEqual(len(self._tile_requests()), 28)
+
+    def _register_revalidated_tile(self, path):
+        def respond(request, context):
+            if request.headers.get('If-None-Match') == '"v1"':
+                context.status_code = 304
+                return b''
+            context.headers['ETag'] = '"v1"'
+            return self.tile_tiff
+        self.adapter.register_uri('GET', path, content=respond)
+
+    def test_find_revalidates_stale_tiles(self):
+        self._register_revalidated_tile('/frames/frame-id/tile/8/0/1')
+        MapTile.set_revalidate_after(0)
+        try:
+            GoogleMapsTile.find('frame-id', 0, 1, 8)
+            tile = GoogleMapsTile.find('frame-id', 0, 1, 8)
+        finally:
+            MapTile.set_revalidate_after(None)
+        requests = self._tile_requests()
+        self.assertEqual(len(requests), 2)
+        self.assertNotIn('If-None-Match', requests[0].headers)
+        self.assertEqual(requests[1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(tile.content(), self.tile_tiff)
+
+    def test_fresh_tiles_are_not_revalidated(self):
+        self._register_revalidated_tile('/frames/frame-id/tile/8/0/1')
+        MapTile.set_revalidate_after(3600)
+        try:
+            GoogleMapsTile.find('frame-id', 0, 1, 8)
+            GoogleMapsTile.find('frame-id', 0, 1, 8)
+        finally:
+            MapTile.set_revalidate_after(None)
+        self.assertEqual(len(self._tile_requests()), 1)
+
+    def test_find_async_is_conditional(self):
+        self._register_revalidated_tile('/frames/frame-id/tile/8/0/1')
+        GoogleMapsTile.find('frame-id', 0, 1, 8)
+        tile = GoogleMapsTile.map([GoogleMapsTile.find_async('frame-id', 0, 1, 8)])[0]
+        self.assertEqual(self._tile_requests()[-1].headers['If-None-Match'], '"v1"')
+        self.assertEqual(tile.content(), self.tile_tiff)
+        self.assertTrue(tile._r.not_modified)
+
+    def test_find_many_revalidates_stale_tiles(self):
+        for x in range(2):
+            self._register_revalidated_tile('/frames/frame-id/tile/8/%i/0' % x)
+        GoogleMapsTile.find_many('frame-id', [(0, 0), (1, 0)], 8)
+        MapTile.set_revalidate_after(0)
+        try:
+            tiles = GoogleMapsTile.find_many('frame-id', [(0, 0), (1, 0)], 8)
+        finally:
+            MapTile.set_revalidate_after(None)
+        requests = self._tile_requests()
+        self.assertEqual(len(requests), 4)
+        self.assertTrue(all(r.headers.get('If-None-Match') == '"v1"' for r in requests[2:]))
+        self.assertEqual([t.content() for t in tiles], [self.tile_tiff] * 2)
+
+    def test_quadkey_to_tile(self):
+        for x, y, z in [(0, 0, 0), (1, 0, 1), (3, 5, 3), (54, 99, 8)]:
+            self.assertEqual(MapTile.quadkey_to_tile(MapTile.tile_to_quadkey(x, y, z)), (x, y, z))
+
+
+class MetadataCacheTest(PlatformTest):
+
+    def setUp(self):
+        super(MetadataCacheTest, self).setUp()
+        self.now = calendar.timegm((2016, 9, 24, 0, 45, 0))
+        PlatformResource.set_metadata_cache(MetadataCache(clock=lambda: self.now))
+
+    def tearDown(self):
+        PlatformResource.set_metadata_cache(None)
+        PlatformResource.set_cache_ttl(None)
+
+    def _requests(self, path):
+        return [r for r in self.adapter.request_history if r.path == path]
+
+    def test_find_uses_cache(self):
+        products_json = load_fixture('products')
+        self.adapter.register_uri('GET', '/products', json=products_json)
+        Product.find()
+        products = Product.find()
+        self.assertEqual(len(products), 63)
+        self.assertEqual(len(self._requests('/products')), 1)
+
+    def test_entries_expire_after_ttl(self):
+        styles_json = load_fixture('styles')
+        path = '/products/%s/styles' % self.product.id
+        self.adapter.register_uri('GET', path, json=styles_json)
+        self.product.styles()
+        self.now += Style.get_cache_ttl() - 1
+        self.product.styles()
+        self.assertEqual(len(self._requests(path)), 1)
+        self.now += 2
+        self.product.styles()
+        self.assertEqual(len(self._requests(path)), 2)
+
+    def test_tiles_are_not_cached_with_a_global_ttl(self):
+        PlatformResource.set_cache_ttl(60)
+        frame = self._register_frames().pop()
+        path = '/frames/%s/tile/1/0/0' % frame.id
+        self.adapter.register_uri('GET', path, content=load_fixture('tile', extension='tiff'))
+        frame.tile(x=0, y=0, z=1)
+        tile = frame.tile(x=0, y=0, z=1)
+        self.assertIsNotNone(tile.content())
+        self.assertEqual(len(self._requests(path)), 2)
+
+    def test_cached_resources_are_copies(self):
+        frames = self._register_frames()
+        frames[0].product = 'tagged'
+        self.assertNotEqual(self.product.frames()[0].product, 'tagged')
+
+    def test_forecast_frames_use_cache(self):
+        product_json = load_fixture('forecast_product')
+        self.adapter.register_uri('GET', '/products/%s' % product_json['id'], json=product_json)
+        product = Product.find(product_json['id'])
+        forecasts_path = '/products/%s/forecasts' % product.id
+        self.adapter.register_uri('GET', forecasts_path, json=load_fixture('forecasts'))
+        frames_path = '/forecasts/4a61c817-3fc0-4dec-80ab-25936d73b2d7/frames'
+        self.adapter.register_uri('GET', frames_path, json=load_fixture('frames'))
+
+        product.frames()
+        frames = product.frames()
+        self.assertEqual(len(frames), 2)
+        self.assertEqual(len(self._requests(forecasts_path)), 1)
+        self.assertEqual(len(self._requests(frames_path)), 1)
+
+    def test_forecasts_expire_at_expiration_time(self):
+        product_json = load_fixture('forecast_product')
+        self.adapter.register_uri('GET', '/products/%s' % product_json['id'], json=product_json)
+        product = Product.find(product_json['id'])
+        forecasts_path = '/products/%s/forecasts' % product.id
+        self.adapter.register_uri('GET', forecasts_path, json=load_fixture('forecasts'))
+
+        product.forecasts()
+        self.now += 120  # Past the earliest expirationTime, but within the TTL.
+        product.forecasts()
+        self.assertEqual(len(self._requests(forecasts_path)), 2)
+
+    def test_expired_entries_are_revalidated(self):
+        products_json = load_fixture('products')
+
+        def respond(request, context):
+            if request.headers.get('If-Modified-Since') == 'Sat, 24 Sep 2016 00:00:00 GMT':
+                context.status_code = 304
+                return None
+            context.headers['Last-Modified'] = 'Sat, 24 Sep 2016 00:00:00 GMT'
+            return products_json
+        self.adapter.register_uri('GET', '/products', json=respond)
+
+        Product.find()
+        self.now += Product.get_cache_ttl() + 1
+        products = Product.find()
+        self.assertEqual(len(products), 63)
+        requests = self._requests('/products')
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1].headers['If-Modified-Since'], 'Sat, 24 Sep 2016 00:00:00 GMT')
+
+        Product.find()
+        self.assertEqual(len(self._requests('/products')), 2, 'A revalidated entry should be fresh again.')
@@ -0,0 +1,128 @@
+import math
+from unittest import TestCase
+
+from skywiseplatform import GoogleMapsTile
+from skywiseplatform.coverage import (area_tiles, bbox_tiles, compact_quadkeys, compact_tiles, expand_quadkeys,
+                                      polygon_tiles)
+
+
+def _tile(lat, lon, z):
+    return GoogleMapsTile.pixel_xy_to_tile_xy(*GoogleMapsTile.lat_lon_to_pixel_xy(lat, lon, z))
+
+
+class PolygonTilesTest(TestCase):
+
+    # A corridor about 0.2 degrees wide running diagonally from Oklahoma City to Chicago.
+    corridor = [(35.4, -97.6), (35.6, -97.4), (42.0, -87.5), (41.8, -87.7)]
+
+    def test_rectangle_matches_tile_range(self):
+        bbox = ((37.06, -94.40), (33.56, -103.19))
+        (n, e), (s, w) = bbox
+        rectangle = [(n, w), (n, e), (s, e), (s, w)]
+        self.assertEqual(polygon_tiles(rectangle, 8), sorted(GoogleMapsTile.tile_range(bbox, 8)))
+
+    def test_corridor_touches_fewer_tiles_than_its_bounding_box(self):
+        tiles = polygon_tiles(self.corridor, 9)
+        bbox = ((42.0, -87.4), (35.4, -97.6))
+        self.assertLess(len(tiles), len(GoogleMapsTile.tile_range(bbox, 9)) / 4)
+
+        # Every point along and across the corridor, whose edges are straight on the map, is covered.
+        (x0, y0), (x1, y1), _, (x3, y3) = [GoogleMapsTile.lat_lon_to_pixel_xy(lat, lon, 9)
+                                           for lat, lon in self.corridor]
+        for i in xrange(101):
+            t = i / 100.0
+            for u in (0.0, 0.5, 1.0):
+                pixel_x = x0 + t * (x3 - x0) + u * (x1 - x0)
+                pixel_y = y0 + t * (y3 - y0) + u * (y1 - y0)
+                self.assertIn(GoogleMapsTile.pixel_xy_to_tile_xy(pixel_x, pixel_y), tiles)
+
+    def test_interior_tiles_are_filled(self):
+        triangle = [(40.0, -100.0), (30.0, -90.0), (30.0, -110.0)]
+        tiles = set(polygon_tiles(triangle, 7))
+        for lat, lon in [(33.0, -100.0), (35.0, -100.0), (31.0, -93.0), (31.0, -107.0)]:
+            self.assertIn(_tile(lat, lon, 7), tiles)
+        self.assertNotIn(_tile(39.0, -92.0, 7), tiles)
+
+    def test_closed_ring_and_multiple_polygons(self):
+        square = [(35.0, -98.0), (35.0, -97.0), (34.0, -97.0), (34.0, -98.0)]
+        other = [(45.0, -80.0), (45.0, -79.0), (44.0, -79.0)]
+        self.assertEqual(polygon_tiles(square + square[:1], 8), polygon_tiles(square, 8))
+        self.assertEqual(polygon_tiles([square, other], 8),
+                         sorted(set(polygon_tiles(square, 8)) | set(polygon_tiles(other, 8))))
+
+    def test_padding_adds_tiles_near_the_edges(self):
+        # A sliver hugging the west edge of a tile.
+        x, y = 54, 99
+        west = x * 256 + 2
+        ring = [(west, y * 256 + 10), (west + 50, y * 256 + 10), (west + 50, y * 256 + 100)]
+        polygon = [self._lat_lon(px, py, 8) for px, py in ring]
+        self.assertEqual(polygon_tiles(polygon, 8), [(x, y)])
+        padded = polygon_tiles(polygon, 8, padding=8)
+        self.assertEqual(padded, [(x - 1, y), (x, y)])
+
+    def test_clipped_to_the_map(self):
+        tiles = polygon_tiles([(89.0, -179.9), (89.0, 179.9), (-89.0, 179.9)], 2, padding=20)
+        self.assertTrue(all(0 <= x < 4 and 0 <= y < 4 for x, y in tiles))
+
+    @staticmethod
+    def _lat_lon(pixel_x, pixel_y, z):
+        map_size = GoogleMapsTile.map_size(z)
+        x = float(pixel_x) / map_size - 0.5
+        y = 0.5 - float(pixel_y) / map_size
+        latitude = 90 - 360 * math.atan(math.exp(-y * 2 * math.pi)) / math.pi
+        return latitude, 360 * x
+
+
+class BBoxTilesTest(TestCase):
+
+    def test_union_without_duplicates(self):
+        a = ((37.0, -95.0), (34.0, -100.0))
+        b = ((36.0, -90.0), (33.0, -96.0))
+        tiles = bbox_tiles([a, b], 8)
+        self.assertEqual(tiles, sorted(set(GoogleMapsTile.tile_range(a, 8)) | set(GoogleMapsTile.tile_range(b, 8))))
+        self.assertEqual(len(tiles), len(set(tiles)))
+
+
+class TileRangeAreaTest(TestCase):
+
+    def test_polygons(self):
+        corridor = PolygonTilesTest.corridor
+        self.assertEqual(GoogleMapsTile.tile_range(corridor, 11, padding=4), polygon_tiles(corridor, 11, padding=4))
+        self.assertEqual(len(GoogleMapsTile.tile_range(corridor, 11, padding=4)), 138)
+        square = [(35.0, -98.0), (35.0, -97.0), (34.0, -97.0), (34.0, -98.0)]
+        self.assertEqual(list(GoogleMapsTile.iter_tile_range([corridor, square], 9)),
+                         polygon_tiles([corridor, square], 9))
+
+    def test_bounding_boxes(self):
+        a = ((37.0, -95.0), (34.0, -100.0))
+        b = ((36.0, -90.0), (33.0, -96.0))
+        self.assertEqual(GoogleMapsTile.tile_range([a, b], 8), bbox_tiles([a, b], 8))
+        self.assertEqual(GoogleMapsTile.tile_range([a], 8, padding=8), GoogleMapsTile.tile_range(a, 8, padding=8))
+
+    def test_mixed_areas(self):
+        box = ((37.0, -95.0), (34.0, -100.0))
+        triangle = [(40.0, -100.0), (30.0, -90.0), (30.0, -110.0)]
+        self.assertRaises(ValueError, GoogleMapsTile.tile_range, [box, triangle], 8)
+        self.assertEqual(area_tiles([], 8), [])
+
+
+class CompactQuadkeysTest(TestCase):
+
+    def test_merges_siblings_and_drops_covered_keys(self):
+        self.assertEqual(compact_quadkeys(['0230', '0231', '0232', '0233', '021', '0211']), ['021', '023'])
+
+    def test_merges_recursively(self):
+        keys = expand_quadkeys(['12'], 5)
+        self.assertEqual(len(keys), 64)
+        self.assertEqual(compact_quadkeys(keys), ['12'])
+        self.assertEqual(compact_quadkeys(expand_quadkeys(['0', '1', '2', '3'], 3)), [''])
+        self.assertEqual(compact_quadkeys(expand_quadkeys(['0', '1', '2', '3'], 3), min_z=1), ['0', '1', '2', '3'])
+
+    def test_expand_inverts_compact(self):
+        tiles = polygon_tiles([(40.0, -100.0), (30.0, -90.0), (30.0, -110.0)], 8)
+        quadkeys = compact_tiles(tiles, 8)
+        self.assertLess(len(quadkeys), len(tiles))
+        self.assertEqual(sorted(GoogleMapsTile.quadkey_to_tile(q)[:2] for q in expand_quadkeys(quadkeys, 8)), tiles)
+
+    def test_expand_truncates_deeper_keys(self):
+        self.assertEqual(expand_quadkeys(['0123', '01'], 2), ['01'])
@@ -1,4 +1,8 @@
+import math
+import re
+
 from skywiseplatform import Datapoint
+from skywiseplatform.raster import decode_tile
 from tests import load_fixture
 from tests.unit import PlatformTest
 
@@ -21,3 +25,29 @@ class DataPointTest(PlatformTest):
         frame = self._register_frames().pop()
         dpr = Datapoint.find_async(frame, 35.0, -97.0)
         self.assertEqual(dpr.tags()['frame'].id, frame.id)
+
+    def test_sample(self):
+        frame = self._register_frames().pop()
+        tile_tiff = load_fixture('tile', extension='tiff')
+        self.adapter.register_uri('GET', re.compile('/frames/%s/tile/5/' % frame.id),
+                                  content=tile_tiff)
+        tile_array = decode_tile(tile_tiff)
+
+        points = [(35.0, -97.0), (36.5, -95.0), (10.0, 20.0)]
+        datapoints = frame.datapoints(points)
+        self.assertEqual(len(datapoints), 3)
+        tile_requests = [r for r in self.adapter.request_history if '/tile/' in r.url]
+        self.assertEqual(len(tile_requests), 2, 'Points sharing a tile should only fetch it once.')
+
+        dp = datapoints[0]
+        self.assertTrue(isinstance(dp, Datapoint))
+        self.assertEqual(dp.tile, '/frames/%s/tile/5/7/12' % frame.id)
+        self.assertEqual(dp.pixel, {'row': 173, 'column': 97})
+        self.assertEqual(dp.frame.id, frame.id)
+        self.assertEqual(dp.validTime, frame.validTime)
+        for dp in datapoints:
+            expected = tile_array[dp.pixel['row'], dp.pixel['column']]
+            if math.isnan(expected):
+                self.assertIsNone(dp.value)
+            else:
+                self.assertAlmostEqual(dp.value, expected)
@@ -0,0 +1,84 @@
+import re
+from unittest import TestCase
+
+import gevent
+import numpy as np
+
+from skywiseplatform.decodepool import DecodePool
+from skywiseplatform.pointindex import PointIndex
+from skywiseplatform.raster import decode_tile
+from skywiseplatform.tile import MapTile
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class DecodePoolTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = DecodePool(processes=2)
+        cls.tile_tiff = load_fixture('tile', extension='tiff')
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_decode(self):
+        np.testing.assert_array_equal(self.pool.decode(self.tile_tiff), decode_tile(self.tile_tiff))
+
+    def test_decode_does_not_block_greenlets(self):
+        ticks = []
+
+        def tick():
+            while True:
+                ticks.append(1)
+                gevent.sleep(0.001)
+
+        ticker = gevent.spawn(tick)
+        gevent.sleep(0)
+        del ticks[:]
+        greenlets = gevent.joinall([gevent.spawn(self.pool.decode, self.tile_tiff) for _ in range(8)])
+        ticker.kill()
+        self.assertTrue(all(g.successful() for g in greenlets))
+        self.assertGreater(len(ticks), 0, 'Other greenlets should run while tiles decode.')
+
+    def test_oversized_tiles_are_returned_whole(self):
+        pool = DecodePool(processes=1, slot_bytes=16)
+        try:
+            np.testing.assert_array_equal(pool.decode(self.tile_tiff), decode_tile(self.tile_tiff))
+        finally:
+            pool.close()
+
+
+class PooledTileTest(PlatformTest):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = DecodePool(processes=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def setUp(self):
+        super(PooledTileTest, self).setUp()
+        self.tile_tiff = load_fixture('tile', extension='tiff')
+        self.adapter.register_uri('GET', re.compile('/frames/[^/]+/tile/'), content=self.tile_tiff)
+        self.frame = self._register_frames().pop()
+        MapTile.set_decode_pool(self.pool)
+
+    def tearDown(self):
+        MapTile.set_decode_pool(None)
+
+    def test_imap(self):
+        tiles = [self.frame.tile(x=x, y=0, z=1) for x in range(2)]
+        decoded = list(self.pool.imap(iter(tiles)))
+        self.assertEqual(sorted(tile.x for tile, _ in decoded), [0, 1])
+        for _, array in decoded:
+            np.testing.assert_array_equal(array, decode_tile(self.tile_tiff))
+
+    def test_point_values(self):
+        index = PointIndex([(35.0, -97.0), (36.5, -95.0), (10.0, 20.0)])
+        pooled = index.values(self.frame)
+        MapTile.set_decode_pool(None)
+        np.testing.assert_array_equal(pooled, index.values(self.frame))
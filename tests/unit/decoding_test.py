@@ -0,0 +1,95 @@
+import json
+from unittest import TestCase
+
+from skywiseplatform import Forecast, PlatformResource, Product
+from skywiseplatform.decoding import FAST, STRICT, LazyData, parse_datetime
+from skywiseplatform.frame import ProductFrame
+from skywiserestclient.validation import datetime
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class _Response(object):
+
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return json.loads(json.dumps(self._data))
+
+
+class ParseDatetimeTest(TestCase):
+
+    def test_matches_validator(self):
+        for value in ('2016-09-22T14:00:00Z', '2016-09-22T14:00:00.25Z', '2016-09-22T14:00:00+00:00', None):
+            parsed = parse_datetime(value)
+            self.assertEqual(parsed, datetime(value))
+            self.assertEqual(repr(parsed), repr(datetime(value)))
+
+
+class LazyDataTest(TestCase):
+
+    def test_parses_on_read(self):
+        data = LazyData({'validTime': '2016-09-22T14:00:00Z', 'id': 'a'}, ['validTime'])
+        self.assertEqual(dict.__getitem__(data, 'validTime'), '2016-09-22T14:00:00Z')
+        self.assertEqual(data['validTime'], datetime('2016-09-22T14:00:00Z'))
+        self.assertEqual(dict.__getitem__(data, 'validTime'), datetime('2016-09-22T14:00:00Z'))
+
+    def test_views_and_copies_see_parsed_values(self):
+        data = LazyData({'validTime': '2016-09-22T14:00:00Z'}, ['validTime'])
+        expected = {'validTime': datetime('2016-09-22T14:00:00Z')}
+        self.assertEqual(dict(data.copy().items()), expected)
+        self.assertEqual(data, expected)
+
+    def test_set_replaces_pending_value(self):
+        data = LazyData({'validTime': '2016-09-22T14:00:00Z'}, ['validTime'])
+        data['validTime'] = None
+        self.assertIsNone(data['validTime'])
+
+
+class FastDecodingTest(PlatformTest):
+
+    def tearDown(self):
+        PlatformResource.set_decoding(STRICT)
+
+    def _decode_both(self, resource_class, data):
+        strict = resource_class._unpack_response(_Response(data))
+        resource_class.set_decoding(FAST)
+        try:
+            fast = resource_class._unpack_response(_Response(data))
+        finally:
+            del resource_class._decoding
+        return strict, fast
+
+    def test_frames_match_schema(self):
+        strict, fast = self._decode_both(ProductFrame, load_fixture('frames'))
+        self.assertEqual(len(fast), len(strict))
+        for s, f in zip(strict, fast):
+            self.assertIsInstance(f, ProductFrame)
+            self.assertIsInstance(f._data, LazyData)
+            self.assertEqual(f.validTime, s.validTime)
+            self.assertEqual(f._data, s._data)
+
+    def test_products_match_schema(self):
+        strict, fast = self._decode_both(Product, load_fixture('products'))
+        for s, f in zip(strict, fast):
+            self.assertEqual(f._data, s._data)
+
+        strict, fast = self._decode_both(Product, load_fixture('product'))
+        self.assertEqual(fast._data, strict._data)
+        self.assertEqual(fast.json(), strict.json())
+
+    def test_forecasts_match_schema(self):
+        strict, fast = self._decode_both(Forecast, load_fixture('forecasts'))
+        for s, f in zip(strict, fast):
+            self.assertEqual(f._data, s._data)
+            self.assertEqual(repr(f), repr(s))
+
+    def test_set_on_platform_resource(self):
+        frames_json = load_fixture('frames')
+        self.adapter.register_uri('GET', '/products/%s/frames' % (self.product.id,),
+                                  json=frames_json)
+        PlatformResource.set_decoding(FAST)
+        frames = self.product.frames()
+        self.assertIsInstance(frames[0]._data, LazyData)
+        self.assertEqual(frames[0].validTime, datetime(frames_json[0]['validTime']))
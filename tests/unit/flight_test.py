@@ -0,0 +1,123 @@
+import re
+import threading
+from unittest import TestCase
+
+import gevent
+
+from skywiseplatform import Datapoint, GoogleMapsTile, PlatformResource, map_async
+from skywiseplatform.flight import SingleFlight
+from skywiseplatform.scheduler import RequestScheduler
+from skywiseplatform.tile import MapTile
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class SingleFlightTest(TestCase):
+
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = []
+
+        def work():
+            calls.append(1)
+            gevent.sleep(0.01)
+            return 'result'
+
+        greenlets = [gevent.spawn(flight.do, 'key', work) for _ in range(5)]
+        gevent.joinall(greenlets)
+        self.assertEqual([g.value for g in greenlets], ['result'] * 5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(flight), 0, 'Finished calls should not be kept.')
+
+    def test_errors_are_shared(self):
+        flight = SingleFlight()
+
+        def fail():
+            gevent.sleep(0.01)
+            raise ValueError('upstream failed')
+
+        def call():
+            try:
+                flight.do('key', fail)
+            except ValueError as e:
+                return e
+
+        greenlets = [gevent.spawn(call) for _ in range(3)]
+        gevent.joinall(greenlets)
+        self.assertTrue(all(isinstance(g.value, ValueError) for g in greenlets))
+
+    def test_threads_share_result(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls, results = [], []
+
+        def work():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return 'result'
+
+        leader = threading.Thread(target=lambda: results.append(flight.do('key', work)))
+        leader.start()
+        started.wait()
+        follower = threading.Thread(target=lambda: results.append(flight.do('key', work)))
+        follower.start()
+        while not len(flight._flights) or not flight._flights['key'].waiters:
+            gevent.sleep(0.001)
+        release.set()
+        leader.join()
+        follower.join()
+        self.assertEqual(results, ['result', 'result'])
+        self.assertEqual(len(calls), 1)
+
+
+class CoalescingTest(PlatformTest):
+
+    def setUp(self):
+        super(CoalescingTest, self).setUp()
+        MapTile.set_single_flight(SingleFlight())
+        Datapoint.set_single_flight(SingleFlight())
+        self.frame = self._register_frames().pop()
+
+        def respond(content):
+            def callback(request, context):
+                gevent.sleep(0.01)
+                return content
+            return callback
+
+        self.adapter.register_uri('GET', re.compile(r'/frames/[^/]+/tile/'),
+                                  content=respond(load_fixture('tile', extension='tiff')))
+        self.adapter.register_uri('GET', re.compile(r'/frames/[^/]+/datapoint/'),
+                                  json=respond(load_fixture('datapoint')))
+
+    def tearDown(self):
+        PlatformResource.set_scheduler(None)
+        MapTile.set_single_flight(None)
+        Datapoint.set_single_flight(None)
+
+    def _requests(self, part):
+        return [r for r in self.adapter.request_history if part in r.url]
+
+    def test_find(self):
+        greenlets = [gevent.spawn(GoogleMapsTile.find, self.frame.id, 0, 0, 1) for _ in range(4)]
+        greenlets.append(gevent.spawn(GoogleMapsTile.find, self.frame.id, 0, 0, 1, media_type='image/png'))
+        gevent.joinall(greenlets, raise_error=True)
+        self.assertEqual(len(self._requests('/tile/')), 2, 'Only different media types are requested separately.')
+        self.assertEqual(len(set(id(g.value) for g in greenlets)), 5, 'Each caller gets its own tile.')
+        self.assertEqual(greenlets[0].value.content(), greenlets[1].value.content())
+
+    def test_find_async(self):
+        PlatformResource.set_scheduler(RequestScheduler(max_in_flight=4))
+        datapoints = map_async([Datapoint.find_async(self.frame, 35.0, -97.0) for _ in range(4)])
+        self.assertEqual(len(self._requests('/datapoint/')), 1)
+        self.assertEqual(len(datapoints), 4)
+        self.assertTrue(all(d.frame is self.frame for d in datapoints))
+        self.assertIsNot(datapoints[0]._data, datapoints[1]._data)
+
+    def test_sync_and_async_share(self):
+        sync = gevent.spawn(Datapoint.find, self.frame, 35.0, -97.0)
+        datapoints = map_async([Datapoint.find_async(self.frame, 35.0, -97.0)])
+        sync.join()
+        self.assertEqual(len(self._requests('/datapoint/')), 1)
+        self.assertEqual(sync.value.value, datapoints[0].value)
@@ -1,6 +1,8 @@
+import pickle
+
 import arrow
 
-from skywiseplatform import Product
+from skywiseplatform import ForecastFrame, ProductFrame, Product
 from skywiseplatform.forecast import Forecast, ProductForecast
 from tests import load_fixture
 from tests.unit import PlatformTest
@@ -40,3 +42,66 @@ class ForecastTest(PlatformTest):
                                   json=frames_json)
         frames = forecast.frames()
         self.assertEqual(len(frames), 10)
+
+    def test_tagged_fields(self):
+        product_json = load_fixture('forecast_product')
+        self.adapter.register_uri('GET', '/products/%s' % product_json['id'], json=product_json)
+        product = Product.find(product_json['id'])
+        self.adapter.register_uri('GET', '/products/%s/forecasts' % product.id, json=load_fixture('forecasts'))
+        forecast = product.forecasts().pop()
+        frames_json = load_fixture('forecast_frames')
+        self.adapter.register_uri('GET', '/forecasts/%s/frames' % forecast.id, json=frames_json)
+
+        self.assertIs(forecast.product, product)
+        self.assertIs(forecast._get_field('product'), product)
+        self.assertNotEqual(forecast._data['product'], product)
+
+        # Frames keep their JSON forecast field until they are tagged with the Forecast.
+        frame = ForecastFrame.find(forecast.id)[0]
+        self.assertEqual(frame.forecast, frames_json[0]['forecast'])
+        self.assertEqual(frame._get_field('forecast'), frames_json[0]['forecast'])
+        self.assertEqual(frame._get_field('product'), frames_json[0]['product'])
+
+        frame = forecast.frames()[0]
+        self.assertIs(frame.forecast, forecast)
+        self.assertIs(frame.product, product)
+        self.assertEqual(frame._data['forecast'], frames_json[0]['forecast'])
+
+        frame = next(forecast.iter_frames())
+        self.assertIs(frame.product, product)
+
+    def test_pickle_round_trip(self):
+        product_json = load_fixture('forecast_product')
+        self.adapter.register_uri('GET', '/products/%s' % product_json['id'], json=product_json)
+        product = Product.find(product_json['id'])
+        self.adapter.register_uri('GET', '/products/%s/forecasts' % product.id, json=load_fixture('forecasts'))
+        forecast = product.forecasts().pop()
+        self.adapter.register_uri('GET', '/forecasts/%s/frames' % forecast.id, json=load_fixture('forecast_frames'))
+        frame = forecast.frames()[0]
+        self.adapter.register_uri('GET', '/frames/%s/tile/1/0/0' % frame.id,
+                                  content=load_fixture('tile', extension='tiff'))
+        tile = frame.tile(x=0, y=0, z=1)
+
+        for protocol in (0, pickle.HIGHEST_PROTOCOL):
+            self.assertEqual(pickle.loads(pickle.dumps(product, protocol)).id, product.id)
+            copy = pickle.loads(pickle.dumps(forecast, protocol))
+            self.assertEqual((copy.id, copy.product.id), (forecast.id, product.id))
+            copy = pickle.loads(pickle.dumps(frame, protocol))
+            self.assertEqual((copy.id, copy.validTime), (frame.id, frame.validTime))
+            self.assertEqual((copy.forecast.id, copy.product.id), (forecast.id, product.id))
+            copy = pickle.loads(pickle.dumps(tile, protocol))
+            self.assertEqual((copy.x, copy.y, copy.z, copy.frame.id), (0, 0, 1, frame.id))
+            self.assertEqual(copy.content(), tile.content())
+
+    def test_inherited_tags(self):
+        frame = _TaggedFrame()
+        frame.product = 'product'
+        frame.extra = 'extra'
+        self.assertNotIn('product', frame._data)
+        self.assertNotIn('extra', frame._data)
+        self.assertEqual(pickle.loads(pickle.dumps(frame))._get_field('product'), 'product')
+
+
+class _TaggedFrame(ProductFrame):
+
+    _tags = ('extra',)
@@ -1,4 +1,5 @@
-from skywiseplatform import ForecastFrame, ProductFrame, map_async
+from skywiseplatform import ForecastFrame, ProductFrame, imap_async, map_async
+from skywiseplatform.decoding import parse_datetime
 from tests import load_fixture
 from tests.unit import PlatformTest
 
@@ -37,6 +38,23 @@ class FrameTest(PlatformTest):
         tiles = map_async(tile_batch)
         self.assertEqual(len(tiles), len(frames))
 
+    def test_google_maps_tiles_imap_async(self):
+        frames = self._register_frames()
+        tile_tiff = load_fixture('tile', extension='tiff')
+        for frame in frames:
+            self.adapter.register_uri('GET', '/frames/%s/tile/1/0/0' % frame.id,
+                                      content=tile_tiff)
+        tile_batch = (frame.tile_async(x=0, y=0, z=1) for frame in frames)
+        tiles = list(imap_async(tile_batch, size=1))
+        self.assertEqual(sorted(t.frame.id for t in tiles), sorted(f.id for f in frames))
+        self.assertTrue(all(t.z == 1 for t in tiles))
+
+    def test_imap_async_errors(self):
+        frame = self._register_frames().pop()
+        self.adapter.register_uri('GET', '/frames/%s/tile/1/0/0' % frame.id, status_code=500)
+        self.assertRaises(Exception, list, imap_async([frame.tile_async(x=0, y=0, z=1)]))
+        self.assertEqual(list(imap_async([frame.tile_async(x=0, y=0, z=1)], raise_on_error=False)), [])
+
     def test_bing_maps_tiles(self):
         frame = self._register_frames().pop()
         tile_tiff = load_fixture('tile', extension='tiff')
@@ -72,3 +90,55 @@ class FrameTest(PlatformTest):
         datapoint_batch = [frame.datapoint_async(35.0, -97.0) for frame in frames]
         datapoints = map_async(datapoint_batch)
         self.assertEqual(len(datapoints), len(frames))
+
+    def _register_pages(self, path, max_limit=None):
+        frames_json = load_fixture('frames')[0]
+        listing = []
+        for i, hour in enumerate([0, 1, 2, 3, 3, 3, 4, 5, 6]):
+            frame = dict(frames_json, id='frame-%i' % i, validTime='2016-09-22T%02i:00:00Z' % hour)
+            listing.append(frame)
+        requests = []
+
+        def respond(request, context):
+            args = dict((k.upper(), v[0].upper()) for k, v in request.qs.items())
+            requests.append(args)
+            start, end = parse_datetime(args.get('START')), parse_datetime(args.get('END'))
+            page = [f for f in listing
+                    if (start is None or parse_datetime(f['validTime']) >= start) and
+                    (end is None or parse_datetime(f['validTime']) <= end)]
+            if args.get('SORT') == 'DESC':
+                page.reverse()
+            return page[:min(int(args['LIMIT']), max_limit or len(listing))]
+
+        self.adapter.register_uri('GET', path, json=respond)
+        return listing, requests
+
+    def test_iter_pages(self):
+        listing, requests = self._register_pages('/products/%s/frames' % self.product.id)
+        frames = list(ProductFrame.iter(self.product.id, page_size=2))
+        self.assertEqual([f.id for f in frames], [f['id'] for f in listing])
+        self.assertEqual(requests[1]['START'], '2016-09-22T01:00:00Z')
+
+    def test_iter_server_caps_limit(self):
+        listing, requests = self._register_pages('/products/%s/frames' % self.product.id, max_limit=4)
+        frames = list(ProductFrame.iter(self.product.id, page_size=6))
+        self.assertEqual([f.id for f in frames], [f['id'] for f in listing])
+        frames = list(ProductFrame.iter(self.product.id, sort='desc', page_size=6))
+        self.assertEqual([f.id for f in frames], [f['id'] for f in reversed(listing)])
+
+    def test_iter_desc_with_limit(self):
+        listing, requests = self._register_pages('/forecasts/forecast-id/frames')
+        frames = list(ForecastFrame.iter('forecast-id', sort='desc', page_size=3, limit=5))
+        self.assertEqual([f.id for f in frames], ['frame-8', 'frame-7', 'frame-6', 'frame-5', 'frame-4'])
+
+    def test_iter_more_reruns_than_page_size(self):
+        listing, requests = self._register_pages('/products/%s/frames' % self.product.id)
+        frames = list(ProductFrame.iter(self.product.id, page_size=1))
+        self.assertEqual([f.id for f in frames], [f['id'] for f in listing])
+        self.assertEqual(max(int(r['LIMIT']) for r in requests), 4)
+
+    def test_product_iter_frames(self):
+        listing, requests = self._register_pages('/products/%s/frames' % self.product.id)
+        frames = list(self.product.iter_frames(page_size=4))
+        self.assertEqual(len(frames), len(listing))
+        self.assertTrue(all(f.product is self.product for f in frames))
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+import numpy as np
+from dateutil.tz import tzutc
+
+from skywiseplatform import ForecastFrame, ProductFrame
+from skywiseplatform.frameset import FrameSet
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+def _frame_json(id_, valid_hour, run_minute):
+    return {
+        "id": id_,
+        "validTime": "2016-09-22T%02i:00:00Z" % valid_hour,
+        "runTime": "2016-09-22T%02i:%02i:00Z" % (valid_hour, run_minute),
+        "zoomLevels": {"minimum": 2, "native": 5, "maximum": 17},
+        "mediaTypes": ["image/jpeg", "image/png", "image/tiff"],
+        "tileSize": 256,
+        "forecast": None
+    }
+
+
+class FrameSetTest(PlatformTest):
+
+    def setUp(self):
+        super(FrameSetTest, self).setUp()
+        self.frames_json = [_frame_json('a', 1, 5), _frame_json('b', 2, 5), _frame_json('c', 2, 30),
+                            _frame_json('d', 3, 5)]
+
+    def test_matches_frames(self):
+        frames_json = load_fixture('frames')
+        self.adapter.register_uri('GET', '/products/%s/frames' % (self.product.id,),
+                                  json=frames_json)
+        frames = self.product.frames()
+        frameset = self.product.frameset()
+
+        self.assertEqual(len(frameset), len(frames))
+        for frame, compact in zip(frames, frameset):
+            self.assertIsInstance(compact, ProductFrame)
+            self.assertIs(compact.product, self.product)
+            for key in ('id', 'validTime', 'runTime', 'zoomLevels', 'mediaTypes', 'tileSize', 'forecast'):
+                self.assertEqual(compact._data[key], frame._data[key])
+
+    def test_forecast_find_set(self):
+        self.adapter.register_uri('GET', '/forecasts/forecast-id/frames', json=self.frames_json)
+        frameset = ForecastFrame.find_set('forecast-id', limit=4)
+        self.assertIsInstance(frameset[-1], ForecastFrame)
+        self.assertEqual(frameset[-1].id, u'd')
+        self.assertEqual(self.adapter.last_request.qs, {'limit': ['4']})
+
+    def test_between(self):
+        frameset = FrameSet.from_json(ProductFrame, self.frames_json)
+        selected = frameset.between(datetime(2016, 9, 22, 2, tzinfo=tzutc()), datetime(2016, 9, 22, 3))
+        self.assertEqual([f.id for f in selected], [u'b', u'c', u'd'])
+        self.assertEqual(len(frameset.between(end=datetime(2016, 9, 22, 1, tzinfo=tzutc()))), 1)
+
+    def test_reruns(self):
+        frameset = FrameSet.from_json(ProductFrame, self.frames_json)
+        self.assertEqual([f.id for f in frameset.latest_runs()], [u'a', u'c', u'd'])
+        self.assertEqual([f.id for f in frameset.reruns()], [u'b'])
+
+    def test_indexing(self):
+        frameset = FrameSet.from_json(ProductFrame, self.frames_json)
+        self.assertEqual(frameset[1].runTime, datetime(2016, 9, 22, 2, 5, tzinfo=tzutc()))
+        self.assertEqual(len(frameset[1:3]), 2)
+        self.assertEqual([f.id for f in frameset.filter(frameset.ids != b'a')], [u'b', u'c', u'd'])
+        self.assertTrue(np.isnat(frameset.creation_times).all())
+        self.assertIsNone(frameset[0].creationTime)
+        self.assertRaises(IndexError, frameset.__getitem__, 4)
@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+from requests.exceptions import HTTPError
+
+from skywiseplatform import Datapoint, PlatformResource, Product, ProductFrame, map_async
+from skywiseplatform.instrumentation import LatencyStats, RequestEvent, percentile
+from skywiseplatform.scheduler import RequestScheduler
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class LatencyStatsTest(TestCase):
+
+    def test_percentiles(self):
+        self.assertEqual(percentile(list(range(1, 101)), 95), 95)
+        self.assertEqual(percentile([3.0], 50), 3.0)
+        self.assertIsNone(percentile([], 99))
+
+    def test_report(self):
+        stats = LatencyStats()
+        for i in range(1, 101):
+            stats(RequestEvent(Product, '/products/{id}', 'url', status=200, latency=i / 100.0, bytes=10))
+        stats(RequestEvent(Datapoint, '/frames/{frame_id}/datapoint/{latitude}/{longitude}', 'url',
+                           latency=2.0, retries=2, error=HTTPError()))
+        report = stats.report()
+        self.assertEqual(report['Product']['count'], 100)
+        self.assertEqual(report['Product']['bytes'], 1000)
+        self.assertEqual((report['Product']['p50'], report['Product']['p95'], report['Product']['p99']),
+                         (0.5, 0.95, 0.99))
+        self.assertEqual((report['Datapoint']['errors'], report['Datapoint']['retries']), (1, 2))
+
+
+class RequestHooksTest(PlatformTest):
+
+    def setUp(self):
+        super(RequestHooksTest, self).setUp()
+        self.events = []
+        PlatformResource.set_request_hooks([self.events.append])
+
+    def tearDown(self):
+        PlatformResource.set_request_hooks(())
+        PlatformResource.set_scheduler(None)
+
+    def test_find(self):
+        Product.find(self.product.id)
+        event = self.events[0]
+        self.assertIs(event.resource_class, Product)
+        self.assertEqual(event.path, '/products/{id}')
+        self.assertEqual(event.status, 200)
+        self.assertGreater(event.bytes, 0)
+        self.assertEqual((event.retries, event.queue_wait), (0, 0.0))
+        self.assertGreaterEqual(event.latency, 0)
+
+    def test_listing(self):
+        self._register_frames()
+        event = self.events[-1]
+        self.assertIs(event.resource_class, ProductFrame)
+        self.assertEqual(event.path, '/products/{product_id}/frames')
+
+    def test_errors(self):
+        self.adapter.register_uri('GET', '/products/missing', status_code=404)
+        self.assertRaises(HTTPError, Product.find, 'missing')
+        self.assertEqual(self.events[0].status, 404)
+        self.assertFalse(self.events[0].ok)
+
+    def test_map_async(self):
+        frame = self._register_frames()[0]
+        del self.events[:]
+        PlatformResource.set_scheduler(RequestScheduler(retries=1, backoff=0))
+        self.adapter.register_uri('GET', '/frames/%s/datapoint/35.0/-97.0' % frame.id,
+                                  [{'status_code': 503}, {'json': load_fixture('datapoint')}])
+        map_async([Datapoint.find_async(frame, 35.0, -97.0)])
+        event = self.events[0]
+        self.assertIs(event.resource_class, Datapoint)
+        self.assertEqual(event.path, Datapoint._path)
+        self.assertEqual((event.status, event.retries), (200, 1))
+        self.assertGreaterEqual(event.queue_wait, 0)
+
+    def test_map_async_by_id(self):
+        PlatformResource.set_scheduler(RequestScheduler())
+        del self.events[:]
+        map_async([Product.find_async(self.product.id)])
+        self.assertEqual(self.events[0].path, '/products/{id}')
@@ -0,0 +1,46 @@
+import re
+
+import numpy as np
+
+from skywiseplatform import GoogleMapsTile
+from skywiseplatform.mosaic import geotransform
+from skywiseplatform.raster import decode_tile
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class MosaicTest(PlatformTest):
+
+    def setUp(self):
+        super(MosaicTest, self).setUp()
+        self.tile_tiff = load_fixture('tile', extension='tiff')
+        self.tile_array = decode_tile(self.tile_tiff)
+        self.adapter.register_uri('GET', re.compile('/frames/[^/]+/tile/8/'), content=self.tile_tiff)
+        self.frame = self._register_frames().pop()
+        self.bounding_box = ((37.063944, -94.400024), (33.559707, -103.189087))
+
+    def test_mosaic(self):
+        raster, transform = self.frame.mosaic(self.bounding_box, 8)
+        xmax, ymin = GoogleMapsTile.lat_lon_to_pixel_xy(37.063944, -94.400024, 8)
+        xmin, ymax = GoogleMapsTile.lat_lon_to_pixel_xy(33.559707, -103.189087, 8)
+        self.assertEqual(raster.shape, (ymax - ymin + 1, xmax - xmin + 1))
+
+        # Every tile is the fixture, so each pixel matches the fixture at its in-tile offset.
+        rows = (np.arange(ymin, ymax + 1) % 256)[:, None]
+        columns = (np.arange(xmin, xmax + 1) % 256)[None, :]
+        np.testing.assert_array_equal(raster, self.tile_array[rows, columns])
+
+    def test_integer_dtype(self):
+        self.assertRaises(ValueError, self.frame.mosaic, self.bounding_box, 8, dtype='int16')
+        self.assertFalse([r for r in self.adapter.request_history if '/tile/' in r.url])
+
+    def test_geotransform(self):
+        _, transform = self.frame.mosaic(self.bounding_box, 8)
+        xmin, ymin = GoogleMapsTile.lat_lon_to_pixel_xy(37.063944, -103.189087, 8)
+        self.assertEqual(transform, geotransform(xmin, ymin, 8))
+
+        origin_x, width, _, origin_y, _, height = geotransform(0, 0, 0)
+        self.assertAlmostEqual(origin_x, -20037508.342789244)
+        self.assertAlmostEqual(origin_y, 20037508.342789244)
+        self.assertAlmostEqual(width * 256, 2 * 20037508.342789244)
+        self.assertEqual(height, -width)
@@ -0,0 +1,59 @@
+import re
+from unittest import TestCase
+
+import numpy as np
+
+from skywiseplatform import Datapoint, GoogleMapsTile
+from skywiseplatform.pointindex import PointIndex
+from skywiseplatform.raster import decode_tile
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class PointIndexGeometryTest(TestCase):
+
+    def setUp(self):
+        self.points = [(35.0, -97.0), (10.0, 20.0), (35.01, -97.01), (36.5, -95.0)]
+        self.index = PointIndex(self.points)
+
+    def test_pixels_match_projection(self):
+        tile_x, tile_y, column, row = self.index.pixels(5)
+        for i, (lat, lon) in enumerate(self.points):
+            pixel_x, pixel_y = GoogleMapsTile.lat_lon_to_pixel_xy(lat, lon, 5)
+            self.assertEqual((tile_x[i], tile_y[i]), GoogleMapsTile.pixel_xy_to_tile_xy(pixel_x, pixel_y))
+            self.assertEqual((column[i], row[i]), (pixel_x % 256, pixel_y % 256))
+
+    def test_groups_points_by_tile(self):
+        level = self.index.level(5)
+        self.assertIs(self.index.level(5), level, 'Geometry should be computed once per zoom.')
+        self.assertEqual(len(level.tiles), len(set(level.tiles)))
+        self.assertEqual(sorted(np.concatenate([g[0] for g in level.groups]).tolist()), [0, 1, 2, 3])
+        for (x, y), (indices, _, _) in zip(level.tiles, level.groups):
+            self.assertTrue(all(level.tile_x[i] == x and level.tile_y[i] == y for i in indices))
+
+    def test_empty(self):
+        index = PointIndex([])
+        self.assertEqual(index.tiles(5), [])
+
+
+class PointIndexSampleTest(PlatformTest):
+
+    def setUp(self):
+        super(PointIndexSampleTest, self).setUp()
+        self.frames = self._register_frames()
+        self.tile_tiff = load_fixture('tile', extension='tiff')
+        self.adapter.register_uri('GET', re.compile('/frames/[^/]+/tile/5/'), content=self.tile_tiff)
+        self.index = PointIndex([(35.0, -97.0), (36.5, -95.0), (10.0, 20.0)])
+
+    def test_values(self):
+        values = self.index.values(self.frames[0])
+        tile_array = decode_tile(self.tile_tiff)
+        _, _, column, row = self.index.pixels(5)
+        np.testing.assert_array_equal(values, tile_array[row, column].astype(np.float64))
+
+    def test_sample_with_index(self):
+        for frame in self.frames:
+            datapoints = Datapoint.sample(frame, self.index)
+            expected = Datapoint.sample(frame, [(35.0, -97.0), (36.5, -95.0), (10.0, 20.0)])
+            self.assertEqual([dp._data for dp in datapoints], [dp._data for dp in expected])
+        self.assertEqual(list(self.index._levels), [5])
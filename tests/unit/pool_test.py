@@ -0,0 +1,39 @@
+from skywiserestclient import SkyWiseException
+
+from skywiseplatform import Datapoint, GoogleMapsTile, PlatformResource, Product
+from skywiseplatform.frame import ProductFrame
+from skywiseplatform.pool import ConnectionPool
+from tests.unit import PlatformTest
+
+
+class ConnectionPoolTest(PlatformTest):
+
+    def tearDown(self):
+        PlatformResource.set_connection_pool(None)
+
+    def test_resources_share_one_session(self):
+        session = PlatformResource.get_session()
+        for resource_class in (Product, ProductFrame, GoogleMapsTile, Datapoint):
+            self.assertIs(resource_class.get_session(), session)
+
+    def test_pool_size(self):
+        PlatformResource.set_connection_pool(ConnectionPool(pool_size=64, block=True))
+        adapter = PlatformResource.get_session().get_adapter('https://platform.api.wdtinc.com')
+        self.assertEqual(adapter._pool_maxsize, 64)
+        self.assertTrue(adapter._pool_block)
+        self.assertTrue(PlatformResource.get_use_session_for_async())
+
+    def test_keep_alive(self):
+        PlatformResource.set_connection_pool(ConnectionPool(keep_alive=False))
+        Product.find(self.product.id)
+        self.assertEqual(self.adapter.request_history[-1].headers['Connection'], 'close')
+
+        PlatformResource.set_connection_pool(ConnectionPool())
+        Product.find(self.product.id)
+        self.assertEqual(self.adapter.request_history[-1].headers['Connection'], 'keep-alive')
+
+    def test_http2_requires_hyper(self):
+        try:
+            import hyper  # noqa
+        except ImportError:
+            self.assertRaises(SkyWiseException, ConnectionPool(http2=True).mount, PlatformResource.get_session())
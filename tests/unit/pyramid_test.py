@@ -0,0 +1,61 @@
+import re
+from unittest import TestCase
+
+import numpy as np
+
+from skywiseplatform import GoogleMapsTile
+from skywiseplatform.pyramid import downsample
+from skywiseplatform.raster import decode_tile
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class DownsampleTest(TestCase):
+
+    def test_mean_ignores_nodata(self):
+        child = np.array([[1, 3], [np.nan, 5]], dtype=np.float32)
+        parent = downsample(((child, None), (child, child)))
+        np.testing.assert_array_equal(parent, np.array([[3, np.nan], [3, 3]], dtype=np.float32))
+        self.assertEqual(parent.dtype, np.float32)
+
+    def test_nearest(self):
+        child = np.arange(4, dtype=np.uint8).reshape(2, 2)
+        parent = downsample(((child, child), (None, child)), resampling='nearest')
+        np.testing.assert_array_equal(parent, np.array([[0, 0], [0, 0]], dtype=np.uint8))
+        self.assertEqual(parent.dtype, np.uint8)
+
+    def test_invalid_resampling(self):
+        child = np.zeros((2, 2))
+        self.assertRaises(ValueError, downsample, ((child, child), (child, child)), 'bilinear')
+
+
+class PyramidTest(PlatformTest):
+
+    def setUp(self):
+        super(PyramidTest, self).setUp()
+        self.tile_tiff = load_fixture('tile', extension='tiff')
+        self.adapter.register_uri('GET', re.compile('/frames/[^/]+/tile/'), content=self.tile_tiff)
+        self.frame = self._register_frames().pop()
+        self.bounding_box = ((37.063944, -94.400024), (33.559707, -103.189087))
+
+    def test_pyramid(self):
+        pyramid = self.frame.pyramid(self.bounding_box, z=6, min_z=4)
+        requested = [r.url for r in self.adapter.request_history if '/tile/' in r.url]
+        native = GoogleMapsTile.tile_range(self.bounding_box, 6)
+        self.assertEqual(len(requested), len(native), 'Lower zooms should not be requested.')
+        self.assertTrue(all('/tile/6/' in url for url in requested))
+
+        self.assertEqual(pyramid.levels, [6, 5, 4])
+        self.assertEqual(sorted(pyramid.level(5)), sorted(set((x // 2, y // 2) for x, y in native)))
+        for (x, y, z), array in pyramid.items():
+            self.assertEqual(array.shape, (256, 256))
+            self.assertIs(pyramid.get_quadkey(GoogleMapsTile.tile_to_quadkey(x, y, z)), array)
+
+    def test_parent_of_four_children(self):
+        tile = decode_tile(self.tile_tiff)
+        pyramid = self.frame.pyramid(((38.0, -92.0), (34.0, -100.0)), z=6, min_z=5)
+        self.assertEqual(len(pyramid.level(6)), 4)
+        (x, y), parent = list(pyramid.level(5).items())[0]
+        expected = downsample(((tile, tile), (tile, tile)))
+        np.testing.assert_array_equal(parent, expected)
+        self.assertEqual(list(pyramid.quadkeys(z=5)), [GoogleMapsTile.tile_to_quadkey(x, y, 5)])
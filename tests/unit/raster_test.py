@@ -0,0 +1,56 @@
+from unittest import TestCase
+
+import numpy as np
+
+from skywiseplatform import raster
+from skywiseplatform.raster import decode_tile, decode_tile_into
+from tests import load_fixture
+
+
+class _Image(object):
+    """ A decoded image with a GDAL nodata tag, for dtypes Pillow can't write. """
+
+    def __init__(self, array, nodata):
+        self.array = array
+        self.tag_v2 = {raster._GDAL_NODATA_TAG: repr(nodata)}
+
+    def __array__(self, dtype=None):
+        return self.array
+
+
+class DecodeTileIntoTest(TestCase):
+
+    def setUp(self):
+        self._open = raster._open
+
+    def tearDown(self):
+        raster._open = self._open
+
+    def test_matches_decode_tile(self):
+        content = load_fixture('tile', extension='tiff')
+        out = np.empty((256, 256), dtype=np.float32)
+        decode_tile_into(content, out)
+        np.testing.assert_array_equal(out, decode_tile(content))
+        self.assertTrue(np.isnan(out).any())
+
+    def test_window(self):
+        content = load_fixture('tile', extension='tiff')
+        out = np.zeros((4, 6), dtype=np.float32)
+        decode_tile_into(content, out[1:3, 2:5], rows=slice(10, 12), columns=slice(20, 23))
+        np.testing.assert_array_equal(out[1:3, 2:5], decode_tile(content)[10:12, 20:23])
+        self.assertEqual(np.count_nonzero(out[0]), 0)
+
+    def test_float64_nodata_into_float32(self):
+        # GDAL's usual float64 nodata, which becomes -inf in a float32 array.
+        nodata = -np.finfo(np.float64).max
+        source = np.array([[nodata, 1.5], [2.5, nodata]], dtype=np.float64)
+        raster._open = lambda content: _Image(source, nodata)
+        out = decode_tile_into(b'', np.zeros((2, 2), dtype=np.float32))
+        np.testing.assert_array_equal(np.isnan(out), [[True, False], [False, True]])
+        np.testing.assert_array_equal(out[~np.isnan(out)], [1.5, 2.5])
+
+    def test_integer_tiles_keep_nodata(self):
+        source = np.array([[255, 1]], dtype=np.uint8)
+        raster._open = lambda content: _Image(source, 255.0)
+        out = decode_tile_into(b'', np.zeros((1, 2), dtype=np.float32))
+        np.testing.assert_array_equal(out, [[255, 1]])
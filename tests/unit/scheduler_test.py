@@ -0,0 +1,112 @@
+import re
+from unittest import TestCase
+
+import gevent
+from requests.exceptions import HTTPError
+
+from skywiseplatform import Datapoint, PlatformResource, map_async, map_async_results
+from skywiseplatform.scheduler import RequestScheduler, TokenBucket, _send_request
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class TokenBucketTest(TestCase):
+
+    def test_rate_limit(self):
+        now = [0.0]
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            now[0] += seconds
+
+        bucket = TokenBucket(2, burst=1, clock=lambda: now[0], sleep=sleep)
+        for _ in range(3):
+            bucket.acquire()
+        self.assertAlmostEqual(now[0], 1.0)
+        self.assertEqual(len(sleeps), 2)
+
+
+class _AsyncRequest(object):
+    """ Sends like grequests releases after 0.2: returns itself and keeps any error on itself. """
+
+    def __init__(self, response=None, exception=None):
+        self._response, self._exception = response, exception
+
+    def send(self):
+        self.response, self.exception = self._response, self._exception
+        return self
+
+
+class SendRequestTest(TestCase):
+
+    def test_response_is_read_off_the_request(self):
+        response = object()
+        self.assertIs(_send_request(_AsyncRequest(response=response)), response)
+
+    def test_stored_exception_is_raised(self):
+        self.assertRaises(HTTPError, _send_request, _AsyncRequest(exception=HTTPError('503')))
+
+
+class RequestSchedulerTest(PlatformTest):
+
+    def setUp(self):
+        super(RequestSchedulerTest, self).setUp()
+        self.frame = self._register_frames().pop()
+        self.datapoint_json = load_fixture('datapoint')
+        self.path = '/frames/%s/datapoint/35.0/-97.0' % self.frame.id
+
+    def tearDown(self):
+        PlatformResource.set_scheduler(None)
+
+    def test_retries_transient_errors(self):
+        PlatformResource.set_scheduler(RequestScheduler(retries=2, backoff=0))
+        self.adapter.register_uri('GET', self.path, [{'status_code': 503},
+                                                     {'status_code': 502},
+                                                     {'json': self.datapoint_json}])
+        results = map_async_results([Datapoint.find_async(self.frame, 35.0, -97.0)])
+        self.assertTrue(results[0].ok)
+        self.assertEqual(results[0].attempts, 3)
+        self.assertEqual(results[0].resource.value, 0.296531558)
+
+    def test_gives_up_after_retries(self):
+        PlatformResource.set_scheduler(RequestScheduler(retries=1, backoff=0))
+        self.adapter.register_uri('GET', self.path, status_code=503)
+        result = map_async_results([Datapoint.find_async(self.frame, 35.0, -97.0)])[0]
+        self.assertFalse(result.ok)
+        self.assertEqual(result.attempts, 2)
+        self.assertEqual(result.error.response.status_code, 503)
+
+    def test_client_errors_are_not_retried(self):
+        PlatformResource.set_scheduler(RequestScheduler(retries=3, backoff=0))
+        self.adapter.register_uri('GET', self.path, status_code=404)
+        result = map_async_results([Datapoint.find_async(self.frame, 35.0, -97.0)])[0]
+        self.assertEqual(result.attempts, 1)
+        self.assertRaises(HTTPError, map_async, [Datapoint.find_async(self.frame, 35.0, -97.0)])
+
+    def test_per_item_results(self):
+        self.adapter.register_uri('GET', self.path, json=self.datapoint_json)
+        self.adapter.register_uri('GET', '/frames/%s/datapoint/0.0/0.0' % self.frame.id, status_code=500)
+        requests = [Datapoint.find_async(self.frame, 35.0, -97.0),
+                    Datapoint.find_async(self.frame, 0.0, 0.0)]
+        results = map_async_results(requests)
+        self.assertEqual([r.ok for r in results], [True, False])
+        self.assertEqual([r.request for r in results], requests)
+        self.assertEqual(len(map_async(requests, raise_on_error=False)), 1)
+
+    def test_max_in_flight(self):
+        in_flight = [0]
+        peak = [0]
+
+        def respond(request, context):
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            gevent.sleep(0.01)
+            in_flight[0] -= 1
+            return self.datapoint_json
+
+        self.adapter.register_uri('GET', re.compile('/frames/%s/datapoint/' % self.frame.id), json=respond)
+        PlatformResource.set_scheduler(RequestScheduler(max_in_flight=3))
+        datapoints = map_async([Datapoint.find_async(self.frame, 35.0 + i, -97.0) for i in range(10)])
+        self.assertEqual(len(datapoints), 10)
+        self.assertEqual(peak[0], 3)
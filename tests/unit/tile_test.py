@@ -1,3 +1,8 @@
+import re
+import types
+
+import gevent
+
 from skywiserestclient import SkyWiseRequest
 from skywiseplatform import BingMapsTile, GoogleMapsTile
 from tests import load_fixture
@@ -48,3 +53,75 @@ class TileTest(PlatformTest):
             self.assertEqual(tile.z, 8)
             coordinates.remove((tile.x, tile.y))
         self.assertFalse(coordinates, 'Some coordinates did not have tiles.')
+
+    def test_lat_lon_to_pixel_xy_array(self):
+        latitudes = [37.063944, 33.559707, -85.1, 89.0, 0.0, 35.46]
+        longitudes = [-94.400024, -103.189087, -180.0, 179.99, 0.0, -97.52]
+        for z in (0, 1, 8, 17):
+            pixel_x, pixel_y = GoogleMapsTile.lat_lon_to_pixel_xy_array(latitudes, longitudes, z)
+            for i, (lat, lon) in enumerate(zip(latitudes, longitudes)):
+                self.assertEqual((pixel_x[i], pixel_y[i]), GoogleMapsTile.lat_lon_to_pixel_xy(lat, lon, z))
+
+    def test_pixel_xy_to_tile_xy_array(self):
+        pixels = [(0, 0), (255, 256), (14081, 25599), (-3, 511)]
+        tile_x, tile_y = GoogleMapsTile.pixel_xy_to_tile_xy_array([p[0] for p in pixels],
+                                                                  [p[1] for p in pixels])
+        for i, (px, py) in enumerate(pixels):
+            self.assertEqual((tile_x[i], tile_y[i]), GoogleMapsTile.pixel_xy_to_tile_xy(px, py))
+
+    def test_tile_to_quadkey_array(self):
+        tiles = [(0, 0, 0), (1, 0, 1), (3, 5, 3), (54, 99, 8), (0, 1, 8)]
+        quadkeys = GoogleMapsTile.tile_to_quadkey_array([t[0] for t in tiles],
+                                                        [t[1] for t in tiles],
+                                                        [t[2] for t in tiles])
+        for i, (x, y, z) in enumerate(tiles):
+            self.assertEqual(quadkeys[i], GoogleMapsTile.tile_to_quadkey(x, y, z))
+
+    def test_lat_lon_to_quadkey_array(self):
+        quadkeys = GoogleMapsTile.lat_lon_to_quadkey_array([35.46], [-97.52], 8)
+        pixel_x, pixel_y = GoogleMapsTile.lat_lon_to_pixel_xy(35.46, -97.52, 8)
+        x, y = GoogleMapsTile.pixel_xy_to_tile_xy(pixel_x, pixel_y)
+        self.assertEqual(quadkeys[0], GoogleMapsTile.tile_to_quadkey(x, y, 8))
+
+    def test_iter_google_maps_tileset(self):
+        tile_tiff = load_fixture('tile', extension='tiff')
+        coordinates = [(x, y) for x in range(54, 61) for y in range(99, 103)]
+        for coord in coordinates:
+            self.adapter.register_uri('GET', '/frames/frame-id/tile/8/%i/%i' % coord,
+                                      content=tile_tiff)
+
+        ne_corner = (37.063944, -94.400024)
+        sw_corner = (33.559707, -103.189087)
+        tiles = GoogleMapsTile.iter_tileset('frame-id', (ne_corner, sw_corner), 8, window=3)
+        self.assertTrue(isinstance(tiles, types.GeneratorType))
+        received = sorted((tile.x, tile.y) for tile in tiles if tile.z == 8)
+        self.assertEqual(received, coordinates)
+
+    def test_iter_google_maps_tileset_error(self):
+        self.adapter.register_uri('GET', '/frames/frame-id/tile/1/0/0', status_code=500)
+        tiles = GoogleMapsTile.iter_tileset('frame-id', ((10.0, -10.0), (5.0, -15.0)), 1)
+        self.assertRaises(Exception, list, tiles)
+
+    def test_iter_google_maps_tileset_stopped_early(self):
+        tile_tiff = load_fixture('tile', extension='tiff')
+        completed = []
+
+        def respond(request, context):
+            gevent.sleep(0.01)
+            completed.append(request.url)
+            return tile_tiff
+
+        self.adapter.register_uri('GET', re.compile('/frames/frame-id/tile/8/'), content=respond)
+        tiles = GoogleMapsTile.iter_tileset('frame-id', ((37.063944, -94.400024), (33.559707, -103.189087)), 8,
+                                            window=3)
+        next(tiles)
+        tiles.close()
+        stopped = len(completed)
+        gevent.sleep(0.05)
+        self.assertEqual(len(completed), stopped, 'Requests in flight should be stopped with the generator.')
+
+    def test_iter_tile_range(self):
+        bounding_box = ((37.063944, -94.400024), (33.559707, -103.189087))
+        tile_range = GoogleMapsTile.iter_tile_range(bounding_box, 8, padding=10)
+        self.assertTrue(isinstance(tile_range, types.GeneratorType))
+        self.assertEqual(list(tile_range), GoogleMapsTile.tile_range(bounding_box, 8, padding=10))
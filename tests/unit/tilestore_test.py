@@ -0,0 +1,111 @@
+import os
+import re
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from skywiseplatform import GoogleMapsTile
+from skywiseplatform.raster import decode_tile
+from skywiseplatform.tilestore import TileStore
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class TileStoreTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'frame.tiles')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_put_and_reopen(self):
+        store = TileStore.create(self.path, 4, shape=(2, 2), dtype='float32', frame_id='frame-id')
+        store.put(3, 5, 3, np.array([[1, 2], [3, np.nan]], dtype=np.float32))
+        store.put(0, 0, 0, np.ones((2, 2)))
+        store.flush()
+
+        reader = TileStore(self.path)
+        self.assertEqual(reader.frame_id, 'frame-id')
+        self.assertEqual(reader.keys(), [(3, 5, 3), (0, 0, 0)])
+        tile = reader[(3, 5, 3)]
+        self.assertIsInstance(tile, np.memmap)
+        np.testing.assert_array_equal(tile, np.array([[1, 2], [3, np.nan]], dtype=np.float32))
+        self.assertIsNone(reader.get(1, 1, 1))
+        self.assertRaises(ValueError, reader._slots.__setitem__, 0, 0)
+
+    def test_readers_refresh(self):
+        store = TileStore.create(self.path, 2, shape=(2, 2))
+        reader = TileStore(self.path)
+        store.put(1, 1, 1, np.zeros((2, 2)))
+        store.flush()
+        self.assertNotIn((1, 1, 1), reader)
+        reader.refresh()
+        self.assertIn((1, 1, 1), reader)
+
+    def test_full(self):
+        store = TileStore.create(self.path, 1, shape=(2, 2))
+        store.put(0, 0, 0, np.zeros((2, 2)))
+        store.put(0, 0, 0, np.ones((2, 2)))
+        self.assertEqual(len(store), 1, 'Replacing a tile should reuse its slot.')
+        self.assertRaises(ValueError, store.put, 1, 0, 1, np.zeros((2, 2)))
+        self.assertRaises(ValueError, store.put, 0, 0, 0, np.zeros((3, 3)))
+
+    def test_not_a_store(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 4096)
+        self.assertRaises(ValueError, TileStore, self.path)
+
+
+class FrameTileStoreTest(PlatformTest):
+
+    def setUp(self):
+        super(FrameTileStoreTest, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'frame.tiles')
+        self.tile_tiff = load_fixture('tile', extension='tiff')
+        self.adapter.register_uri('GET', re.compile('/frames/[^/]+/tile/'), content=self.tile_tiff)
+        self.frame = self._register_frames().pop()
+        self.bounding_box = ((37.063944, -94.400024), (33.559707, -103.189087))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _tile_requests(self):
+        return [r for r in self.adapter.request_history if '/tile/' in r.url]
+
+    def test_tile_store(self):
+        store = self.frame.tile_store(self.path, self.bounding_box, z=6)
+        tiles = GoogleMapsTile.tile_range(self.bounding_box, 6)
+        self.assertEqual(sorted(store.keys()), sorted((x, y, 6) for x, y in tiles))
+        self.assertEqual(len(self._tile_requests()), len(tiles))
+        expected = decode_tile(self.tile_tiff)
+        for key in store:
+            np.testing.assert_array_equal(store[key], expected)
+
+        self.frame.tile_store(self.path, self.bounding_box, z=6)
+        self.assertEqual(len(self._tile_requests()), len(tiles), 'Stored tiles should not be downloaded again.')
+
+    def test_reopened_store_too_small(self):
+        self.frame.tile_store(self.path, self.bounding_box, z=6)
+        requests = len(self._tile_requests())
+        with self.assertRaises(ValueError) as raised:
+            self.frame.tile_store(self.path, ((40.0, -90.0), (33.559707, -103.189087)), z=6)
+        self.assertIn('has room for', str(raised.exception))
+        self.assertEqual(len(self._tile_requests()), requests)
+
+    def test_mismatched_tiles_are_rejected(self):
+        store = TileStore.create(self.path, 2, dtype='float64')
+        with self.assertRaises(ValueError) as raised:
+            store.put_content(1, 2, 3, self.tile_tiff)
+        self.assertIn('(1, 2, 3)', str(raised.exception))
+        store = TileStore.create(self.path, 2, shape=(128, 128))
+        self.assertRaises(ValueError, store.put_content, 1, 2, 3, self.tile_tiff)
+        self.assertEqual(len(store), 0)
+
+    def test_other_frames_are_rejected(self):
+        TileStore.create(self.path, 1, frame_id='another-frame')
+        self.assertRaises(ValueError, self.frame.tile_store, self.path, self.bounding_box, z=6)
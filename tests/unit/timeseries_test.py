@@ -0,0 +1,70 @@
+import math
+import re
+
+import numpy as np
+
+from skywiseplatform.forecast import ProductForecast
+from skywiseplatform.pointindex import PointIndex
+from skywiseplatform.raster import decode_tile
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class TimeSeriesTest(PlatformTest):
+
+    def setUp(self):
+        super(TimeSeriesTest, self).setUp()
+        self.tile_tiff = load_fixture('tile', extension='tiff')
+        self.points = [(37.5, -98.0), (36.5, -95.0), (37.5, -98.0), (10.0, 20.0)]
+
+    def _register_tiles(self, frame_id='[^/]+', status_code=200):
+        self.adapter.register_uri('GET', re.compile('/frames/%s/tile/5/' % frame_id),
+                                  content=self.tile_tiff, status_code=status_code)
+
+    def _tile_requests(self):
+        return [r for r in self.adapter.request_history if '/tile/' in r.url]
+
+    def _expected(self, points):
+        _, _, column, row = PointIndex(points).pixels(5)
+        return decode_tile(self.tile_tiff)[row, column].astype(np.float64)
+
+    def test_product_timeseries(self):
+        frames = sorted(self._register_frames(), key=lambda f: f.validTime)
+        self._register_tiles()
+
+        series = self.product.timeseries(self.points)
+        self.assertEqual(len(self._tile_requests()), 4, 'Each tile should be requested once per frame.')
+        self.assertEqual(series.values.shape, (4, 2))
+        expected = self._expected(self.points)
+        for j in xrange(2):
+            np.testing.assert_array_equal(series.values[:, j], expected)
+        self.assertEqual(series.frame_ids, [f.id for f in frames])
+        self.assertTrue(np.all(np.diff(series.validTimes) > np.timedelta64(0, 's')))
+        self.assertEqual(series.validTimes[0], np.datetime64('2014-09-01T00:00:00'))
+
+    def test_failed_tiles_raise(self):
+        frames = sorted(self._register_frames(), key=lambda f: f.validTime)
+        self._register_tiles(frames[0].id)
+        self._register_tiles(frames[1].id, status_code=500)
+        self.assertRaises(Exception, self.product.timeseries, [(35.0, -97.0)])
+
+    def test_failed_tiles_are_nan(self):
+        frames = sorted(self._register_frames(), key=lambda f: f.validTime)
+        self._register_tiles(frames[0].id)
+        self._register_tiles(frames[1].id, status_code=500)
+        series = self.product.timeseries([(37.5, -98.0)], raise_on_error=False)
+        self.assertEqual(series.values[0, 0], self._expected([(37.5, -98.0)])[0])
+        self.assertTrue(math.isnan(series.values[0, 1]))
+
+    def test_forecast_timeseries(self):
+        forecasts_json = load_fixture('forecasts')
+        self.adapter.register_uri('GET', '/products/%s/forecasts' % self.product.id, json=forecasts_json)
+        forecast = ProductForecast.find(self.product.id).pop()
+        frames_json = load_fixture('forecast_frames')
+        self.adapter.register_uri('GET', '/forecasts/%s/frames' % forecast.id, json=frames_json)
+        self._register_tiles()
+
+        series = forecast.timeseries([(37.5, -98.0)])
+        self.assertEqual(series.values.shape, (1, 10))
+        self.assertTrue(np.all(series.values == self._expected([(37.5, -98.0)])[0]))
+        self.assertEqual(len(self._tile_requests()), 10)
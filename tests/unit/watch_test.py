@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from dateutil.tz import tzutc
+
+from skywiseplatform.decoding import parse_datetime
+from tests import load_fixture
+from tests.unit import PlatformTest
+
+
+class FrameWatcherTest(PlatformTest):
+
+    def setUp(self):
+        super(FrameWatcherTest, self).setUp()
+        self.template = load_fixture('frames')[0]
+        self.listing = []
+        self.requests = []
+        self.publish(0, 1, 2)
+
+        def respond(request, context):
+            args = dict((k.upper(), v[0].upper()) for k, v in request.qs.items())
+            self.requests.append(args)
+            start = parse_datetime(args.get('START'))
+            page = sorted([f for f in self.listing if start is None or parse_datetime(f['validTime']) >= start],
+                          key=lambda f: f['validTime'], reverse=args.get('SORT') == 'DESC')
+            return page[:int(args['LIMIT'])]
+
+        self.adapter.register_uri('GET', '/products/%s/frames' % self.product.id, json=respond)
+
+    def publish(self, *hours, **kwargs):
+        for hour in hours:
+            self.listing.append(dict(self.template, id='frame-%i' % len(self.listing),
+                                     validTime='2016-09-22T%02i:00:00Z' % hour,
+                                     creationTime='2016-09-22T%02i:%02i:00Z' % (hour, kwargs.get('minute', 1))))
+
+    def test_reports_only_new_frames(self):
+        watcher = self.product.watch()
+        self.assertEqual(len(watcher.poll()), 0, 'The first poll only sets the high-water mark.')
+        self.assertEqual(len(watcher.poll()), 0)
+
+        self.publish(3, 4)
+        first_request = len(self.requests)
+        frames = watcher.poll()
+        self.assertEqual([f.id for f in frames], ['frame-3', 'frame-4'])
+        self.assertIs(frames[0].product, self.product)
+        self.assertEqual(watcher.high_water, datetime(2016, 9, 22, 4, tzinfo=tzutc()))
+        self.assertEqual(self.requests[first_request]['START'], '2016-09-22T02:00:00Z')
+        self.assertEqual(len(watcher.poll()), 0)
+
+    def test_since(self):
+        watcher = self.product.watch(since=datetime(2016, 9, 22, 1, tzinfo=tzutc()))
+        self.assertEqual([f.id for f in watcher.poll()], ['frame-1', 'frame-2'])
+
+    def test_reruns_within_lookback(self):
+        watcher = self.product.watch(lookback=timedelta(hours=1))
+        watcher.poll()
+        self.publish(0, 2, minute=30)
+        first_request = len(self.requests)
+        self.assertEqual([f.id for f in watcher.poll()], ['frame-4'], 'Only the rerun inside the lookback is new.')
+        self.assertEqual(self.requests[first_request]['START'], '2016-09-22T01:00:00Z')
+
+    def test_created_since(self):
+        watcher = self.product.watch(since=datetime(2016, 9, 22, tzinfo=tzutc()),
+                                     created_since=datetime(2016, 9, 22, 1, 1, tzinfo=tzutc()))
+        self.assertEqual([f.id for f in watcher.poll()], ['frame-2'])
+        self.assertEqual(watcher.created_high_water, datetime(2016, 9, 22, 2, 1, tzinfo=tzutc()))
+
+    def test_run_callback(self):
+        watcher = self.product.watch()
+        frames = []
+        watcher.run(frames.append, interval=0, polls=1)
+        self.publish(5)
+        watcher.run(frames.append, interval=0, polls=1)
+        self.assertEqual([f.id for f in frames], ['frame-3'])